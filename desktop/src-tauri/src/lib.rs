@@ -107,7 +107,7 @@ pub fn run() {
             println!("[FixMe] Sidecar: {}", sidecar_script.display());
 
             if sidecar_script.exists() {
-                if let Err(e) = sidecar.spawn(&python_path, &sidecar_script.to_string_lossy()) {
+                if let Err(e) = sidecar.spawn(app.handle().clone(), &python_path, &sidecar_script.to_string_lossy()) {
                     eprintln!("[FixMe] Failed to start sidecar: {}", e);
                 }
             } else {
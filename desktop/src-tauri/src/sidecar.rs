@@ -3,8 +3,13 @@ use std::process::{Child, Command, Stdio};
 use std::sync::atomic::{AtomicU64, Ordering};
 use std::sync::{Arc, Mutex};
 use std::collections::HashMap;
+use tauri::{AppHandle, Emitter};
 use tokio::sync::oneshot;
 
+/// Event emitted for JSON-RPC notifications (messages without an id), e.g.
+/// `listen_partial`. The payload is `{method, params}`.
+pub const NOTIFICATION_EVENT: &str = "sidecar-notification";
+
 type PendingMap = Arc<Mutex<HashMap<u64, oneshot::Sender<serde_json::Value>>>>;
 
 pub struct Sidecar {
@@ -24,7 +29,7 @@ impl Sidecar {
         }
     }
 
-    pub fn spawn(&self, python_path: &str, sidecar_script: &str) -> Result<(), String> {
+    pub fn spawn(&self, app: AppHandle, python_path: &str, sidecar_script: &str) -> Result<(), String> {
         let mut child = Command::new(python_path)
             .arg(sidecar_script)
             .stdin(Stdio::piped())
@@ -52,6 +57,12 @@ impl Sidecar {
                             if let Some(sender) = pending.lock().unwrap().remove(&id) {
                                 let _ = sender.send(result);
                             }
+                        } else if let Some(method) = resp.get("method").and_then(|v| v.as_str()) {
+                            let payload = serde_json::json!({
+                                "method": method,
+                                "params": resp.get("params").cloned().unwrap_or(serde_json::Value::Null),
+                            });
+                            let _ = app.emit(NOTIFICATION_EVENT, payload);
                         }
                     }
                 }
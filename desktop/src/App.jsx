@@ -16,7 +16,7 @@ const WELCOME_MSG =
   "and ask your permission before doing anything.";
 
 export default function App() {
-  const { call } = useSidecar();
+  const { call, onNotification } = useSidecar();
   const { sessions, newSession, addMessage, getSession } = useHistory();
   const [activeSessionId, setActiveSessionId] = useState(null);
   const [lang, setLang] = useState("en");
@@ -28,6 +28,7 @@ export default function App() {
   const [permDialog, setPermDialog] = useState(null);
   const [showVoiceDialog, setShowVoiceDialog] = useState(false);
   const [voiceListening, setVoiceListening] = useState(false);
+  const [partialTranscript, setPartialTranscript] = useState("");
   const permResolveRef = useRef(null);
 
   // Initialize first session
@@ -41,6 +42,16 @@ export default function App() {
     }
   }, []); // eslint-disable-line react-hooks/exhaustive-deps
 
+  // Live partial transcripts while the sidecar is listening
+  useEffect(() => {
+    const unlisten = onNotification("listen_partial", (params) => {
+      setPartialTranscript(params?.text || "");
+    });
+    return () => {
+      unlisten.then((fn) => fn());
+    };
+  }, []); // eslint-disable-line react-hooks/exhaustive-deps
+
   const addChatItem = useCallback((item) => {
     setChatItems((prev) => [...prev, item]);
   }, []);
@@ -74,19 +85,33 @@ export default function App() {
   const askPermission = (stepDesc, command) => {
     return new Promise((resolve) => {
       permResolveRef.current = resolve;
+      setPartialTranscript("");
       setPermDialog({ step: stepDesc, command });
+      // Also listen for a spoken answer; a clear yes/no ends capture early
+      call("listen", { lang, mode: "permission" })
+        .then((result) => {
+          if (result?.answer && permResolveRef.current === resolve) {
+            handlePermResponse(result.answer);
+          }
+        })
+        .catch(() => {
+          // buttons still work
+        });
     });
   };
 
   const handlePermResponse = (answer) => {
     setPermDialog(null);
+    setPartialTranscript("");
     if (permResolveRef.current) {
       permResolveRef.current(answer);
       permResolveRef.current = null;
+      // Stop the spoken-answer capture if a button was used
+      call("stop_listen", {}).catch(() => {});
     }
   };
 
-  const runFixSteps = async (commands) => {
+  const runFixSteps = async (commands, diagnosis = null) => {
     addChatItem({
       type: "message",
       role: "assistant",
@@ -203,13 +228,18 @@ export default function App() {
         time: new Date().toISOString(),
       });
       try {
-        const verifyResult = await call("verify");
-        const vSteps = verifyResult?.steps || [];
-        if (vSteps.length === 0) {
+        const verifyResult = await call("verify", {
+          fix_id: diagnosis?.fix_id,
+          category: diagnosis?.category,
+        });
+        const local = verifyResult?.verification?.status === "pass";
+        if (verifyResult?.resolved) {
           addChatItem({
             type: "message",
             role: "assistant",
-            text: "Looks good! No issues detected on screen.",
+            text: local
+              ? "Looks good! Network checks passed."
+              : "Looks good! No issues detected on screen.",
             time: new Date().toISOString(),
           });
         } else {
@@ -313,7 +343,7 @@ export default function App() {
           command: s.command,
           needs_admin: s.needs_admin || false,
         }));
-        await runFixSteps(commands);
+        await runFixSteps(commands, result);
       } else {
         addChatItem({
           type: "message",
@@ -380,6 +410,7 @@ export default function App() {
     }
 
     setVoiceListening(true);
+    setPartialTranscript("");
     setOrbState("listening");
     setStatus("listening");
     setStatusLabel("Listening... (tap to stop)");
@@ -401,6 +432,7 @@ export default function App() {
       }
     } finally {
       setVoiceListening(false);
+      setPartialTranscript("");
       setOrbState("idle");
       setStatus("ready");
       setStatusLabel("Ready");
@@ -444,7 +476,11 @@ export default function App() {
 
         {/* Voice orb */}
         <div className="flex justify-center py-2 flex-shrink-0">
-          <VoiceOrb state={orbState} onClick={handleVoiceClick} />
+          <VoiceOrb
+            state={orbState}
+            partial={voiceListening ? partialTranscript : ""}
+            onClick={handleVoiceClick}
+          />
         </div>
 
         {/* Input */}
@@ -453,6 +489,7 @@ export default function App() {
           onDiagnose={handleDiagnose}
           onScreenshot={handleScreenshot}
           disabled={busy}
+          partial={voiceListening ? partialTranscript : ""}
         />
       </div>
 
@@ -461,6 +498,7 @@ export default function App() {
         <PermissionDialog
           step={permDialog.step}
           command={permDialog.command}
+          heard={partialTranscript}
           onRespond={handlePermResponse}
         />
       )}
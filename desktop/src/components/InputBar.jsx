@@ -5,6 +5,7 @@ export default function InputBar({
   onDiagnose,
   onScreenshot,
   disabled,
+  partial = "",
 }) {
   const [text, setText] = useState("");
 
@@ -18,6 +19,11 @@ export default function InputBar({
 
   return (
     <div className="border-t border-white/5 bg-zinc-900/50 px-4 py-3">
+      {partial && (
+        <p className="text-xs text-indigo-300 italic mb-2 truncate">
+          &ldquo;{partial}&rdquo;
+        </p>
+      )}
       <form onSubmit={handleSubmit} className="flex gap-2 mb-2">
         <input
           type="text"
@@ -1,4 +1,4 @@
-export default function PermissionDialog({ step, command, onRespond }) {
+export default function PermissionDialog({ step, command, heard = "", onRespond }) {
   return (
     <div className="fixed inset-0 z-50 flex items-center justify-center bg-black/60 backdrop-blur-sm">
       <div className="bg-zinc-900 border border-white/10 rounded-2xl p-6 max-w-md w-full mx-4 shadow-2xl">
@@ -9,6 +9,9 @@ export default function PermissionDialog({ step, command, onRespond }) {
         <div className="bg-zinc-950 rounded-lg px-3 py-2 mb-5 border border-white/5">
           <code className="text-xs text-indigo-300 break-all">{command}</code>
         </div>
+        <p className="text-xs text-zinc-500 italic mb-3 min-h-[1rem] truncate">
+          {heard ? <>&ldquo;{heard}&rdquo;</> : "Say yes or no, or choose below"}
+        </p>
         <div className="flex gap-2">
           <button
             onClick={() => onRespond("yes")}
@@ -6,7 +6,7 @@ const STATE_COLORS = {
   error: "#EF4444",
 };
 
-export default function VoiceOrb({ state = "idle", onClick }) {
+export default function VoiceOrb({ state = "idle", partial = "", onClick }) {
   const color = STATE_COLORS[state] || STATE_COLORS.idle;
   const isAnimating = state === "listening" || state === "processing";
 
@@ -136,9 +136,9 @@ export default function VoiceOrb({ state = "idle", onClick }) {
       </svg>
 
       {/* Label */}
-      <span className="absolute -bottom-5 text-[11px] text-zinc-500 font-medium">
+      <span className="absolute -bottom-5 max-w-[260px] truncate text-[11px] text-zinc-500 font-medium">
         {state === "idle" && "Tap to speak"}
-        {state === "listening" && "Listening... tap to stop"}
+        {state === "listening" && (partial || "Listening... tap to stop")}
         {state === "processing" && "Thinking..."}
         {state === "success" && "Done!"}
         {state === "error" && "Error"}
@@ -1,4 +1,7 @@
 import { invoke } from "@tauri-apps/api/core";
+import { listen } from "@tauri-apps/api/event";
+
+const NOTIFICATION_EVENT = "sidecar-notification";
 
 export function useSidecar() {
   const call = async (method, params = {}) => {
@@ -11,5 +14,14 @@ export function useSidecar() {
     }
   };
 
-  return { call };
+  // Subscribe to sidecar notifications (e.g. "listen_partial").
+  // Returns a promise of the unsubscribe function.
+  const onNotification = (method, handler) =>
+    listen(NOTIFICATION_EVENT, (event) => {
+      if (event.payload?.method === method) {
+        handler(event.payload.params);
+      }
+    });
+
+  return { call, onNotification };
 }
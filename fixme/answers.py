@@ -0,0 +1,296 @@
+"""Cache of spoken answers to questions asked during a fix step.
+
+Users keep asking the same few things about the same commands ("is this
+safe?", "what does that do?"). Answers are keyed by the command and a
+normalized form of the question: common questions collapse onto a topic
+("is it safe", "could this break anything" and "es seguro" are all
+``topic:safe``), anything else onto its content words. Answers for the
+built-in ``fixes.FIXES`` commands are pre-seeded, and answers generated by
+Claude are kept on disk so they are instant the next time.
+
+Answers are stored in English; ``tts.speak`` translates them for the
+user's language like every other phrase.
+"""
+
+import json
+import os
+import re
+import threading
+import warnings
+from collections import OrderedDict
+from pathlib import Path
+
+from fixme.intents import tokenize
+
+CACHE_PATH = Path.home() / ".fixme" / "answers.json"
+MAX_ANSWERS = 500
+
+# Question topics, checked in order; the first with a matching phrase wins
+TOPICS = [
+    ("undo", [
+        "undo", "reverse", "revert", "go back", "put it back", "change it back",
+        "deshacer", "revertir", "annuler", "वापस", "ਵਾਪਸ",
+    ]),
+    ("safe", [
+        "safe", "dangerous", "danger", "risk", "risky", "harm", "break", "damage",
+        "delete", "lose", "hurt", "virus", "seguro", "peligroso", "riesgo", "borrar",
+        "dangereux", "risque", "sûr", "सुरक्षित", "खतरा", "ਸੁਰੱਖਿਅਤ", "ਖ਼ਤਰਾ",
+    ]),
+    ("time", [
+        "how long", "take long", "minutes", "seconds", "cuánto tarda", "cuánto tiempo",
+        "combien de temps", "कितना समय", "kitna time", "ਕਿੰਨਾ ਸਮਾਂ",
+    ]),
+    ("admin", [
+        "password", "admin", "administrator", "permission", "sudo", "contraseña",
+        "mot de passe", "पासवर्ड", "ਪਾਸਵਰਡ",
+    ]),
+    ("internet", [
+        "internet", "disconnect", "offline", "connection", "wifi", "wi-fi",
+        "conexión", "connexion",
+    ]),
+    ("what", [
+        "what does", "what is", "what's", "what will", "what happens", "explain",
+        "mean", "means", "qué hace", "qué es", "qué pasa", "qu'est-ce", "que fait",
+        "क्या होगा", "क्या करेगा", "मतलब", "kya hoga", "matlab", "ਕੀ ਹੋਵੇਗਾ", "ਮਤਲਬ",
+    ]),
+]
+
+# Words dropped from questions that match no topic
+STOPWORDS = {
+    "a", "an", "the", "is", "it", "this", "that", "will", "does", "do", "i", "me",
+    "my", "you", "to", "of", "and", "or", "can", "could", "would", "should", "be",
+    "are", "please", "so", "um", "uh", "wait", "okay", "ok", "just", "really",
+}
+
+# Pre-written answers for the built-in fixes, by fix id and topic
+SEED_ANSWERS = {
+    "toggle_wifi": {
+        "what": "This turns your Wi-Fi off and back on after a few seconds, "
+                "which often clears a stuck connection.",
+        "safe": "Yes, it's safe. Nothing is deleted or changed; your Wi-Fi simply "
+                "reconnects to the same network.",
+        "undo": "There's nothing to undo. Wi-Fi is switched back on automatically.",
+        "time": "About five seconds, while the Wi-Fi reconnects.",
+        "internet": "You'll be offline for a few seconds while Wi-Fi restarts, then it reconnects.",
+        "admin": "No, this doesn't need an administrator password.",
+    },
+    "flush_dns": {
+        "what": "This clears your computer's list of remembered website addresses, "
+                "so it looks them up fresh. It fixes sites that won't load after a network change.",
+        "safe": "Yes, it's safe. It doesn't touch your files, passwords or browser history; "
+                "the list simply rebuilds itself as you browse.",
+        "undo": "There's nothing to undo. The address list refills on its own.",
+        "time": "Less than a second.",
+        "internet": "Your connection stays up. The first visit to each site may take a moment longer.",
+        "admin": "Yes, it needs administrator permission, so you may be asked for your password.",
+    },
+    "restart_network": {
+        "what": "This fully resets your network connection: it disconnects, clears remembered "
+                "addresses, gets a fresh network address and reconnects.",
+        "safe": "Yes, it's safe. No files or settings are deleted; your computer "
+                "just reconnects from scratch.",
+        "undo": "There's nothing to undo. Your connection is restored automatically at the end.",
+        "time": "Usually under half a minute.",
+        "internet": "You'll be offline for a few seconds to half a minute while it reconnects.",
+        "admin": "Yes, it needs administrator permission, so you may be asked for your password.",
+    },
+    "open_credential_manager": {
+        "what": "This only opens the app where your saved passwords are kept, "
+                "so you can check or update one.",
+        "safe": "Yes, it's safe. It just opens a window; nothing changes unless you edit something yourself.",
+        "undo": "Just close the window. Nothing has changed.",
+        "time": "It opens straight away.",
+        "internet": "No, your connection isn't affected.",
+        "admin": "No, opening it doesn't need an administrator password.",
+    },
+}
+
+_SPACE = re.compile(r"\s+")
+# A placeholder for a runtime value, e.g. {ssid}, in a re.escape()d command
+_PLACEHOLDER = re.compile(r"\\\{\w+\\\}")
+
+# Sentence end: terminal punctuation (Latin or Devanagari danda) then whitespace
+_SENTENCE_END = re.compile(r"(?<=[.!?।])[\"')\]]*\s+")
+
+
+def _compile_topics() -> list[tuple[str, list[tuple[str, ...]]]]:
+    return [(topic, [tuple(tokenize(p)) for p in phrases]) for topic, phrases in TOPICS]
+
+
+_TOPIC_PHRASES = _compile_topics()
+
+
+def normalize_command(command: str) -> str:
+    """Return the cache form of a command (case, spacing and sudo ignored)."""
+    command = _SPACE.sub(" ", command.strip().lower())
+    return command[5:] if command.startswith("sudo ") else command
+
+
+def normalize_question(question: str) -> str:
+    """Return the cache form of a question: a topic, or its content words."""
+    tokens = tokenize(question)
+    for topic, phrases in _TOPIC_PHRASES:
+        for phrase in phrases:
+            n = len(phrase)
+            if any(tuple(tokens[i:i + n]) == phrase for i in range(len(tokens) - n + 1)):
+                return f"topic:{topic}"
+    return " ".join(t for t in tokens if t not in STOPWORDS)
+
+
+class AnswerCache:
+    """LRU cache of answers keyed by (command, normalized question).
+
+    Seeded answers live in memory only; learned answers are written to a
+    JSON file so they survive restarts. Commands are matched after
+    placeholder substitution: "netsh wlan connect name=Home" finds answers
+    for the seeded "netsh wlan connect name={ssid}".
+    """
+
+    def __init__(self, path: Path = CACHE_PATH, max_entries: int = MAX_ANSWERS):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._seeded = {}
+        self._learned = OrderedDict()  # key -> answer, least recently used first
+        self._templates = []  # (pattern, normalized command with placeholders)
+        self._load()
+
+    def key(self, command: str, question: str) -> str:
+        return f"{self._command_key(command)}\n{normalize_question(question)}"
+
+    def _command_key(self, command: str) -> str:
+        command = normalize_command(command)
+        for pattern, template in self._templates:
+            if pattern.fullmatch(command):
+                return template
+        return command
+
+    def _load(self):
+        try:
+            entries = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            warnings.warn(f"Answer cache unavailable: {e}")
+            return
+        if isinstance(entries, dict):
+            self._learned.update(entries)
+
+    def _save(self):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(self._learned, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp, self.path)
+        except OSError as e:
+            warnings.warn(f"Answer cache write failed: {e}")
+
+    def get(self, command: str, question: str) -> str | None:
+        """Return the cached answer, or None on a miss."""
+        key = self.key(command, question)
+        with self._lock:
+            if key in self._learned:
+                self._learned.move_to_end(key)
+                answer = self._learned[key]
+            else:
+                answer = self._seeded.get(key)
+            if answer is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return answer
+
+    def put(self, command: str, question: str, answer: str) -> None:
+        """Remember an answer, evicting least recently used ones."""
+        if not answer:
+            return
+        key = self.key(command, question)
+        with self._lock:
+            self._learned.pop(key, None)
+            self._learned[key] = answer
+            while len(self._learned) > self.max_entries:
+                self._learned.popitem(last=False)
+            self._save()
+
+    def seed(self, fixes: dict, answers: dict = SEED_ANSWERS) -> int:
+        """Pre-load answers for every command of the given fixes.
+
+        A command shared by several fixes gets the answers of the one with
+        the fewest steps, whose answers are closest to describing that
+        command alone (flush_dns, not restart_network, for a DNS flush).
+
+        Args:
+            fixes: Fix definitions such as fixes.FIXES.
+            answers: {fix_id: {topic: answer}}.
+
+        Returns:
+            Number of (command, topic) answers added.
+        """
+        owners = {}  # normalized command -> (steps, fix_id)
+        for fix_id, fix in fixes.items():
+            commands = [c for c in fix.get("commands", []) if not c.startswith("WAIT:")]
+            for command in commands:
+                command = normalize_command(command)
+                owner = (len(commands), fix_id)
+                if fix_id in answers and (command not in owners or owner < owners[command]):
+                    owners[command] = owner
+
+        added = 0
+        with self._lock:
+            for command, (_, fix_id) in owners.items():
+                if "{" in command:
+                    pattern = re.compile(_PLACEHOLDER.sub(".+", re.escape(command)))
+                    if all(template != command for _, template in self._templates):
+                        self._templates.append((pattern, command))
+                for topic, answer in answers[fix_id].items():
+                    key = f"{command}\ntopic:{topic}"
+                    if key not in self._seeded:
+                        self._seeded[key] = answer
+                        added += 1
+        return added
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and entry counts."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0,
+                "seeded": len(self._seeded),
+                "learned": len(self._learned),
+            }
+
+
+def split_sentences(buffer: str) -> tuple[list[str], str]:
+    """Split complete sentences off the front of streamed text.
+
+    Returns:
+        (complete sentences, remaining partial text).
+    """
+    sentences = []
+    start = 0
+    for match in _SENTENCE_END.finditer(buffer):
+        sentence = buffer[start:match.end()].strip()
+        if sentence:
+            sentences.append(sentence)
+        start = match.end()
+    return sentences, buffer[start:]
+
+
+_answer_cache = None
+_answer_cache_lock = threading.Lock()
+
+
+def get_answer_cache() -> AnswerCache:
+    """Return the process-wide answer cache, seeded with the built-in fixes."""
+    global _answer_cache
+    with _answer_cache_lock:
+        if _answer_cache is None:
+            from fixme.fixes import FIXES
+
+            _answer_cache = AnswerCache()
+            _answer_cache.seed(FIXES)
+        return _answer_cache
@@ -16,8 +16,13 @@ import pystray
 
 from fixme import screenshot, diagnose, fixes, tts, voice_input
 from fixme.conversation import ConversationFlow
-from fixme.overlay import Overlay
+from fixme.locator import enable_dpi_awareness
+from fixme.overlay import get_overlay
 from fixme.recorder import ScreenRecorder
+from fixme.replay import get_replay
+
+# Keep the last minute of screen in memory (FIXME_REPLAY=0 turns it off)
+REPLAY_ENABLED = os.environ.get("FIXME_REPLAY", "1") != "0"
 
 
 class FixMeApp:
@@ -25,8 +30,9 @@ class FixMeApp:
 
     def __init__(self):
         self.lang = "en"
-        self.overlay = None
-        self.recorder = ScreenRecorder(fps=10)
+        self.overlay = get_overlay()
+        self.recorder = ScreenRecorder()
+        self.replay = get_replay() if REPLAY_ENABLED else None
         self._diagnosing = False
         self._icon = None
 
@@ -75,6 +81,11 @@ class FixMeApp:
                 pystray.Menu(
                     pystray.MenuItem("Start Recording", self._start_recording),
                     pystray.MenuItem("Stop Recording", self._stop_recording),
+                    pystray.MenuItem(
+                        "Save Last Minute",
+                        self._save_replay,
+                        enabled=lambda item: self.replay is not None,
+                    ),
                 ),
             ),
             pystray.Menu.SEPARATOR,
@@ -91,6 +102,10 @@ class FixMeApp:
 
     def run(self):
         """Start the system tray application."""
+        # Bring the overlay window up in the background so no diagnosis waits for it
+        self.overlay.start()
+        if self.replay is not None:
+            self.replay.start()
         self._icon = pystray.Icon(
             name="FixMe",
             icon=self._create_icon_image(),
@@ -108,7 +123,7 @@ class FixMeApp:
     def _on_diagnose(self, icon, item):
         """Handle 'Diagnose Screen' click."""
         if self._diagnosing:
-            tts.speak("Diagnosis already in progress. Please wait.", self.lang)
+            tts.speak("Diagnosis already in progress. Please wait.", self.lang, block=False)
             return
 
         self._diagnosing = True
@@ -122,15 +137,12 @@ class FixMeApp:
             if self._icon:
                 self._icon.icon = self._create_icon_image("#FFC107")
 
-            # Initialize overlay
-            self.overlay = Overlay()
-
             # Step 1: Screenshot
-            tts.speak("Taking a screenshot to analyze your screen.", self.lang)
+            tts.speak("Taking a screenshot to analyze your screen.", self.lang, block=False)
             image_path = screenshot.take_screenshot()
 
             # Step 2: Diagnose
-            tts.speak("Analyzing the screenshot. Please wait.", self.lang)
+            tts.speak("Analyzing the screenshot. Please wait.", self.lang, block=False)
             result = diagnose.diagnose_screenshot(image_path)
 
             # Step 3: Clean up screenshot
@@ -139,15 +151,12 @@ class FixMeApp:
             except OSError:
                 pass
 
+            # Keep the lead-up to the issue
+            if result.get("steps"):
+                self._auto_save_replay()
+
             # Step 4: Run conversation flow
-            conversation = ConversationFlow(
-                lang=self.lang,
-                tts=tts,
-                voice_input_module=voice_input,
-                overlay=self.overlay,
-                fixes=fixes,
-            )
-            conversation.run_fix(result)
+            self._new_conversation().run_fix(result)
 
         except PermissionError as e:
             tts.speak(str(e), self.lang)
@@ -161,9 +170,8 @@ class FixMeApp:
             self._diagnosing = False
             if self._icon:
                 self._icon.icon = self._create_icon_image("#4CAF50")
-            if self.overlay:
-                self.overlay.destroy()
-                self.overlay = None
+            # Hide this session's drawings; the overlay itself stays up
+            self.overlay.clear_step()
 
     def _quick_toggle_wifi(self, icon, item):
         """Quick fix: toggle Wi-Fi with voice permission."""
@@ -183,6 +191,17 @@ class FixMeApp:
         )
         thread.start()
 
+    def _new_conversation(self) -> ConversationFlow:
+        """Return a walkthrough whose events reach the recordings (see _on_flow_event)."""
+        return ConversationFlow(
+            lang=self.lang,
+            tts=tts,
+            voice_input_module=voice_input,
+            overlay=self.overlay,
+            fixes=fixes,
+            on_event=self._on_flow_event,
+        )
+
     def _run_quick_fix(self, fix_id: str):
         """Run a quick fix with voice permission."""
         available = fixes.get_available_fixes()
@@ -191,77 +210,80 @@ class FixMeApp:
             return
 
         try:
-            self.overlay = Overlay()
-
-            # Build a simple diagnosis result for the conversation flow
-            steps = []
-            ssid = fixes.get_current_ssid() or ""
-            for i, cmd in enumerate(fix["commands"]):
-                cmd_resolved = cmd.replace("{ssid}", ssid)
-                steps.append({
-                    "step": i + 1,
-                    "description": f"{fix['label']} - {cmd_resolved}",
-                    "command": cmd,
-                    "needs_admin": fix["needs_admin"],
-                    "ui_highlight": None,
-                })
-
-            result = {
-                "diagnosis": f"Running quick fix: {fix['label']}",
-                "steps": steps,
-            }
-
-            conversation = ConversationFlow(
-                lang=self.lang,
-                tts=tts,
-                voice_input_module=voice_input,
-                overlay=self.overlay,
-                fixes=fixes,
-            )
-            conversation.run_fix(result)
+            result = fixes.quick_fix_plan(fix, fixes.get_current_ssid() or "")
+            self._new_conversation().run_fix(result)
 
         except Exception as e:
             tts.speak(f"Quick fix failed: {e}", self.lang)
         finally:
-            if self.overlay:
-                self.overlay.destroy()
-                self.overlay = None
+            self.overlay.clear_step()
 
     def _start_recording(self, icon, item):
         """Start screen recording."""
         if self.recorder.is_recording:
-            tts.speak("Already recording.", self.lang)
+            tts.speak("Already recording.", self.lang, block=False)
             return
 
         self.recorder.start()
-        tts.speak("Screen recording started.", self.lang)
-
-        if self.overlay:
-            self.overlay.show_recording_indicator()
+        tts.speak("Screen recording started.", self.lang, block=False)
+        self.overlay.show_recording_indicator()
 
     def _stop_recording(self, icon, item):
         """Stop screen recording."""
         if not self.recorder.is_recording:
-            tts.speak("No recording in progress.", self.lang)
+            tts.speak("No recording in progress.", self.lang, block=False)
             return
 
         output_path = self.recorder.stop()
-        tts.speak(f"Recording saved to {output_path}.", self.lang)
+        tts.speak(f"Recording saved to {output_path}.", self.lang, block=False)
+        self.overlay.hide_recording_indicator()
 
-        if self.overlay:
-            self.overlay.hide_recording_indicator()
+    def _save_replay(self, icon, item):
+        """Save the last minute of screen to the Desktop."""
+        desktop = os.path.join(os.path.expanduser("~"), "Desktop")
+
+        def work():
+            try:
+                path = self.replay.save(directory=desktop)
+            except Exception as e:
+                tts.speak(f"Saving the replay failed: {e}", self.lang, block=False)
+                return
+            if path:
+                tts.speak(f"Replay saved to {path}.", self.lang, block=False)
+            else:
+                tts.speak("Nothing has been captured yet.", self.lang, block=False)
+
+        threading.Thread(target=work, daemon=True).start()
+
+    def _auto_save_replay(self):
+        """Keep the replay buffer's contents (quietly, in the replays folder)."""
+        if self.replay is not None and self.replay.is_recording:
+            self.replay.save_in_background()
+
+    def _on_flow_event(self, name: str, **data):
+        """Mark walkthrough milestones in recordings; keep the replay on failures."""
+        for recorder in (self.recorder, self.replay):
+            if recorder is not None:
+                recorder.mark(name, **data)
+        if name == "step_result" and not data["ok"]:
+            self._auto_save_replay()
 
     def _on_quit(self, icon, item):
         """Quit the application."""
+        tts.stop()
         if self.recorder.is_recording:
             self.recorder.stop()
-        if self.overlay:
-            self.overlay.destroy()
+        if self.replay is not None:
+            self.replay.stop()
+        self.overlay.destroy()
         icon.stop()
 
 
 def main():
     """Entry point for the FixMe application."""
+    # Before any Tk window or pyautogui use, so all agree on pixels
+    enable_dpi_awareness()
+
     # Validate API keys
     missing_keys = []
     if not os.environ.get("ANTHROPIC_API_KEY"):
@@ -0,0 +1,119 @@
+"""Content-addressed, size-bounded on-disk LRU cache for synthesized speech."""
+
+import hashlib
+import json
+import os
+import threading
+import warnings
+from collections import OrderedDict
+from pathlib import Path
+
+CACHE_DIR = Path.home() / ".fixme" / "tts_cache"
+MAX_CACHE_BYTES = 64 * 1024 * 1024
+
+
+def cache_key(text: str, voice_id: str, model_id: str, lang: str, audio_format: str = "mp3") -> str:
+    """Return the content address for an utterance in a given audio format."""
+    payload = json.dumps([text, voice_id, model_id, lang, audio_format], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class AudioCache:
+    """LRU cache of audio blobs stored as one file per key.
+
+    Recency is tracked in memory and mirrored to file mtimes, so the LRU order
+    survives restarts. Entries are evicted oldest-first once the total size
+    exceeds ``max_bytes``.
+    """
+
+    def __init__(self, directory: Path = CACHE_DIR, max_bytes: int = MAX_CACHE_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> size, least recently used first
+        self._total = 0
+        self._load_index()
+
+    def _load_index(self):
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            files = sorted(
+                (p for p in self.directory.iterdir() if p.suffix == ".audio"),
+                key=lambda p: p.stat().st_mtime,
+            )
+        except OSError as e:
+            warnings.warn(f"TTS cache unavailable: {e}")
+            return
+        for path in files:
+            size = path.stat().st_size
+            self._entries[path.stem] = size
+            self._total += size
+
+    def __contains__(self, key: str) -> bool:
+        """Whether key is cached (does not count as a lookup or touch recency)."""
+        with self._lock:
+            return key in self._entries
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.audio"
+
+    def get(self, key: str) -> bytes | None:
+        """Return cached audio for key, or None on a miss."""
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            try:
+                data = self._path(key).read_bytes()
+                os.utime(self._path(key))
+            except OSError:
+                self._total -= self._entries.pop(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return data
+
+    def put(self, key: str, data: bytes) -> None:
+        """Store audio under key, evicting least recently used entries."""
+        if not data or len(data) > self.max_bytes:
+            return
+        with self._lock:
+            path = self._path(key)
+            tmp = path.with_suffix(".tmp")
+            try:
+                tmp.write_bytes(data)
+                os.replace(tmp, path)
+            except OSError as e:
+                warnings.warn(f"TTS cache write failed: {e}")
+                return
+            self._total -= self._entries.pop(key, 0)
+            self._entries[key] = len(data)
+            self._total += len(data)
+            while self._total > self.max_bytes and self._entries:
+                old_key, size = self._entries.popitem(last=False)
+                self._total -= size
+                try:
+                    self._path(old_key).unlink()
+                except OSError:
+                    pass
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> dict:
+        """Return hit/miss counters, hit rate and current size."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hit_rate, 3),
+                "entries": len(self._entries),
+                "bytes": self._total,
+                "max_bytes": self.max_bytes,
+            }
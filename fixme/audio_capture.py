@@ -0,0 +1,182 @@
+"""Persistent microphone capture into a preallocated ring buffer.
+
+The input stream is opened once and kept running between listens (until it
+has been idle for ``IDLE_CLOSE_SECONDS``), with a callback writing every
+block into a ring buffer. A capture starts ``PRE_ROLL_SECONDS`` before the
+moment it was requested, so the first syllable after the user taps the orb
+is kept, and a stop request takes effect within one callback period.
+"""
+
+import threading
+import time
+import warnings
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+BLOCK_SECONDS = 0.02
+PRE_ROLL_SECONDS = 0.3
+MAX_CAPTURE_SECONDS = 30
+# Close the microphone after this long without a capture
+IDLE_CLOSE_SECONDS = 120
+
+
+class RingBuffer:
+    """Fixed-size int16 ring buffer addressed by absolute sample index."""
+
+    def __init__(self, capacity: int):
+        self._data = np.zeros(capacity, dtype=np.int16)
+        self.capacity = capacity
+        self.written = 0  # total samples ever written
+        self._lock = threading.Lock()
+
+    def write(self, samples: np.ndarray) -> None:
+        """Append samples, overwriting the oldest ones when full."""
+        total = len(samples)
+        if total > self.capacity:
+            samples = samples[-self.capacity:]
+        n = len(samples)
+        with self._lock:
+            start = (self.written + total - n) % self.capacity
+            first = min(n, self.capacity - start)
+            self._data[start:start + first] = samples[:first]
+            if first < n:
+                self._data[:n - first] = samples[first:]
+            self.written += total
+
+    def read(self, start: int, end: int) -> np.ndarray:
+        """Copy samples [start, end) by absolute index.
+
+        Samples that have already been overwritten are skipped, so the
+        result may be shorter than requested.
+        """
+        with self._lock:
+            start = max(start, self.written - self.capacity, 0)
+            end = min(end, self.written)
+            if end <= start:
+                return np.zeros(0, dtype=np.int16)
+            a, b = start % self.capacity, end % self.capacity
+            if a < b:
+                return self._data[a:b].copy()
+            return np.concatenate((self._data[a:], self._data[:b]))
+
+
+class MicStream:
+    """Callback-driven microphone input that stays open between captures."""
+
+    def __init__(
+        self,
+        sample_rate: int = SAMPLE_RATE,
+        max_seconds: float = MAX_CAPTURE_SECONDS,
+        pre_roll: float = PRE_ROLL_SECONDS,
+        block_seconds: float = BLOCK_SECONDS,
+    ):
+        self.sample_rate = sample_rate
+        self.pre_roll = pre_roll
+        self.block_seconds = block_seconds
+        self.ring = RingBuffer(int((max_seconds + pre_roll + 1) * sample_rate))
+        self._stream = None
+        self._lock = threading.Lock()
+        self._idle_timer = None
+        self._opened_at = 0  # ring position when the stream was last opened
+        self.status_errors = 0
+
+    def _callback(self, indata, frames, time_info, status):
+        if status:
+            self.status_errors += 1
+        self.ring.write(indata[:, 0])
+
+    def start(self) -> None:
+        """Open the input stream if it isn't already running."""
+        import sounddevice as sd
+
+        with self._lock:
+            self._cancel_idle_timer()
+            if self._stream is not None and self._stream.active:
+                return
+            self._stream = sd.InputStream(
+                samplerate=self.sample_rate,
+                channels=1,
+                dtype="int16",
+                blocksize=int(self.sample_rate * self.block_seconds),
+                callback=self._callback,
+            )
+            # Audio from before a close is stale and must not become pre-roll
+            self._opened_at = self.ring.written
+            self._stream.start()
+
+    def close(self) -> None:
+        """Stop and close the input stream."""
+        with self._lock:
+            self._cancel_idle_timer()
+            if self._stream is not None:
+                try:
+                    self._stream.stop()
+                    self._stream.close()
+                except Exception as e:
+                    warnings.warn(f"Closing microphone failed: {e}")
+                self._stream = None
+
+    def _cancel_idle_timer(self):
+        if self._idle_timer is not None:
+            self._idle_timer.cancel()
+            self._idle_timer = None
+
+    def _schedule_idle_close(self):
+        with self._lock:
+            self._cancel_idle_timer()
+            self._idle_timer = threading.Timer(IDLE_CLOSE_SECONDS, self.close)
+            self._idle_timer.daemon = True
+            self._idle_timer.start()
+
+    @property
+    def position(self) -> int:
+        """Absolute index of the next sample to be written."""
+        return self.ring.written
+
+    def capture(
+        self,
+        stop_event: threading.Event,
+        max_duration: float = MAX_CAPTURE_SECONDS,
+        on_audio=None,
+    ) -> np.ndarray:
+        """Record until stop_event is set or max_duration elapses.
+
+        Args:
+            stop_event: Set by another thread to end the capture.
+            max_duration: Upper bound on capture length in seconds.
+            on_audio: Optional callable fed each new block of samples (from
+                the start of the pre-roll) as it is captured; returning True
+                ends the capture, e.g. when an endpointer hears silence.
+
+        Returns:
+            int16 mono samples, including up to pre_roll seconds captured
+            before this call.
+        """
+        self.start()
+        try:
+            start = max(self._opened_at, self.position - int(self.pre_roll * self.sample_rate))
+            end = start
+            deadline = time.monotonic() + max_duration
+            while not stop_event.is_set() and time.monotonic() < deadline:
+                stop_event.wait(self.block_seconds)
+                if on_audio is not None:
+                    fed, end = end, self.position
+                    if on_audio(self.ring.read(fed, end)):
+                        return self.ring.read(start, end)
+            return self.ring.read(start, self.position)
+        finally:
+            self._schedule_idle_close()
+
+
+_mic = None
+_mic_lock = threading.Lock()
+
+
+def get_mic() -> MicStream:
+    """Return the process-wide microphone stream."""
+    global _mic
+    with _mic_lock:
+        if _mic is None:
+            _mic = MicStream()
+        return _mic
@@ -1,36 +1,210 @@
-"""Voice conversation flow orchestrator enforcing ask-before-every-action permission."""
+"""Voice conversation flow orchestrator enforcing ask-before-every-action permission.
+
+The walkthrough is an explicit state machine (see ``ConversationFlow.STATES``).
+Speech is queued without blocking, so results are spoken while the next
+prompt is being synthesized and commands run while "Executing step N" plays;
+the flow only waits for speech to finish before opening the microphone.
+While the user answers step N, step N+1's overlay and audio are prepared on
+a worker thread. Time spent in each state is recorded in ``timings``.
+
+Steps are sorted into risk tiers (``fixes.plan_risks``). When a plan has
+several read-only or reversible steps, the user is offered one consent for
+all of them up front; high-risk steps are still confirmed one at a time, and
+``WAIT`` pseudo-steps never need a prompt.
+"""
 
 import os
+import queue
+import threading
+import time
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 
 import anthropic
 
-from fixme.voice_input import is_affirmative, is_negative
+from fixme import answers, intents
+from fixme.fixes import RISK_HIGH, is_wait, plan_risks
 
 MODEL = "claude-sonnet-4-20250514"
 
+# Answers to questions are short and spoken as they stream in
+ANSWER_MAX_TOKENS = 300
+# Move on if the first sentence of an answer takes longer than this
+FIRST_SENTENCE_TIMEOUT = 5.0
+# Stop speaking an answer that is still streaming after this long
+ANSWER_TIMEOUT = 10.0
+# Upper bound on the background request, which still fills the cache
+ANSWER_REQUEST_TIMEOUT = 30.0
+
+# Offer one consent for the low-risk steps when a plan has at least this many
+MIN_BATCH_STEPS = 2
+# ...and when the step prompts it would skip take at least this many times
+# as long to say as the offer, so a declined offer costs less than an
+# accepted one saves
+BATCH_BREAK_EVEN = 2.0
+
+# Walkthrough states
+ANNOUNCE = "announce"
+CONSENT = "consent"
+SHOW_STEP = "show_step"
+PROMPT = "prompt"
+LISTEN = "listen"
+ANSWER = "answer"
+EXECUTE = "execute"
+REPORT = "report"
+SKIP = "skip"
+ABORT = "abort"
+SUMMARY = "summary"
+DONE = "done"
+
+
+class StateTimer:
+    """Wall-clock time spent in each state of a walkthrough."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.started_at = time.perf_counter()
+            self.trace = []  # (state, step_num, start_ms, duration_ms)
+            self.resolved_at = None
+
+    def mark_resolved(self) -> None:
+        """Note that the last fix action so far has just completed."""
+        with self._lock:
+            self.resolved_at = time.perf_counter()
+
+    def record(self, state: str, step_num: int | None, started: float) -> None:
+        """Record that state ran from perf_counter() time started until now."""
+        now = time.perf_counter()
+        with self._lock:
+            self.trace.append((
+                state, step_num,
+                round((started - self.started_at) * 1000, 1),
+                round((now - started) * 1000, 1),
+            ))
+
+    def summary(self) -> dict:
+        """Return {wall_ms, resolved_ms, states: {state: {count, total_ms, max_ms}}, trace}.
+
+        resolved_ms is the time to resolution: from the start of the
+        walkthrough until the last successful step finished (None if no
+        step succeeded).
+        """
+        with self._lock:
+            states = {}
+            for state, _step, _start, duration in self.trace:
+                entry = states.setdefault(state, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+                entry["count"] += 1
+                entry["total_ms"] = round(entry["total_ms"] + duration, 1)
+                entry["max_ms"] = max(entry["max_ms"], duration)
+            return {
+                "wall_ms": round((time.perf_counter() - self.started_at) * 1000, 1),
+                "resolved_ms": (
+                    round((self.resolved_at - self.started_at) * 1000, 1)
+                    if self.resolved_at is not None else None
+                ),
+                "states": states,
+                "trace": list(self.trace),
+            }
+
+
+class _Walk:
+    """Mutable state of one walkthrough."""
+
+    def __init__(self, diagnosis: str, steps: list[dict], presynth_job):
+        self.diagnosis = diagnosis
+        self.steps = steps
+        self.presynth_job = presynth_job
+        self.risks = plan_risks(steps)
+        self.batch = _low_risk_indexes(steps, self.risks)
+        self.batch_approved = False
+        self.asking_batch = False  # the open question is the batch consent
+        self.index = 0
+        self.response = ""
+        self.result = None
+        self.fixes_applied = 0
+        self.speech = None  # handle of the last queued utterance
+        self.prepared = {}  # step index -> Future of its preparation
+
+    @property
+    def step(self) -> dict:
+        return self.steps[self.index]
+
+    @property
+    def step_num(self) -> int:
+        return self.index + 1
+
+
+def _low_risk_indexes(steps: list[dict], risks: list[str]) -> list[int]:
+    """Indexes of the steps a batch consent covers (not WAITs or high risk)."""
+    return [
+        i for i, (step, risk) in enumerate(zip(steps, risks))
+        if risk != RISK_HIGH and not is_wait(step.get("command", ""))
+    ]
+
 
 class ConversationFlow:
     """Orchestrates voice-guided IT fix execution with per-step permission."""
 
-    def __init__(self, lang, tts, voice_input_module, overlay, fixes):
+    STATES = (ANNOUNCE, CONSENT, SHOW_STEP, PROMPT, LISTEN, ANSWER, EXECUTE, REPORT, SKIP, ABORT, SUMMARY)
+
+    def __init__(
+        self, lang, tts, voice_input_module, overlay, fixes,
+        client=None, answer_cache=None, batch_consent=True, on_event=None,
+    ):
         """Initialize the conversation flow.
 
         Args:
-            lang: Language code ("en" or "es").
+            lang: Language code (any of translate.LANG_NAMES).
             tts: The tts module (must have speak function).
             voice_input_module: The voice_input module (must have listen function).
             overlay: An Overlay instance.
             fixes: The fixes module (must have execute function).
+            client: Anthropic client for answering questions; by default one
+                is created from ANTHROPIC_API_KEY.
+            answer_cache: answers.AnswerCache; defaults to the shared one.
+            batch_consent: Offer one consent for all low-risk steps.
+            on_event: Called as on_event(name, **data) at walkthrough
+                milestones, e.g. for recording chapters:
+                "walkthrough_started" (diagnosis, steps),
+                "step_shown" (step, total, description),
+                "step_approved" (step, auto), "batch_answered" (approved),
+                "step_executing" (step, command),
+                "step_result" (step, command, ok, message),
+                "step_skipped" (step), "walkthrough_aborted" (step),
+                "walkthrough_ended" (fixes_applied, steps).
         """
         self.lang = lang
         self.tts = tts
         self.voice_input = voice_input_module
         self.overlay = overlay
         self.fixes = fixes
-
-        api_key = os.environ.get("ANTHROPIC_API_KEY")
-        self._client = anthropic.Anthropic(api_key=api_key) if api_key else None
+        self.batch_consent = batch_consent
+        self.on_event = on_event
+        self.timings = StateTimer()
+        self._preparer = None
+        self._answers = answer_cache if answer_cache is not None else answers.get_answer_cache()
+        self._handlers = {
+            ANNOUNCE: self._on_announce,
+            CONSENT: self._on_consent,
+            SHOW_STEP: self._on_show_step,
+            PROMPT: self._on_prompt,
+            LISTEN: self._on_listen,
+            ANSWER: self._on_answer,
+            EXECUTE: self._on_execute,
+            REPORT: self._on_report,
+            SKIP: self._on_skip,
+            ABORT: self._on_abort,
+            SUMMARY: self._on_summary,
+        }
+
+        if client is None:
+            api_key = os.environ.get("ANTHROPIC_API_KEY")
+            client = anthropic.Anthropic(api_key=api_key) if api_key else None
+        self._client = client
 
     def run_fix(self, diagnosis_result: dict) -> None:
         """Execute a diagnosed fix with per-step voice permission.
@@ -41,6 +215,7 @@ class ConversationFlow:
         """
         steps = diagnosis_result.get("steps", [])
         diagnosis = diagnosis_result.get("diagnosis", "Unknown issue")
+        self.timings.reset()
 
         if not steps:
             self.tts.speak(
@@ -50,146 +225,408 @@ class ConversationFlow:
             )
             return
 
-        # Announce the diagnosis
-        self.tts.speak(
-            f"I found the issue: {diagnosis}. "
-            f"I have {len(steps)} steps to fix it. Let's go through each one.",
-            self.lang,
-        )
+        # Translate every prompt of the walkthrough in one batched request,
+        # then render them all in the background while the walkthrough runs
+        phrases = self._plan_phrases(diagnosis, steps)
+        prepare = getattr(self.tts, "prepare_phrases", None)
+        if prepare and self.lang != "en":
+            prepare(
+                [diagnosis] + [s.get("description", "Unknown step") for s in steps] + phrases,
+                self.lang,
+            )
+        presynthesize = getattr(self.tts, "presynthesize", None)
+        presynth_job = presynthesize(phrases, self.lang) if presynthesize else None
 
-        fixes_applied = 0
+        try:
+            self._walk_steps(diagnosis, steps, presynth_job)
+        finally:
+            if presynth_job is not None:
+                presynth_job.cancel()
+
+    def _walk_steps(self, diagnosis: str, steps: list[dict], presynth_job) -> None:
+        """Run the walkthrough state machine from ANNOUNCE until DONE."""
+        walk = _Walk(diagnosis, steps, presynth_job)
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="flow-prepare") as preparer:
+            self._preparer = preparer
+            try:
+                state = ANNOUNCE
+                while state != DONE:
+                    started = time.perf_counter()
+                    step_num = walk.step_num if walk.index < len(steps) else None
+                    next_state = self._handlers[state](walk)
+                    self.timings.record(state, step_num, started)
+                    state = next_state
+            finally:
+                self._preparer = None
+
+    def _emit(self, name: str, **data) -> None:
+        """Tell on_event about a milestone; its errors never stop the walkthrough."""
+        if self.on_event is None:
+            return
+        try:
+            self.on_event(name, **data)
+        except Exception as e:
+            warnings.warn(f"on_event({name!r}) failed: {e}")
 
-        for i, step in enumerate(steps):
-            step_num = i + 1
-            description = step.get("description", "Unknown step")
-            command = step.get("command", "")
-            needs_admin = step.get("needs_admin", False)
-            ui_highlight = step.get("ui_highlight")
-
-            # Show overlay
-            self.overlay.show_step(step_num, len(steps), description, ui_highlight)
-
-            # Ask permission
-            permission = self._ask_permission(step_num, step)
-
-            if permission == "yes":
-                self.tts.speak(
-                    f"Executing step {step_num}...",
-                    self.lang,
-                )
-                success, msg = self.fixes.execute(command, needs_admin)
-
-                if success:
-                    self.overlay.show_success(step_num)
-                    self.tts.speak(
-                        f"Step {step_num} complete. {msg}",
-                        self.lang,
-                    )
-                    fixes_applied += 1
-                else:
-                    self.tts.speak(
-                        f"Step {step_num} failed: {msg}. Moving on.",
-                        self.lang,
-                    )
-
-            elif permission == "skip":
-                self.tts.speak(f"Skipping step {step_num}.", self.lang)
-
-            elif permission == "abort":
-                self.tts.speak("Stopping the fix process.", self.lang)
-                self.overlay.clear_step()
-                break
+    # ── Speech helpers ────────────────────────────────────────────────────────
 
-            self.overlay.clear_step()
+    def _say(self, walk: _Walk, text: str) -> None:
+        """Queue text for speaking without waiting for it."""
+        walk.speech = self.tts.speak(text, self.lang, block=False)
 
-        # Summary
-        if fixes_applied == 0:
-            self.tts.speak("No fixes were applied.", self.lang)
-        else:
-            self.tts.speak(
-                f"All done! {fixes_applied} of {len(steps)} steps were applied. "
-                "The fix process is complete.",
-                self.lang,
-            )
+    def _finish_speaking(self, walk: _Walk) -> None:
+        """Wait until everything queued so far has been spoken."""
+        if walk.speech is not None and hasattr(walk.speech, "wait"):
+            walk.speech.wait()
+        walk.speech = None
 
-    def _ask_permission(self, step_num: int, step: dict) -> str:
-        """Ask the user for permission to execute a step.
+    # ── Preparation of the next step ──────────────────────────────────────────
 
-        Loops until a clear yes/no/abort is received. Questions from the user
-        are answered via Claude and then permission is re-asked.
+    def _prepare(self, walk: _Walk, index: int) -> None:
+        """Start preparing step index's overlay and audio in the background."""
+        if index >= len(walk.steps) or index in walk.prepared or self._preparer is None:
+            return
+        walk.prepared[index] = self._preparer.submit(self._prepare_step, walk, index)
+
+    def _prepare_step(self, walk: _Walk, index: int) -> None:
+        step = walk.steps[index]
+        step_num = index + 1
+        prepare_overlay = getattr(self.overlay, "prepare_step", None)
+        if prepare_overlay:
+            prepare_overlay(
+                step_num, len(walk.steps), step.get("description", "Unknown step"),
+                step.get("ui_highlight"),
+            )
+        presynthesize = getattr(self.tts, "presynthesize", None)
+        if presynthesize:
+            # A no-op for phrases the plan-wide job has rendered or queued
+            presynthesize([
+                self._step_prompt(step_num, step.get("description", "Unknown step")),
+                f"Executing step {step_num}...",
+            ], self.lang)
+
+    def _wait_prepared(self, walk: _Walk, index: int) -> None:
+        future = walk.prepared.get(index)
+        if future is None:
+            return
+        try:
+            future.result()
+        except Exception as e:
+            warnings.warn(f"Preparing step {index + 1} failed: {e}")
 
-        Args:
-            step_num: The current step number.
-            step: The step dict with description, command, etc.
+    def _next_step(self, walk: _Walk) -> str:
+        walk.index += 1
+        return SHOW_STEP if walk.index < len(walk.steps) else SUMMARY
 
-        Returns:
-            "yes", "skip", or "abort".
-        """
-        description = step.get("description", "Unknown step")
+    # ── States ────────────────────────────────────────────────────────────────
 
-        while True:
-            self.tts.speak(
-                f"Step {step_num}: I want to {description}. "
-                "Shall I proceed? Say yes, no, or ask me a question.",
-                self.lang,
-            )
+    def _on_announce(self, walk: _Walk) -> str:
+        self._emit("walkthrough_started", diagnosis=walk.diagnosis, steps=len(walk.steps))
+        self._say(walk, self._announce_prompt(walk.diagnosis, len(walk.steps)))
+        self._prepare(walk, 0)
+        if self._offer_batch(walk.steps, walk.batch):
+            return CONSENT
+        return SHOW_STEP
 
-            response = self.voice_input.listen(
-                mode="open", lang=self.lang, timeout=15
-            )
+    def _offer_batch(self, steps: list[dict], batch: list[int]) -> bool:
+        """Whether to offer one consent for the low-risk steps.
 
-            if not response or not response.strip():
-                # No response, ask again
-                continue
+        Only when it saves time: speaking length stands in for time.
+        """
+        if not self.batch_consent or len(batch) < MIN_BATCH_STEPS:
+            return False
+        skipped = sum(
+            len(self._step_prompt(i + 1, steps[i].get("description", "Unknown step"))) for i in batch
+        )
+        return skipped >= BATCH_BREAK_EVEN * len(self._consent_prompt(steps, batch))
+
+    def _on_consent(self, walk: _Walk) -> str:
+        walk.asking_batch = True
+        self._say(walk, self._consent_prompt(walk.steps, walk.batch))
+        self._finish_speaking(walk)
+        return LISTEN
+
+    def _auto_approved(self, walk: _Walk) -> bool:
+        """Whether the current step runs without its own permission prompt."""
+        if is_wait(walk.step.get("command", "")):
+            return True
+        return walk.batch_approved and walk.index in walk.batch
+
+    def _on_show_step(self, walk: _Walk) -> str:
+        self._wait_prepared(walk, walk.index)
+        step = walk.step
+        # Drawn straight over the previous step; the overlay is only cleared
+        # (and hidden) once the walkthrough ends
+        self.overlay.show_step(
+            walk.step_num, len(walk.steps), step.get("description", "Unknown step"),
+            step.get("ui_highlight"),
+        )
+        self._emit("step_shown", step=walk.step_num, total=len(walk.steps),
+                   description=step.get("description", "Unknown step"))
+        if self._auto_approved(walk):
+            self._emit("step_approved", step=walk.step_num, auto=True)
+            self._prepare(walk, walk.index + 1)
+            return EXECUTE
+        return PROMPT
+
+    def _on_prompt(self, walk: _Walk) -> str:
+        self._say(walk, self._step_prompt(walk.step_num, walk.step.get("description", "Unknown step")))
+        # Get the next step ready while this one is asked and answered
+        self._prepare(walk, walk.index + 1)
+        # Don't open the microphone while we are still talking
+        self._finish_speaking(walk)
+        return LISTEN
+
+    def _on_listen(self, walk: _Walk) -> str:
+        response = self.voice_input.listen(mode="open", lang=self.lang, timeout=15)
+        walk.response = response or ""
+        if not walk.response.strip():
+            # No response, ask again
+            return CONSENT if walk.asking_batch else PROMPT
+
+        intent = intents.classify(walk.response, self.lang)
+        if walk.asking_batch and intent in (intents.YES, intents.NO, intents.SKIP):
+            walk.asking_batch = False
+            walk.batch_approved = intent == intents.YES
+            self._emit("batch_answered", approved=walk.batch_approved)
+            self._say(walk, self._consent_reply(walk.batch_approved))
+            return SHOW_STEP
+        if intent == intents.YES:
+            self._emit("step_approved", step=walk.step_num, auto=False)
+            return EXECUTE
+        if intent in (intents.NO, intents.SKIP):
+            return SKIP
+        if intent == intents.ABORT:
+            return ABORT
+        # User asked a question (or said something unclear) — answer it
+        return ANSWER
+
+    def _on_answer(self, walk: _Walk) -> str:
+        question = walk.response
+        if question.strip() == intents.QUESTION_SENTINEL:
+            # Came from tkinter "Ask a question" button, need to get actual question
+            self._say(walk, "What would you like to know?")
+            self._finish_speaking(walk)
+            question = self.voice_input.listen(mode="open", lang=self.lang, timeout=15)
+
+        if not question or not question.strip():
+            # Nothing heard: don't look up or ask about an empty question
+            self._say(walk, "Sorry, I didn't catch that.")
+            return CONSENT if walk.asking_batch else PROMPT
+
+        if walk.asking_batch:
+            batch = [walk.steps[i] for i in walk.batch]
+            step = {
+                "description": "; ".join(s.get("description", "Unknown step") for s in batch),
+                "command": " ; ".join(s.get("command", "") for s in batch),
+            }
+        else:
+            step = walk.step
+        # Each sentence is queued as soon as it streams in, so the first one
+        # plays while the rest are generated and synthesized
+        for sentence in self._answer_sentences(question, step):
+            self._say(walk, sentence)
+        # Loop back to re-ask permission (queued behind the answer)
+        return CONSENT if walk.asking_batch else PROMPT
+
+    def _on_execute(self, walk: _Walk) -> str:
+        step = walk.step
+        # The command runs while the announcement is playing; waits are silent
+        if not is_wait(step.get("command", "")):
+            self._say(walk, f"Executing step {walk.step_num}...")
+        self._emit("step_executing", step=walk.step_num, command=step.get("command", ""))
+        walk.result = self.fixes.execute(step.get("command", ""), step.get("needs_admin", False))
+        return REPORT
+
+    def _on_report(self, walk: _Walk) -> str:
+        success, msg = walk.result
+        self._emit("step_result", step=walk.step_num, command=walk.step.get("command", ""),
+                   ok=bool(success), message=msg)
+        if success:
+            self.timings.mark_resolved()
+        if is_wait(walk.step.get("command", "")):
+            walk.fixes_applied += success
+            return self._next_step(walk)
+        # The fixed part is pre-rendered; only the command output is new
+        if success:
+            self.overlay.show_success(walk.step_num)
+            self._say(walk, f"Step {walk.step_num} complete.")
+            if msg:
+                self._say(walk, msg)
+            walk.fixes_applied += 1
+        else:
+            self._say(walk, f"Step {walk.step_num} failed.")
+            if msg:
+                self._say(walk, msg)
+            self._say(walk, "Moving on.")
+        return self._next_step(walk)
+
+    def _on_skip(self, walk: _Walk) -> str:
+        self._emit("step_skipped", step=walk.step_num)
+        self._say(walk, f"Skipping step {walk.step_num}.")
+        return self._next_step(walk)
+
+    def _on_abort(self, walk: _Walk) -> str:
+        if walk.presynth_job is not None:
+            walk.presynth_job.cancel()
+        self._emit("walkthrough_aborted", step=walk.step_num)
+        self._say(walk, "Stopping the fix process.")
+        return SUMMARY
+
+    def _on_summary(self, walk: _Walk) -> str:
+        self.overlay.clear_step()
+        self._emit("walkthrough_ended", fixes_applied=walk.fixes_applied, steps=len(walk.steps))
+        self._say(walk, self._summary_prompt(walk.fixes_applied, len(walk.steps)))
+        self._finish_speaking(walk)
+        return DONE
+
+    @staticmethod
+    def _announce_prompt(diagnosis: str, total: int) -> str:
+        """Return the spoken announcement of a diagnosis."""
+        return (
+            f"I found the issue: {diagnosis}. "
+            f"I have {total} steps to fix it. Let's go through each one."
+        )
 
-            response_lower = response.lower().strip()
+    @staticmethod
+    def _consent_prompt(steps: list[dict], batch: list[int]) -> str:
+        """Return the spoken offer to run all low-risk steps with one consent.
 
-            if is_affirmative(response, self.lang):
-                return "yes"
+        A count, not the list: each step is still shown as it runs.
+        """
+        return (
+            f"{len(batch)} of {len(steps)} steps are low-risk checks and resets. "
+            "Do those without asking?"
+        )
 
-            if is_negative(response, self.lang):
-                return "skip"
+    @staticmethod
+    def _consent_reply(approved: bool) -> str:
+        """Return the acknowledgement of the batch consent answer."""
+        if approved:
+            return "Okay. I'll still ask before anything riskier."
+        return "Okay."
+
+    @staticmethod
+    def _step_prompt(step_num: int, description: str) -> str:
+        """Return the spoken permission prompt for a step."""
+        return (
+            f"Step {step_num}: I want to {description}. "
+            "Shall I proceed? Say yes, no, or ask me a question."
+        )
 
-            # Check for abort keywords
-            abort_keywords = {"stop", "abort", "quit", "exit", "para", "detener"}
-            if any(kw in response_lower for kw in abort_keywords):
-                return "abort"
+    @staticmethod
+    def _summary_prompt(fixes_applied: int, total: int) -> str:
+        """Return the spoken summary at the end of a walkthrough."""
+        if fixes_applied == 0:
+            return "No fixes were applied."
+        return (
+            f"All done! {fixes_applied} of {total} steps were applied. "
+            "The fix process is complete."
+        )
 
-            # User asked a question — answer it
-            if response_lower == "__question__":
-                # Came from tkinter "Ask a question" button, need to get actual question
-                self.tts.speak("What would you like to know?", self.lang)
-                response = self.voice_input.listen(
-                    mode="open", lang=self.lang, timeout=15
-                )
+    def _plan_phrases(self, diagnosis: str, steps: list[dict]) -> list[str]:
+        """Return the fixed phrases a walkthrough of these steps can speak.
 
-            answer = self._answer_question(response, step)
-            self.tts.speak(answer, self.lang)
-            # Loop back to re-ask permission
+        Phrases are ordered roughly as they will be spoken. Command output
+        and answers to questions are not known in advance and are rendered
+        when spoken.
+        """
+        total = len(steps)
+        phrases = [self._announce_prompt(diagnosis, total)]
+        batch = _low_risk_indexes(steps, plan_risks(steps))
+        if self._offer_batch(steps, batch):
+            phrases += [
+                self._consent_prompt(steps, batch),
+                self._consent_reply(True),
+                self._consent_reply(False),
+            ]
+        for i, step in enumerate(steps):
+            step_num = i + 1
+            phrases += [
+                self._step_prompt(step_num, step.get("description", "Unknown step")),
+                f"Executing step {step_num}...",
+                f"Step {step_num} complete.",
+                f"Step {step_num} failed.",
+                f"Skipping step {step_num}.",
+            ]
+        phrases += ["Moving on.", "What would you like to know?", "Sorry, I didn't catch that.",
+                    "Stopping the fix process."]
+        phrases += [self._summary_prompt(n, total) for n in range(total + 1)]
+        return phrases
 
     def _answer_question(self, question: str, step: dict) -> str:
-        """Answer a user question about the current fix step using Claude.
+        """Answer a user question about the current fix step.
 
         Args:
             question: The user's question.
             step: The current step dict for context.
 
         Returns:
-            Claude's answer as a string.
+            The whole answer as a string (see _answer_sentences).
         """
+        return " ".join(self._answer_sentences(question, step))
+
+    def _answer_sentences(self, question: str, step: dict):
+        """Yield the answer to a question one sentence at a time.
+
+        Cached answers are yielded at once. Otherwise Claude's reply is
+        streamed and each sentence is yielded as soon as it is complete, so
+        speaking starts with the first sentence. If no sentence arrives
+        within FIRST_SENTENCE_TIMEOUT, or the answer runs past
+        ANSWER_TIMEOUT, the walkthrough moves on; the reply is still
+        cached when it completes.
+
+        Args:
+            question: The user's question.
+            step: The current step dict for context.
+        """
+        command = step.get("command", "")
+        cached = self._answers.get(command, question)
+        if cached is not None:
+            sentences, rest = answers.split_sentences(cached)
+            yield from sentences + ([rest.strip()] if rest.strip() else [])
+            return
+
         if not self._client:
-            return (
+            yield (
                 "Sorry, I cannot answer questions right now because the API "
                 "is not configured."
             )
+            return
+
+        pending = queue.Queue()
+        threading.Thread(
+            target=self._stream_answer, args=(question, step, pending), daemon=True,
+        ).start()
+
+        deadline = time.monotonic() + ANSWER_TIMEOUT
+        spoken = 0
+        while True:
+            timeout = FIRST_SENTENCE_TIMEOUT if not spoken else deadline - time.monotonic()
+            try:
+                sentence = pending.get(timeout=max(0.0, timeout))
+            except queue.Empty:
+                warnings.warn("Question answering timed out")
+                if not spoken:
+                    yield "Sorry, that's taking too long. Let me ask again about this step."
+                return
+            if sentence is None:
+                break
+            spoken += 1
+            yield sentence
+        if not spoken:
+            yield "Sorry, I couldn't answer that. Let me ask again about this step."
 
+    def _stream_answer(self, question: str, step: dict, sentences: queue.Queue) -> None:
+        """Stream Claude's answer into sentences, ending with None (worker thread)."""
         description = step.get("description", "Unknown step")
         command = step.get("command", "Unknown command")
-
+        text = buffer = ""
         try:
-            message = self._client.messages.create(
+            with self._client.messages.stream(
                 model=MODEL,
-                max_tokens=512,
+                max_tokens=ANSWER_MAX_TOKENS,
+                timeout=ANSWER_REQUEST_TIMEOUT,
                 messages=[
                     {
                         "role": "user",
@@ -199,14 +636,23 @@ class ConversationFlow:
                             f"Step description: {description}\n"
                             f"Command: {command}\n\n"
                             f"The user asks: {question}\n\n"
-                            "Answer helpfully, concisely, and in plain language. "
-                            "If they ask about safety, explain whether the action is "
-                            "reversible and what risks exist."
+                            "Answer helpfully, concisely, and in plain language, in two "
+                            "or three short sentences of English (it is translated for "
+                            "the user). If they ask about safety, explain whether the "
+                            "action is reversible and what risks exist."
                         ),
                     }
                 ],
-            )
-            return message.content[0].text.strip()
+            ) as stream:
+                for chunk in stream.text_stream:
+                    text += chunk
+                    complete, buffer = answers.split_sentences(buffer + chunk)
+                    for sentence in complete:
+                        sentences.put(sentence)
+            if buffer.strip():
+                sentences.put(buffer.strip())
+            self._answers.put(command, question, text.strip())
         except Exception as e:
             warnings.warn(f"Question answering failed: {e}")
-            return "Sorry, I couldn't answer that. Let me ask again about this step."
+        finally:
+            sentences.put(None)
@@ -0,0 +1,327 @@
+"""Pluggable video encoders and recording profiles for fixme.recorder.
+
+Encoders take BGRA frames as captured and do any scaling and color
+conversion themselves:
+
+- ``FFmpegEncoder`` pipes frames to an ``ffmpeg`` subprocess encoding
+  H.264 (libx264) or, without it, VP9 (libvpx-vp9). Frames are written to
+  the pipe straight from the capture buffer, each in a minimal Matroska
+  block carrying its timestamp, so a held frame is never sent again and
+  the file is variable frame rate; scaling and conversion happen inside
+  ffmpeg.
+- ``OpenCVEncoder`` uses OpenCV's ``VideoWriter`` (``mp4v``), converting and
+  scaling into preallocated buffers. Its output is constant frame rate: a
+  held frame is written again from the converted buffer. It has no quality
+  setting.
+
+``open_encoder`` picks the first available one in ``ENCODER_PREFERENCE``.
+A profile (``PROFILES``) sets resolution scale, frame rate, quality (CRF, or
+a bitrate) and encoder speed preset.
+"""
+
+import shutil
+import struct
+import subprocess
+import sys
+import threading
+import warnings
+
+# Recording profiles. crf is used unless bitrate (e.g. "1M") is set; preset
+# is the libx264 speed preset, faster presets cost less CPU for bigger files.
+PROFILES = {
+    # Long audit recordings: small files, light on the machine being fixed
+    "audit": {"scale": 0.5, "fps": 5, "crf": 32, "bitrate": None, "preset": "veryfast"},
+    "standard": {"scale": 0.75, "fps": 10, "crf": 27, "bitrate": None, "preset": "veryfast"},
+    # Native resolution for reviewing small text
+    "full": {"scale": 1.0, "fps": 10, "crf": 23, "bitrate": None, "preset": "faster"},
+    # Always-on instant replay (fixme.replay)
+    "replay": {"scale": 0.5, "fps": 5, "crf": 30, "bitrate": None, "preset": "veryfast"},
+}
+DEFAULT_PROFILE = "standard"
+
+ENCODER_PREFERENCE = ["ffmpeg", "opencv"]
+
+# ffmpeg codecs in preference order -> extra arguments
+FFMPEG_CODECS = {
+    "libx264": [],
+    "libvpx-vp9": ["-deadline", "realtime", "-cpu-used", "8", "-row-mt", "1"],
+}
+
+# Seconds to wait for ffmpeg to finish writing the file after the last frame
+FFMPEG_CLOSE_TIMEOUT = 30
+
+# Matroska element IDs used for the timestamped stream piped to ffmpeg
+_EBML = b"\x1a\x45\xdf\xa3"
+_SEGMENT = b"\x18\x53\x80\x67"
+_CLUSTER = b"\x1f\x43\xb6\x75"
+_UNKNOWN_SIZE = b"\x01\xff\xff\xff\xff\xff\xff\xff"
+
+
+def _ebml(element_id: bytes, value) -> bytes:
+    """Encode one Matroska element; ints big-endian, str/bytes as is, lists nested."""
+    if isinstance(value, int):
+        payload = value.to_bytes(max(1, (value.bit_length() + 7) // 8), "big")
+    elif isinstance(value, str):
+        payload = value.encode()
+    elif isinstance(value, list):
+        payload = b"".join(_ebml(child_id, child) for child_id, child in value)
+    else:
+        payload = value
+    return element_id + _ebml_size(len(payload)) + payload
+
+
+def _ebml_size(size: int) -> bytes:
+    # Always the 8-byte form, valid for any size
+    return b"\x01" + size.to_bytes(7, "big")
+
+
+def get_profile(profile: str | dict | None) -> dict:
+    """Return a full profile from a profile name or partial dict of overrides."""
+    if profile is None or isinstance(profile, str):
+        name = profile or DEFAULT_PROFILE
+        if name not in PROFILES:
+            raise ValueError(f"Unknown recording profile: {name}")
+        return dict(PROFILES[name])
+    return {**PROFILES[DEFAULT_PROFILE], **profile}
+
+
+def scaled_size(size: tuple[int, int], scale: float) -> tuple[int, int]:
+    """Return size scaled and rounded down to even dimensions (needed for 4:2:0)."""
+    width, height = size
+    return max(2, int(width * scale) // 2 * 2), max(2, int(height * scale) // 2 * 2)
+
+
+class Encoder:
+    """Interface for video encoders.
+
+    Args:
+        path: Output file.
+        size: (width, height) of the frames written.
+        fps: Frame rate of the video.
+        profile: Full profile dict (see get_profile()).
+    """
+
+    name = "base"
+
+    def __init__(self, path: str, size: tuple[int, int], fps: float, profile: dict):
+        self.path = path
+        self.size = size
+        self.fps = fps
+        self.profile = profile
+        self.output_size = scaled_size(size, profile["scale"])
+
+    @classmethod
+    def available(cls) -> bool:
+        """Whether the encoder can be used on this machine."""
+        raise NotImplementedError
+
+    def write(self, frame) -> None:
+        """Encode one C-contiguous BGRA frame of self.size."""
+        raise NotImplementedError
+
+    def repeat(self, frame, count: int) -> None:
+        """Hold frame, the last one written, for count more frame slots.
+
+        Encoders that can only write frames write it again; others override
+        this to extend the frame instead.
+        """
+        for _ in range(count):
+            self.write(frame)
+
+    def close(self) -> None:
+        """Finish the file."""
+        raise NotImplementedError
+
+
+class FFmpegEncoder(Encoder):
+    """Encodes through an ffmpeg subprocess fed timestamped BGRA frames on stdin.
+
+    The input is Matroska with uncompressed video, one block per distinct
+    frame stamped with its slot time (milliseconds), and ffmpeg passes the
+    timestamps through to the output. repeat() only moves the clock on.
+    """
+
+    name = "ffmpeg"
+    _codecs = None  # FFMPEG_CODECS entries this ffmpeg build has, once probed
+    _probe_lock = threading.Lock()
+
+    @classmethod
+    def codecs(cls) -> list[str]:
+        """Return the usable FFMPEG_CODECS entries, best first."""
+        with cls._probe_lock:
+            if cls._codecs is None:
+                cls._codecs = []
+                binary = shutil.which("ffmpeg")
+                if binary:
+                    try:
+                        result = subprocess.run(
+                            [binary, "-hide_banner", "-encoders"],
+                            capture_output=True, text=True, timeout=10,
+                        )
+                        names = {line.split()[1] for line in result.stdout.splitlines()
+                                 if len(line.split()) > 1}
+                        cls._codecs = [codec for codec in FFMPEG_CODECS if codec in names]
+                    except (OSError, subprocess.TimeoutExpired):
+                        pass
+            return cls._codecs
+
+    @classmethod
+    def available(cls) -> bool:
+        return bool(cls.codecs())
+
+    def __init__(self, path: str, size: tuple[int, int], fps: float, profile: dict):
+        super().__init__(path, size, fps, profile)
+        self.codec = self.codecs()[0]
+        width, height = size
+        out_width, out_height = self.output_size
+        cmd = [
+            shutil.which("ffmpeg"), "-hide_banner", "-loglevel", "error", "-y",
+            "-f", "matroska", "-i", "-", "-fps_mode", "passthrough",
+        ]
+        if (out_width, out_height) != size:
+            cmd += ["-vf", f"scale={out_width}:{out_height}:flags=area"]
+        cmd += ["-c:v", self.codec, "-pix_fmt", "yuv420p"]
+        if profile.get("bitrate"):
+            cmd += ["-b:v", str(profile["bitrate"])]
+        elif self.codec == "libvpx-vp9":
+            cmd += ["-crf", str(profile["crf"]), "-b:v", "0"]
+        else:
+            cmd += ["-crf", str(profile["crf"])]
+        if self.codec == "libx264":
+            # No B-frames: with gaps in the timestamps their reordered decode
+            # times leave the MP4 with the wrong duration
+            cmd += ["-preset", profile["preset"], "-bf", "0"]
+        cmd += FFMPEG_CODECS[self.codec] + [path]
+
+        flags = subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0
+        self._process = subprocess.Popen(
+            cmd, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+            creationflags=flags,
+        )
+        self._slot = 0  # next frame slot
+        self._held = None  # frame held by repeat() since the last write
+        self._process.stdin.write(self._header())
+
+    def _header(self) -> bytes:
+        width, height = self.size
+        ebml = _ebml(_EBML, [
+            (b"\x42\x86", 1), (b"\x42\xf7", 1), (b"\x42\xf2", 4), (b"\x42\xf3", 8),
+            (b"\x42\x82", "matroska"), (b"\x42\x87", 4), (b"\x42\x85", 2),
+        ])
+        info = _ebml(b"\x15\x49\xa9\x66", [
+            (b"\x2a\xd7\xb1", 1_000_000),  # timestamps in milliseconds
+            (b"\x4d\x80", "fixme"), (b"\x57\x41", "fixme"),
+        ])
+        tracks = _ebml(b"\x16\x54\xae\x6b", [(b"\xae", [
+            (b"\xd7", 1), (b"\x73\xc5", 1), (b"\x83", 1),  # track 1, video
+            (b"\x86", "V_UNCOMPRESSED"),
+            (b"\x23\xe3\x83", round(1e9 / self.fps)),  # nominal frame duration (ns)
+            (b"\xe0", [(b"\xb0", width), (b"\xba", height), (b"\x2e\xb5\x24", b"BGRA")]),
+        ])])
+        return ebml + _SEGMENT + _UNKNOWN_SIZE + info + tracks
+
+    def _send(self, frame) -> None:
+        data = memoryview(frame).cast("B")
+        timestamp = round(self._slot * 1000 / self.fps)
+        # A cluster per frame, so the block's time needs no 16-bit offset
+        block = b"\xa3" + _ebml_size(len(data) + 4) + b"\x81" + struct.pack(">hB", 0, 0x80)
+        cluster = _ebml(b"\xe7", timestamp) + block
+        stdin = self._process.stdin
+        stdin.write(_CLUSTER + _ebml_size(len(cluster) + len(data)) + cluster)
+        # The pipe reads straight from the frame's memory; no bytes copy
+        stdin.write(data)
+
+    def write(self, frame) -> None:
+        self._send(frame)
+        self._slot += 1
+        self._held = None
+
+    def repeat(self, frame, count: int) -> None:
+        self._slot += count
+        self._held = frame
+
+    def close(self) -> None:
+        if self._held is not None:
+            # The last frame's duration needs a frame at the end of the hold
+            self._slot -= 1
+            self._send(self._held)
+            self._held = None
+        # communicate() closes stdin, which ends ffmpeg's input
+        try:
+            _, stderr = self._process.communicate(timeout=FFMPEG_CLOSE_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            self._process.kill()
+            _, stderr = self._process.communicate()
+        if self._process.returncode:
+            warnings.warn(f"ffmpeg exited with {self._process.returncode}: "
+                          f"{stderr.decode(errors='replace').strip()[-500:]}")
+
+
+class OpenCVEncoder(Encoder):
+    """Encodes with OpenCV's VideoWriter (mp4v); quality settings are ignored."""
+
+    name = "opencv"
+
+    @classmethod
+    def available(cls) -> bool:
+        try:
+            import cv2  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+    def __init__(self, path: str, size: tuple[int, int], fps: float, profile: dict):
+        super().__init__(path, size, fps, profile)
+        import cv2
+        import numpy as np
+
+        self._cv2 = cv2
+        self._writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), fps, self.output_size)
+        if not self._writer.isOpened():
+            raise OSError(f"OpenCV could not open {path} for writing")
+        out_width, out_height = self.output_size
+        # Reused for every frame instead of allocating per frame
+        self._bgr = np.empty((size[1], size[0], 3), np.uint8)
+        self._scaled = None
+        if self.output_size != size:
+            self._scaled = np.empty((out_height, out_width, 3), np.uint8)
+
+    def write(self, frame) -> None:
+        cv2 = self._cv2
+        cv2.cvtColor(frame, cv2.COLOR_BGRA2BGR, dst=self._bgr)
+        if self._scaled is None:
+            self._writer.write(self._bgr)
+        else:
+            cv2.resize(self._bgr, self.output_size, dst=self._scaled, interpolation=cv2.INTER_AREA)
+            self._writer.write(self._scaled)
+
+    def repeat(self, frame, count: int) -> None:
+        # The converted buffers still hold frame; only the encoding is repeated
+        converted = self._bgr if self._scaled is None else self._scaled
+        for _ in range(count):
+            self._writer.write(converted)
+
+    def close(self) -> None:
+        self._writer.release()
+
+
+ENCODERS = {"ffmpeg": FFmpegEncoder, "opencv": OpenCVEncoder}
+
+
+def open_encoder(
+    path: str,
+    size: tuple[int, int],
+    fps: float,
+    profile: dict,
+    preference: list[str] | None = None,
+) -> Encoder:
+    """Open the first available encoder in preference order.
+
+    Raises:
+        RuntimeError: If none of them is available.
+    """
+    for name in preference or ENCODER_PREFERENCE:
+        encoder = ENCODERS[name]
+        if encoder.available():
+            return encoder(path, size, fps, profile)
+    raise RuntimeError("No video encoder available (install ffmpeg or opencv-python)")
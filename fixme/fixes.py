@@ -7,6 +7,13 @@ import time
 
 _IS_MAC = sys.platform == "darwin"
 
+# Risk tiers, lowest first. Read-only and reversible steps can be approved
+# together with one consent; high-risk steps are always confirmed one by one.
+RISK_READ_ONLY = "read_only"
+RISK_REVERSIBLE = "reversible"
+RISK_HIGH = "high"
+RISK_TIERS = (RISK_READ_ONLY, RISK_REVERSIBLE, RISK_HIGH)
+
 # ── macOS fixes ───────────────────────────────────────────────────────────────
 
 MAC_FIXES = {
@@ -18,6 +25,7 @@ MAC_FIXES = {
             "networksetup -setairportpower en0 on",
         ],
         "needs_admin": False,
+        "risk": RISK_REVERSIBLE,
     },
     "flush_dns": {
         "label": "Flush DNS Cache",
@@ -26,6 +34,7 @@ MAC_FIXES = {
             "sudo killall -HUP mDNSResponder",
         ],
         "needs_admin": True,
+        "risk": RISK_HIGH,
     },
     "restart_network": {
         "label": "Full Network Reset",
@@ -37,6 +46,7 @@ MAC_FIXES = {
             "networksetup -setairportpower en0 on",
         ],
         "needs_admin": True,
+        "risk": RISK_HIGH,
     },
     "open_credential_manager": {
         "label": "Open Keychain Access",
@@ -44,6 +54,7 @@ MAC_FIXES = {
             "open -a 'Keychain Access'",
         ],
         "needs_admin": False,
+        "risk": RISK_READ_ONLY,
     },
 }
 
@@ -58,6 +69,7 @@ WIN_FIXES = {
             "netsh wlan connect name={ssid}",
         ],
         "needs_admin": False,
+        "risk": RISK_REVERSIBLE,
     },
     "flush_dns": {
         "label": "Flush DNS Cache",
@@ -65,6 +77,7 @@ WIN_FIXES = {
             "ipconfig /flushdns",
         ],
         "needs_admin": True,
+        "risk": RISK_HIGH,
     },
     "restart_network": {
         "label": "Full Network Reset",
@@ -77,6 +90,7 @@ WIN_FIXES = {
             "netsh wlan connect name={ssid}",
         ],
         "needs_admin": True,
+        "risk": RISK_HIGH,
     },
     "open_credential_manager": {
         "label": "Open Credential Manager",
@@ -84,11 +98,108 @@ WIN_FIXES = {
             "rundll32.exe keymgr.dll,KRShowKeyMgr",
         ],
         "needs_admin": False,
+        "risk": RISK_READ_ONLY,
     },
 }
 
 FIXES = MAC_FIXES if _IS_MAC else WIN_FIXES
 
+# Commands that only query the system (built-in FIXES entries that open a
+# window declare their own risk)
+_READ_ONLY_COMMANDS = re.compile(
+    r"^(WAIT:\d+"
+    r"|ping|nslookup|tracert|traceroute|pathping|whoami|hostname|systeminfo|getmac|netstat"
+    r"|ipconfig(\s+/all)?\s*$|ipconfig\s+/displaydns"
+    r"|netsh\s+(wlan|interface|int)\s+show"
+    r"|networksetup\s+-(get|list)|scutil\s+--(dns|nwi)|ifconfig\s*$|route\s+print|arp\s+-a)\b",
+    re.IGNORECASE,
+)
+# Commands whose effect goes away on its own or is undone by a later step
+_REVERSIBLE_COMMANDS = re.compile(
+    r"^(netsh\s+wlan\s+(connect|disconnect)"
+    r"|networksetup\s+-setairportpower"
+    r"|ipconfig\s+/(flushdns|renew|registerdns)"
+    r"|dscacheutil\s+-flushcache)\b",
+    re.IGNORECASE,
+)
+# Releasing the IP address leaves the machine offline until a renew, so it
+# is only reversible when a later low-risk step of the plan renews
+_IP_RELEASE = re.compile(r"^ipconfig\s+/release\b", re.IGNORECASE)
+_IP_RENEW = re.compile(r"^ipconfig\s+/renew\b", re.IGNORECASE)
+# Chained commands, redirection and elevation are never low risk
+_ALWAYS_HIGH = re.compile(r"[;&|<>`]|\$\(|^\s*sudo\b", re.IGNORECASE)
+
+
+def is_wait(command: str) -> bool:
+    """Whether a command is the WAIT:<seconds> pseudo-command."""
+    return command.startswith("WAIT:")
+
+
+def _declared_risk(command: str) -> str | None:
+    """Return the risk declared on the FIXES entry that runs command, if any."""
+    for fix in FIXES.values():
+        if command in fix["commands"]:
+            return fix.get("risk")
+    return None
+
+
+def command_risk(command: str, needs_admin: bool = False, renewed: bool = False) -> str:
+    """Derive a command's risk tier from its text.
+
+    Unknown commands are high risk, so only commands known to be harmless
+    can skip the per-step confirmation.
+
+    Args:
+        command: The command.
+        needs_admin: Whether it runs elevated.
+        renewed: Whether a later step renews the IP address (see plan_risks()).
+    """
+    command = command.strip()
+    if is_wait(command):
+        return RISK_READ_ONLY
+    if needs_admin or _ALWAYS_HIGH.search(command):
+        return RISK_HIGH
+    if renewed and _IP_RELEASE.match(command):
+        return RISK_REVERSIBLE
+    if _READ_ONLY_COMMANDS.match(command):
+        return RISK_READ_ONLY
+    if _REVERSIBLE_COMMANDS.match(command):
+        return RISK_REVERSIBLE
+    return RISK_HIGH
+
+
+def step_risk(step: dict, renewed: bool = False) -> str:
+    """Return a fix step's risk tier.
+
+    The tier declared on a built-in FIXES entry wins. Otherwise it is derived
+    from the command; a "risk" on the step itself (e.g. from the diagnosis)
+    can raise that tier but never lower it. Use plan_risks() for a whole
+    plan, so an IP release counts as reversible only when renewed.
+    """
+    command = step.get("command", "")
+    if is_wait(command):
+        return RISK_READ_ONLY
+    declared = _declared_risk(command)
+    if declared in RISK_TIERS and not step.get("needs_admin", False):
+        return declared
+    risk = command_risk(command, step.get("needs_admin", False), renewed)
+    claimed = step.get("risk")
+    if claimed in RISK_TIERS and RISK_TIERS.index(claimed) > RISK_TIERS.index(risk):
+        return claimed
+    return risk
+
+
+def plan_risks(steps: list[dict]) -> list[str]:
+    """Return the risk tier of each step of a plan."""
+    risks = []
+    for i, step in enumerate(steps):
+        renewed = bool(_IP_RELEASE.match(step.get("command", "").strip())) and any(
+            _IP_RENEW.match(later.get("command", "").strip()) and step_risk(later) != RISK_HIGH
+            for later in steps[i + 1:]
+        )
+        risks.append(step_risk(step, renewed))
+    return risks
+
 
 def get_current_ssid() -> str | None:
     """Detect the currently connected Wi-Fi SSID."""
@@ -137,7 +248,7 @@ def execute(command: str, needs_admin: bool = False) -> tuple[bool, str]:
         Tuple of (success: bool, message: str).
     """
     # Handle special WAIT command
-    if command.startswith("WAIT:"):
+    if is_wait(command):
         try:
             seconds = int(command.split(":")[1])
             time.sleep(seconds)
@@ -212,3 +323,26 @@ def execute(command: str, needs_admin: bool = False) -> tuple[bool, str]:
 def get_available_fixes() -> dict:
     """Return the dictionary of available fixes for the current platform."""
     return FIXES
+
+
+def quick_fix_plan(fix: dict, ssid: str = "") -> dict:
+    """Return a quick fix as a diagnosis result for ConversationFlow.run_fix().
+
+    Args:
+        fix: An entry of FIXES.
+        ssid: Current Wi-Fi network, shown in place of {ssid} in step
+            descriptions (commands keep the placeholder).
+    """
+    steps = []
+    for i, cmd in enumerate(fix["commands"]):
+        steps.append({
+            "step": i + 1,
+            "description": f"{fix['label']} - {cmd.replace('{ssid}', ssid)}",
+            "command": cmd,
+            "needs_admin": fix["needs_admin"],
+            "ui_highlight": None,
+        })
+    return {
+        "diagnosis": f"Running quick fix: {fix['label']}",
+        "steps": steps,
+    }
@@ -0,0 +1,265 @@
+"""Intent matcher for spoken permission answers.
+
+Each language's phrases are compiled once into a first-token index. Answers
+are classified in a single left-to-right pass over the tokens, preferring the
+longest phrase at each position. Matching is on whole tokens, so "no" does
+not match "know" and "si" does not match "sign". A negator just before a
+"yes" phrase ("not okay", "no está bien", "मत करो") turns it into a "no".
+
+Phrase markers: a leading "=" means the phrase only counts as the entire
+answer (Spanish "para" is "stop" alone but "for" in a sentence); a leading
+"^" means it only counts at the start of the answer (question words).
+"""
+
+import re
+import threading
+import unicodedata
+
+YES = "yes"
+NO = "no"
+SKIP = "skip"
+ABORT = "abort"
+QUESTION = "question"
+
+# Sentinel returned by the tkinter fallback's "Ask a question" button
+QUESTION_SENTINEL = "__question__"
+
+# Negators flip a following "yes" phrase within this many tokens
+NEGATION_WINDOW = 2
+
+PHRASES = {
+    "en": {
+        YES: [
+            "yes", "yeah", "yep", "yup", "ya", "sure", "okay", "ok", "alright",
+            "all right", "go ahead", "go on", "proceed", "do it", "please do",
+            "go for it", "sounds good", "fine", "of course", "affirmative",
+            "why not", "no problem", "no worries", "continue", "let's do it",
+        ],
+        NO: [
+            "no", "nope", "nah", "don't", "dont", "do not", "not now", "no thanks",
+            "no thank you", "negative", "cancel", "never", "i'd rather not",
+        ],
+        SKIP: ["skip", "skip it", "skip this", "skip that", "next", "next one", "move on", "pass"],
+        ABORT: [
+            "stop", "abort", "quit", "exit", "stop everything", "cancel everything",
+            "forget it", "=enough", "=halt",
+        ],
+        QUESTION: [
+            "^what", "^what's", "^why", "^how", "^is it", "^is this", "^will it",
+            "^does it", "^do i", "^can you", "^could", "^would", "^should",
+            "^which", "^when", "^where", "^who", "^wait", "not sure", "i'm not sure",
+            "don't know", "tell me more", "explain", "what does", "what is",
+        ],
+    },
+    "es": {
+        YES: [
+            "sí", "si", "claro", "claro que sí", "dale", "adelante", "hazlo", "ok",
+            "okay", "vale", "de acuerdo", "está bien", "esta bien", "bueno",
+            "por supuesto", "perfecto", "sigue", "continúa", "procede", "sí por favor",
+        ],
+        NO: ["no", "no gracias", "ahora no", "mejor no", "nunca", "cancelar", "cancela", "no lo hagas"],
+        SKIP: ["saltar", "salta", "sáltalo", "siguiente", "el siguiente", "pasa", "omitir", "omite"],
+        ABORT: ["detener", "detente", "alto", "=para", "para ya", "párale", "basta", "salir", "cancela todo"],
+        QUESTION: [
+            "^qué hace", "^qué es", "^qué pasa", "^qué significa", "^qué va", "^por qué",
+            "^cómo funciona", "^cómo se", "^cuál", "^es seguro", "^es peligroso", "^va a",
+            "^puedes", "^para qué", "^espera", "no sé", "no estoy seguro",
+            "no estoy segura", "explícame", "explica",
+        ],
+    },
+    "fr": {
+        YES: [
+            "oui", "ouais", "d'accord", "ok", "okay", "vas-y", "allez-y", "bien sûr",
+            "volontiers", "continue", "continuez", "fais-le", "faites-le", "c'est bon",
+            "parfait", "bien", "oui merci", "ça marche",
+        ],
+        NO: [
+            "non", "non merci", "pas maintenant", "surtout pas", "jamais", "annuler", "annule",
+            "ne fais pas", "ne le fais pas", "ne faites pas",
+        ],
+        SKIP: ["passe", "passer", "sauter", "saute", "suivant", "la suivante", "l'étape suivante"],
+        ABORT: ["arrête", "arrêter", "arrêtez", "stop", "quitter", "annule tout", "ça suffit"],
+        QUESTION: [
+            "^quoi", "^que fait", "^que va", "^qu'est-ce", "^pourquoi", "^comment", "^est-ce", "^quel",
+            "^quelle", "^attends", "je ne sais pas", "pas sûr", "pas sûre", "explique",
+        ],
+    },
+    "hi": {
+        YES: [
+            "हाँ", "हां", "हा", "जी", "जी हाँ", "हाँ जी", "ठीक है", "ठीक", "करो", "कर दो",
+            "कीजिए", "चलो", "बिल्कुल", "ज़रूर", "जरूर", "ओके",
+            "haan", "han", "ha", "ji", "ji haan", "theek hai", "thik hai", "karo",
+            "kar do", "chalo", "bilkul", "zaroor", "ok", "okay", "yes",
+        ],
+        NO: [
+            "नहीं", "नही", "ना", "मत करो", "मत", "रहने दो",
+            "nahi", "nahin", "na", "mat karo", "rehne do", "no",
+        ],
+        SKIP: ["छोड़ो", "छोड़ दो", "अगला", "आगे", "chhodo", "chhod do", "agla", "aage", "skip", "next"],
+        ABORT: [
+            "रुको", "रोको", "बंद करो", "बस", "बस करो", "बस कर", "ruko", "roko", "band karo",
+            "=bas", "bas karo", "bas kar", "bas kar do", "stop",
+        ],
+        QUESTION: [
+            "^क्या", "क्यों", "कैसे", "क्या होगा", "मतलब", "पता नहीं",
+            "^kya", "kyon", "kyun", "kaise", "kya hoga", "matlab", "pata nahi",
+        ],
+    },
+    "pa": {
+        YES: [
+            "ਹਾਂ", "ਹਾਂਜੀ", "ਹਾਂ ਜੀ", "ਜੀ", "ਠੀਕ ਹੈ", "ਠੀਕ", "ਕਰੋ", "ਕਰ ਦਿਓ", "ਚਲੋ", "ਜ਼ਰੂਰ",
+            "ਬਿਲਕੁਲ", "haan", "haanji", "haan ji", "ji", "theek hai", "karo", "kar dio",
+            "chalo", "zaroor", "bilkul", "ok", "okay", "yes",
+        ],
+        NO: ["ਨਹੀਂ", "ਨਹੀਂ ਜੀ", "ਨਾ", "ਨਾ ਕਰੋ", "ਰਹਿਣ ਦਿਓ", "nahi", "nahin", "na", "na karo", "no"],
+        SKIP: ["ਛੱਡੋ", "ਛੱਡ ਦਿਓ", "ਅਗਲਾ", "ਅੱਗੇ", "chhado", "chhad dio", "agla", "agge", "skip", "next"],
+        ABORT: [
+            "ਰੁਕੋ", "ਬੰਦ ਕਰੋ", "ਬੱਸ", "ਬੱਸ ਕਰੋ", "ਬਸ ਕਰੋ", "ruko", "band karo",
+            "=bas", "bas karo", "bas kar", "bass karo", "bas kar dio", "stop",
+        ],
+        QUESTION: [
+            "^ਕੀ", "ਕਿਉਂ", "ਕਿਵੇਂ", "ਕੀ ਹੋਵੇਗਾ", "ਮਤਲਬ", "ਪਤਾ ਨਹੀਂ",
+            "^ki", "kyon", "kiven", "ki hovega", "matlab", "pata nahi",
+        ],
+    },
+}
+
+NEGATORS = {
+    "en": ["not", "don't", "dont", "never", "won't", "shouldn't", "can't"],
+    "es": ["no", "nunca"],
+    "fr": ["pas", "ne", "non", "jamais"],
+    "hi": ["नहीं", "नही", "मत", "ना", "nahi", "nahin", "mat", "na"],
+    "pa": ["ਨਹੀਂ", "ਨਾ", "nahi", "nahin", "na"],
+}
+
+# Tokens are separated by whitespace and punctuation; apostrophes and hyphens
+# stay inside tokens ("don't", "d'accord", "vas-y").
+_SPLIT = re.compile(r"[\s.,!?¿¡;:\"“”«»()\[\]{}।॥…]+")
+_APOSTROPHES = str.maketrans({"’": "'", "‘": "'", "`": "'"})
+
+
+def _fold(text: str) -> str:
+    """Lowercase and drop accents from Latin letters (Indic marks are kept)."""
+    decomposed = unicodedata.normalize("NFD", text.lower().translate(_APOSTROPHES))
+    out = []
+    for ch in decomposed:
+        if unicodedata.combining(ch) and out and out[-1].isascii():
+            continue
+        out.append(ch)
+    return unicodedata.normalize("NFC", "".join(out))
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into folded tokens."""
+    return [t.strip("'-") for t in _SPLIT.split(_fold(text)) if t.strip("'-")]
+
+
+class IntentMatcher:
+    """Compiled phrase matcher for one language.
+
+    Args:
+        lang: Language code; unknown languages use English.
+    """
+
+    def __init__(self, lang: str = "en"):
+        self.lang = lang if lang in PHRASES else "en"
+        self._index = {}
+        for intent, phrases in PHRASES[self.lang].items():
+            for phrase in phrases:
+                where = "any"
+                if phrase[0] == "=":
+                    where, phrase = "whole", phrase[1:]
+                elif phrase[0] == "^":
+                    where, phrase = "start", phrase[1:]
+                tokens = tuple(tokenize(phrase))
+                self._index.setdefault(tokens[0], []).append((tokens, intent, where))
+        for candidates in self._index.values():
+            candidates.sort(key=lambda c: len(c[0]), reverse=True)
+        self._negators = frozenset(_fold(n) for n in NEGATORS.get(self.lang, ()))
+
+    def matches(self, text: str) -> tuple[list[tuple[str, int, int]], int]:
+        """Find phrases in one pass, longest first at each position.
+
+        Returns:
+            ([(intent, start, end)] with negation applied, token count).
+            Negated "yes" phrases are reported as "no"; negated "abort"
+            phrases ("don't stop") are dropped along with their negator.
+        """
+        tokens = tokenize(text)
+        n = len(tokens)
+        found = []
+        i = 0
+        while i < n:
+            for phrase, intent, where in self._index.get(tokens[i], ()):
+                end = i + len(phrase)
+                if tuple(tokens[i:end]) != phrase:
+                    continue
+                if where == "whole" and (i != 0 or end != n):
+                    continue
+                if where == "start" and i != 0:
+                    continue
+                if intent in (YES, ABORT) and self._negated(tokens, i):
+                    if intent == ABORT:
+                        # "don't stop" is neither an abort nor a "no": drop
+                        # the phrase and the negator matched before it
+                        found = [f for f in found if not (f[0] == NO and f[1] >= i - NEGATION_WINDOW)]
+                        i = end
+                        break
+                    intent = NO
+                found.append((intent, i, end))
+                i = end
+                break
+            else:
+                i += 1
+        return found, n
+
+    def _negated(self, tokens: list[str], i: int) -> bool:
+        return any(t in self._negators for t in tokens[max(0, i - NEGATION_WINDOW):i])
+
+    def classify(self, text: str, whole: bool = False) -> str | None:
+        """Return the intent of an answer, or None if it is unclear.
+
+        Precedence: abort, then question (also any "?"), then skip/no/yes.
+        An answer containing both a yes and a no/skip is unclear.
+
+        Args:
+            text: Transcribed answer.
+            whole: Only accept answers made up entirely of one intent's
+                phrases (used to end a capture early on a partial).
+        """
+        if not text or not text.strip():
+            return None
+        if text.strip() == QUESTION_SENTINEL:
+            return QUESTION
+        found, n = self.matches(text)
+        intents = {intent for intent, _, _ in found}
+        if whole:
+            covered = sum(end - start for _, start, end in found)
+            return intents.pop() if len(intents) == 1 and covered == n else None
+        if ABORT in intents:
+            return ABORT
+        if QUESTION in intents or "?" in text or "¿" in text:
+            return QUESTION
+        if YES in intents and (NO in intents or SKIP in intents):
+            return None
+        for intent in (SKIP, NO, YES):
+            if intent in intents:
+                return intent
+        return None
+
+
+_matchers = {}
+_matchers_lock = threading.Lock()
+
+
+def get_matcher(lang: str = "en") -> IntentMatcher:
+    """Return the compiled matcher for lang, building it on first use."""
+    with _matchers_lock:
+        if lang not in _matchers:
+            _matchers[lang] = IntentMatcher(lang)
+        return _matchers[lang]
+
+
+def classify(text: str, lang: str = "en", whole: bool = False) -> str | None:
+    """Classify a permission answer as yes/no/skip/abort/question (or None)."""
+    return get_matcher(lang).classify(text, whole=whole)
@@ -0,0 +1,226 @@
+"""Labeled permission-answer corpus and benchmark for fixme.intents.
+
+Run with ``python -m fixme.intents_bench``. Prints accuracy per language for
+the compiled matcher and for the old substring matching it replaced, lists
+misclassified answers, and times both.
+"""
+
+import time
+from collections import defaultdict
+
+from fixme.intents import ABORT, NO, QUESTION, SKIP, YES, classify, get_matcher
+
+# (lang, transcribed answer, expected intent); None means "unclear, ask again"
+CORPUS = [
+    ("en", "yes", YES),
+    ("en", "Yes.", YES),
+    ("en", "yeah go ahead", YES),
+    ("en", "sure", YES),
+    ("en", "okay do it", YES),
+    ("en", "ok", YES),
+    ("en", "yep", YES),
+    ("en", "sounds good", YES),
+    ("en", "go for it", YES),
+    ("en", "why not", YES),
+    ("en", "no problem go ahead", YES),
+    ("en", "alright", YES),
+    ("en", "please do", YES),
+    ("en", "no", NO),
+    ("en", "nope", NO),
+    ("en", "nah", NO),
+    ("en", "no thanks", NO),
+    ("en", "don't do that", NO),
+    ("en", "do not", NO),
+    ("en", "not okay", NO),
+    ("en", "not now", NO),
+    ("en", "I'd rather not", NO),
+    ("en", "skip", SKIP),
+    ("en", "skip this one", SKIP),
+    ("en", "next", SKIP),
+    ("en", "move on", SKIP),
+    ("en", "stop", ABORT),
+    ("en", "abort", ABORT),
+    ("en", "quit", ABORT),
+    ("en", "forget it", ABORT),
+    ("en", "stop everything", ABORT),
+    ("en", "what does that do", QUESTION),
+    ("en", "why do I need this", QUESTION),
+    ("en", "is it safe", QUESTION),
+    ("en", "will it delete my files", QUESTION),
+    ("en", "how long will it take", QUESTION),
+    ("en", "I'm not sure", QUESTION),
+    ("en", "I don't know", QUESTION),
+    ("en", "wait what is that", QUESTION),
+    ("en", "yes this is safe right?", QUESTION),
+    ("en", "I know", None),
+    ("en", "nobody told me", None),
+    ("en", "the weather", None),
+    ("en", "yes no", None),
+    ("en", "don't stop", None),
+    ("en", "never quit", None),
+    ("es", "sí", YES),
+    ("es", "si", YES),
+    ("es", "claro", YES),
+    ("es", "dale", YES),
+    ("es", "adelante", YES),
+    ("es", "vale hazlo", YES),
+    ("es", "de acuerdo", YES),
+    ("es", "está bien", YES),
+    ("es", "por supuesto", YES),
+    ("es", "no", NO),
+    ("es", "no gracias", NO),
+    ("es", "mejor no", NO),
+    ("es", "no está bien", NO),
+    ("es", "no lo hagas", NO),
+    ("es", "saltar", SKIP),
+    ("es", "el siguiente", SKIP),
+    ("es", "para", ABORT),
+    ("es", "detente", ABORT),
+    ("es", "basta", ABORT),
+    ("es", "¿qué hace eso?", QUESTION),
+    ("es", "por qué", QUESTION),
+    ("es", "para qué sirve", QUESTION),
+    ("es", "es seguro", QUESTION),
+    ("es", "no sé", QUESTION),
+    ("es", "firma aquí", None),
+    ("es", "signo", None),
+    ("es", "no para ya", None),
+    ("fr", "oui", YES),
+    ("fr", "d'accord", YES),
+    ("fr", "d’accord vas-y", YES),
+    ("fr", "bien sûr", YES),
+    ("fr", "ouais", YES),
+    ("fr", "c'est bon", YES),
+    ("fr", "non", NO),
+    ("fr", "non merci", NO),
+    ("fr", "pas maintenant", NO),
+    ("fr", "ne le fais pas", NO),
+    ("fr", "pas d'accord", NO),
+    ("fr", "passe", SKIP),
+    ("fr", "suivant", SKIP),
+    ("fr", "arrête", ABORT),
+    ("fr", "ça suffit", ABORT),
+    ("fr", "pourquoi", QUESTION),
+    ("fr", "qu'est-ce que ça fait", QUESTION),
+    ("fr", "est-ce que c'est dangereux", QUESTION),
+    ("fr", "je ne sais pas", QUESTION),
+    ("fr", "ouvrir la fenêtre", None),
+    ("fr", "n'arrête pas", None),
+    ("hi", "हाँ", YES),
+    ("hi", "हां जी", YES),
+    ("hi", "ठीक है", YES),
+    ("hi", "कर दो", YES),
+    ("hi", "haan", YES),
+    ("hi", "theek hai karo", YES),
+    ("hi", "नहीं", NO),
+    ("hi", "मत करो", NO),
+    ("hi", "nahi", NO),
+    ("hi", "रहने दो", NO),
+    ("hi", "छोड़ो", SKIP),
+    ("hi", "अगला", SKIP),
+    ("hi", "रुको", ABORT),
+    ("hi", "बंद करो", ABORT),
+    ("hi", "बस करो", ABORT),
+    ("hi", "bas karo", ABORT),
+    ("hi", "bas kar do yaar", ABORT),
+    ("hi", "bas", ABORT),
+    ("hi", "क्या होगा", QUESTION),
+    ("hi", "ये क्यों", QUESTION),
+    ("hi", "पता नहीं", QUESTION),
+    ("hi", "kya ye safe hai", QUESTION),
+    ("hi", "मत रुको", None),
+    ("pa", "ਹਾਂ", YES),
+    ("pa", "ਹਾਂ ਜੀ", YES),
+    ("pa", "ਠੀਕ ਹੈ", YES),
+    ("pa", "haanji", YES),
+    ("pa", "ਨਹੀਂ", NO),
+    ("pa", "ਨਾ ਕਰੋ", NO),
+    ("pa", "nahi", NO),
+    ("pa", "ਛੱਡੋ", SKIP),
+    ("pa", "ਅਗਲਾ", SKIP),
+    ("pa", "ਰੁਕੋ", ABORT),
+    ("pa", "ਬੱਸ ਕਰੋ", ABORT),
+    ("pa", "bas karo", ABORT),
+    ("pa", "bass karo ji", ABORT),
+    ("pa", "ਕਿਉਂ", QUESTION),
+    ("pa", "ਕੀ ਹੋਵੇਗਾ", QUESTION),
+    ("pa", "ਪਤਾ ਨਹੀਂ", QUESTION),
+]
+
+# The substring matching from voice_input before fixme.intents, for comparison
+_LEGACY_AFFIRMATIVE = {
+    "en": {"yes", "yeah", "yep", "sure", "okay", "ok", "go ahead", "proceed", "do it"},
+    "es": {"sí", "si", "claro", "dale", "adelante", "hazlo", "ok", "okay"},
+}
+_LEGACY_NEGATIVE = {
+    "en": {"no", "nope", "nah", "skip", "don't", "cancel"},
+    "es": {"no", "cancelar", "saltar", "para"},
+}
+_LEGACY_ABORT = {"stop", "abort", "quit", "exit", "para", "detener"}
+
+
+def legacy_classify(text: str, lang: str = "en") -> str | None:
+    """Classify the way ConversationFlow did before fixme.intents."""
+    words = text.lower().strip()
+    affirmative = _LEGACY_AFFIRMATIVE["es" if lang == "es" else "en"]
+    negative = _LEGACY_NEGATIVE["es" if lang == "es" else "en"]
+    if words in affirmative or any(p in words for p in affirmative):
+        return YES
+    if words in negative or any(p in words for p in negative):
+        return NO
+    if any(kw in words for kw in _LEGACY_ABORT):
+        return ABORT
+    return QUESTION
+
+
+def _same(expected, got) -> bool:
+    # The permission loop treats "no" and "skip" alike
+    if {expected, got} <= {NO, SKIP}:
+        return True
+    return expected == got
+
+
+def evaluate(classifier) -> tuple[dict, list]:
+    """Return ({lang: accuracy}, [(lang, text, expected, got)] misses)."""
+    totals = defaultdict(lambda: [0, 0])
+    misses = []
+    for lang, text, expected in CORPUS:
+        got = classifier(text, lang)
+        totals[lang][1] += 1
+        if _same(expected, got):
+            totals[lang][0] += 1
+        else:
+            misses.append((lang, text, expected, got))
+    return {lang: ok / n for lang, (ok, n) in totals.items()}, misses
+
+
+def time_per_call(classifier, rounds: int = 200) -> float:
+    """Return mean microseconds per classification over the corpus."""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for lang, text, _expected in CORPUS:
+            classifier(text, lang)
+    return (time.perf_counter() - start) / (rounds * len(CORPUS)) * 1e6
+
+
+def main():
+    start = time.perf_counter()
+    for lang in {lang for lang, _, _ in CORPUS}:
+        get_matcher(lang)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    for name, classifier in (("intents", classify), ("legacy", legacy_classify)):
+        accuracy, misses = evaluate(classifier)
+        overall = 1 - len(misses) / len(CORPUS)
+        print(f"{name}: {overall:.1%} of {len(CORPUS)} answers, "
+              f"{time_per_call(classifier):.1f} us/answer")
+        for lang in sorted(accuracy):
+            print(f"  {lang}: {accuracy[lang]:.1%}")
+        if name == "intents":
+            print(f"  matchers built in {build_ms:.1f} ms")
+            for lang, text, expected, got in misses:
+                print(f"  miss [{lang}] {text!r}: expected {expected}, got {got}")
+
+
+if __name__ == "__main__":
+    main()
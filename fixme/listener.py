@@ -0,0 +1,148 @@
+"""One listen turn: capture, endpointing, streaming recognition.
+
+Shared by the sidecar's ``listen`` method and the legacy ``voice_input``.
+Audio comes from the persistent microphone (``fixme.audio_capture``) and is
+endpointed by ``fixme.vad``. When a streaming-capable recognizer (Vosk) is
+installed for the language, audio is decoded while the user speaks, partial
+hypotheses are passed to ``on_partial``, and in permission mode a stable
+"yes", "no" or "skip" ends the capture without waiting for trailing silence.
+"""
+
+import threading
+
+from fixme import audio_capture, intents, stt_backends, vad
+
+# A yes/no/skip partial must stay unchanged over this much audio to end early
+EARLY_ANSWER_SECONDS = 0.3
+
+
+
+def confident_answer(text: str, lang: str = "en") -> str | None:
+    """Return "yes", "no" or "skip" if text is nothing but such an answer.
+
+    Deliberately stricter than intents.classify(): a partial like "no"
+    that may still grow into "no problem, go ahead" only ends the capture
+    once it has stayed unchanged for a while, and "yes but what does it
+    do" never does.
+    """
+    intent = intents.classify(text, lang, whole=True)
+    return intent if intent in (intents.YES, intents.NO, intents.SKIP) else None
+
+
+def listen(
+    lang: str = "en",
+    stop_event: threading.Event | None = None,
+    mode: str = "open",
+    use_vad: bool = True,
+    trailing_silence: float = vad.TRAILING_SILENCE,
+    no_speech_timeout: float = vad.NO_SPEECH_TIMEOUT,
+    max_duration: float = audio_capture.MAX_CAPTURE_SECONDS,
+    on_partial=None,
+    offline_only: bool = False,
+) -> dict:
+    """Capture one utterance from the microphone and transcribe it.
+
+    Args:
+        lang: Language code from stt_backends.LANG_MAP.
+        stop_event: Set by another thread to end the capture.
+        mode: "permission" lets a confident yes/no/skip partial end the capture;
+            "open" waits for the endpointer (or stop_event).
+        use_vad: End on trailing silence and trim silence before recognition.
+        trailing_silence: Seconds of silence after speech that end capture.
+        no_speech_timeout: Seconds without speech that end capture.
+        max_duration: Upper bound on capture length in seconds.
+        on_partial: Called with each new partial transcript (capture thread).
+        offline_only: Never send audio to a network recognizer.
+
+    Returns:
+        Dict with "text", "error" (None on success), "answer" ("yes"/"no"/
+        "skip" when mode is "permission" and one was heard), "early" (True
+        if such an answer ended the capture), "vad" stats, "backend" and
+        "stt_ms".
+    """
+    recognizer = stt_backends.get_recognizer()
+    # Load the offline model while the user is still speaking
+    recognizer.warm(lang)
+    sample_rate = audio_capture.SAMPLE_RATE
+    stop_event = stop_event or threading.Event()
+
+    endpointer = None
+    if use_vad:
+        endpointer = vad.Endpointer(
+            sample_rate=sample_rate,
+            trailing_silence=trailing_silence,
+            no_speech_timeout=no_speech_timeout,
+        )
+    state = {"opened": False, "stream": None, "partial": "", "answer": None,
+             "answer_at": 0, "fed": 0, "early": False}
+
+    def on_audio(block):
+        ended = endpointer.feed(block) if endpointer is not None else False
+        if not state["opened"]:
+            # Opened on the capture thread so a model still loading delays
+            # decoding, not capture: the ring buffer keeps the audio meanwhile
+            state["opened"] = True
+            state["stream"] = recognizer.open_stream(lang, sample_rate, offline_only)
+        stream = state["stream"]
+        state["fed"] += len(block)
+        if stream is None or not len(block):
+            return ended
+        partial = stream.accept(block.tobytes())
+        if partial and partial != state["partial"]:
+            state["partial"] = partial
+            if on_partial is not None:
+                on_partial(partial)
+        if mode == "permission":
+            answer = confident_answer(state["partial"], lang)
+            if answer != state["answer"]:
+                state["answer"], state["answer_at"] = answer, state["fed"]
+            elif answer and state["fed"] - state["answer_at"] >= EARLY_ANSWER_SECONDS * sample_rate:
+                state["early"] = True
+                return True
+        return ended
+
+    try:
+        audio_data = audio_capture.get_mic().capture(stop_event, max_duration, on_audio=on_audio)
+    except Exception as e:
+        return {"text": "", "error": f"Microphone error: {e}"}
+
+    vad_stats = None
+    if endpointer is not None:
+        trimmed, vad_stats = endpointer.trim(audio_data)
+        if state["early"]:
+            vad_stats["endpoint"] = "answer"
+        elif not vad_stats["speech"]:
+            return {"text": "", "error": "No speech detected", "vad": vad_stats}
+        else:
+            audio_data = trimmed
+
+    if not len(audio_data):
+        return {"text": "", "error": "No audio recorded"}
+
+    stream = state["stream"]
+    if stream is not None:
+        result = stream.finish()
+        if not result["text"]:
+            # Nothing usable from the streaming decoder; try the others
+            fallback = recognizer.transcribe(
+                audio_data.tobytes(), sample_rate, lang, offline_only, exclude=(stream.backend,),
+            )
+            if fallback["backend"] is not None:
+                result = fallback
+    else:
+        result = recognizer.transcribe(audio_data.tobytes(), sample_rate, lang, offline_only)
+
+    response = {
+        "text": result["text"],
+        "error": None,
+        "answer": confident_answer(result["text"], lang) if mode == "permission" else None,
+        "early": state["early"],
+        "vad": vad_stats,
+        "backend": result["backend"],
+        "stt_ms": result["elapsed_ms"],
+    }
+    if "error" in result:
+        response["error"] = f"Speech recognition service error: {result['error']}"
+    elif not result["text"]:
+        response["error"] = "Could not understand audio"
+    return response
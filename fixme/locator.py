@@ -0,0 +1,408 @@
+"""Local UI element locator using OpenCV template matching.
+
+Resolves an element name from a diagnosis (``ui_highlight["element"]``,
+e.g. "Wi-Fi icon") to a bounding box on screen by matching icon templates
+against a capture of the screen, so the overlay can circle the real
+element and clicks land on it without another model round-trip.
+
+Templates are PNG files in ``TEMPLATE_DIR`` named by the element's slug
+(``wifi.png``), per platform (``wifi.win.png``) and optionally per theme
+or other variant (``wifi.mac.dark.png``); every variant is tried. They
+are stored at 100% display scaling, loaded once and kept, together with
+their resized copies, in memory.
+
+No templates ship with FixMe, since icons differ between OS versions and
+themes. Teach one on the machine itself with
+``python -m fixme.locator learn "Wi-Fi icon"``: it captures the screen after
+a short delay and saves the box dragged around the element as a template
+for this platform and the screen's theme (``Locator.learn``).
+
+Coordinates: screen captures are in physical pixels, while clicks and the
+overlay use the OS's logical units. Entry points call
+``enable_dpi_awareness()`` at startup, before any window or pyautogui
+exists, so both are physical pixels on Windows; elsewhere (Retina Macs, or
+a Windows process left DPI-unaware) captured boxes are divided by the
+ratio of capture to screen size.
+"""
+
+import os
+import re
+import sys
+import threading
+import time
+import warnings
+from pathlib import Path
+
+TEMPLATE_DIR = Path(os.environ.get("FIXME_TEMPLATES", Path.home() / ".fixme" / "templates"))
+
+# Minimum normalized correlation for a match
+MATCH_THRESHOLD = 0.8
+# Stop searching other scales once a match is this good
+GOOD_MATCH = 0.93
+# Scales tried around the display scale, nearest first
+SCALE_STEPS = (1.0, 0.9, 1.1, 0.8, 1.25, 0.75, 1.5)
+# Templates smaller than this after scaling are not searched
+MIN_TEMPLATE_PIXELS = 8
+# Learned templates darker than this (mean gray level) are saved as "dark"
+DARK_THEME_LEVEL = 110
+# Seconds `python -m fixme.locator learn` waits before capturing, to open menus
+LEARN_DELAY = 3
+
+# Element names as the diagnosis phrases them -> template slug
+ELEMENT_ALIASES = {
+    "wi-fi": "wifi",
+    "wifi icon": "wifi",
+    "wi-fi icon": "wifi",
+    "wireless": "wifi",
+    "network": "wifi",
+    "network icon": "wifi",
+    "internet access": "wifi",
+    "volume": "volume",
+    "speaker": "volume",
+    "sound icon": "volume",
+    "battery": "battery",
+    "start": "start",
+    "start button": "start",
+    "windows button": "start",
+    "apple menu": "apple",
+    "control center": "control_center",
+    "settings": "settings",
+    "gear": "settings",
+}
+
+# ui_highlight locations -> (left, top, right, bottom) fractions of the screen
+# to search first; the whole screen is searched if nothing is found there
+LOCATION_REGIONS = {
+    "taskbar right": (0.5, 0.85, 1.0, 1.0),
+    "taskbar left": (0.0, 0.85, 0.5, 1.0),
+    "taskbar center": (0.25, 0.85, 0.75, 1.0),
+    "top right": (0.5, 0.0, 1.0, 0.15),
+    "top left": (0.0, 0.0, 0.5, 0.15),
+    "center": (0.2, 0.2, 0.8, 0.8),
+}
+
+_PLATFORM = "mac" if sys.platform == "darwin" else "win" if sys.platform == "win32" else "linux"
+
+_dpi_aware = False
+
+
+def slug(element: str) -> str:
+    """Return the template slug for an element name."""
+    name = re.sub(r"\s+", " ", element.strip().lower())
+    if name in ELEMENT_ALIASES:
+        return ELEMENT_ALIASES[name]
+    return re.sub(r"[^a-z0-9]+", "_", name).strip("_")
+
+
+def enable_dpi_awareness() -> None:
+    """Make capture and click coordinates agree on Windows (no-op elsewhere).
+
+    Call once at process start: switching DPI mode after windows exist
+    leaves them in the old mode.
+    """
+    global _dpi_aware
+    if _PLATFORM != "win" or _dpi_aware:
+        return
+    _dpi_aware = True
+    try:
+        import ctypes
+
+        try:
+            ctypes.windll.shcore.SetProcessDpiAwareness(2)  # per-monitor aware
+        except (AttributeError, OSError):
+            ctypes.windll.user32.SetProcessDPIAware()
+    except Exception as e:
+        warnings.warn(f"Could not enable DPI awareness: {e}")
+
+
+def display_scale(capture_width: int) -> tuple[float, float]:
+    """Return (template_scale, pixel_ratio) for the primary display.
+
+    template_scale is how much larger UI elements appear in a capture than
+    at 100% scaling; pixel_ratio is capture pixels per click coordinate.
+    """
+    if _PLATFORM == "win":
+        try:
+            import ctypes
+
+            user32 = ctypes.windll.user32
+            # 1.0 when DPI-aware; physical over logical width otherwise
+            screen_width = user32.GetSystemMetrics(0)
+            ratio = capture_width / screen_width if screen_width else 1.0
+            return max(user32.GetDpiForSystem() / 96.0, ratio), ratio
+        except Exception:
+            return 1.0, 1.0
+    try:
+        import pyautogui
+
+        logical_width = pyautogui.size()[0]
+    except Exception:
+        return 1.0, 1.0
+    ratio = capture_width / logical_width if logical_width else 1.0
+    return ratio, ratio
+
+
+class Locator:
+    """Finds UI elements in screen captures by multi-scale template matching.
+
+    Args:
+        template_dir: Directory of element templates.
+        threshold: Minimum match score.
+    """
+
+    def __init__(self, template_dir: Path = TEMPLATE_DIR, threshold: float = MATCH_THRESHOLD):
+        self.template_dir = Path(template_dir)
+        self.threshold = threshold
+        self._templates = {}  # slug -> [grayscale array per variant]
+        self._scaled = {}  # (slug, variant, scale) -> resized grayscale array
+        self._lock = threading.Lock()
+        self._scale = None  # (capture_width, template_scale, pixel_ratio)
+
+    def _template_paths(self, name: str) -> list[Path]:
+        platform = sorted(self.template_dir.glob(f"{name}.{_PLATFORM}.png"))
+        platform += sorted(self.template_dir.glob(f"{name}.{_PLATFORM}.*.png"))
+        generic = self.template_dir / f"{name}.png"
+        return platform + ([generic] if generic.is_file() else [])
+
+    def templates(self, name: str) -> list:
+        """Return the grayscale templates (one per variant) for a slug."""
+        with self._lock:
+            if name not in self._templates:
+                images = []
+                paths = self._template_paths(name)
+                if paths:
+                    import cv2
+
+                    for path in paths:
+                        image = cv2.imread(str(path), cv2.IMREAD_GRAYSCALE)
+                        if image is None:
+                            warnings.warn(f"Could not read template {path}")
+                        else:
+                            images.append(image)
+                self._templates[name] = images
+            return self._templates[name]
+
+    def template(self, name: str):
+        """Return the first grayscale template for a slug, or None if there is none."""
+        templates = self.templates(name)
+        return templates[0] if templates else None
+
+    def _scaled_template(self, name: str, variant: int, scale: float):
+        key = (name, variant, round(scale, 3))
+        with self._lock:
+            cached = self._scaled.get(key)
+        if cached is not None:
+            return cached
+        import cv2
+
+        base = self.templates(name)[variant]
+        if scale == 1.0:
+            resized = base
+        else:
+            size = (max(1, round(base.shape[1] * scale)), max(1, round(base.shape[0] * scale)))
+            interpolation = cv2.INTER_AREA if scale < 1 else cv2.INTER_LINEAR
+            resized = cv2.resize(base, size, interpolation=interpolation)
+        with self._lock:
+            self._scaled[key] = resized
+        return resized
+
+    def _display(self, capture_width: int) -> tuple[float, float]:
+        if self._scale is None or self._scale[0] != capture_width:
+            self._scale = (capture_width, *display_scale(capture_width))
+        return self._scale[1], self._scale[2]
+
+    def locate(self, element: str, frame=None, location: str | None = None) -> dict | None:
+        """Find an element on screen.
+
+        Args:
+            element: Element name, e.g. ui_highlight["element"].
+            frame: A capture to search (BGR/BGRA or grayscale array);
+                the primary monitor is captured if omitted.
+            location: Optional ui_highlight location searched first.
+
+        Returns:
+            Dict with x, y, width, height (box in click/overlay coordinates),
+            center (x, y), score, scale and elapsed_ms, or None if the
+            element has no template or was not found.
+        """
+        started = time.perf_counter()
+        name = slug(element)
+        if not self.templates(name):
+            return None
+
+        gray = _to_gray(frame if frame is not None else capture())
+        template_scale, pixel_ratio = self._display(gray.shape[1])
+
+        regions = [None]
+        if location in LOCATION_REGIONS:
+            regions.insert(0, LOCATION_REGIONS[location])
+        for region in regions:
+            found = self._search(gray, name, template_scale, region)
+            if found is not None:
+                break
+        else:
+            return None
+
+        score, scale, (left, top, width, height) = found
+        x, y = left / pixel_ratio, top / pixel_ratio
+        w, h = width / pixel_ratio, height / pixel_ratio
+        return {
+            "x": round(x),
+            "y": round(y),
+            "width": round(w),
+            "height": round(h),
+            "center": (round(x + w / 2), round(y + h / 2)),
+            "score": round(score, 3),
+            "scale": round(scale, 3),
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+
+    def _search(self, gray, name: str, template_scale: float, region) -> tuple | None:
+        """Best (score, scale, (left, top, width, height)) in a region of gray."""
+        import cv2
+
+        offset_x = offset_y = 0
+        if region is not None:
+            h, w = gray.shape[:2]
+            offset_x, offset_y = int(region[0] * w), int(region[1] * h)
+            gray = gray[offset_y:int(region[3] * h), offset_x:int(region[2] * w)]
+
+        best = None
+        for variant in range(len(self.templates(name))):
+            for step in SCALE_STEPS:
+                scale = template_scale * step
+                tmpl = self._scaled_template(name, variant, scale)
+                th, tw = tmpl.shape[:2]
+                if min(th, tw) < MIN_TEMPLATE_PIXELS or th > gray.shape[0] or tw > gray.shape[1]:
+                    continue
+                result = cv2.matchTemplate(gray, tmpl, cv2.TM_CCOEFF_NORMED)
+                _, score, _, (left, top) = cv2.minMaxLoc(result)
+                if score >= self.threshold and (best is None or score > best[0]):
+                    best = (score, scale, (left + offset_x, top + offset_y, tw, th))
+                    if score >= GOOD_MATCH:
+                        return best
+        return best
+
+    def learn(self, element: str, box: tuple[int, int, int, int], frame=None,
+              variant: str | None = None) -> Path:
+        """Save the region box of a capture as a template for element.
+
+        Args:
+            element: Element name, e.g. "Wi-Fi icon".
+            box: (left, top, width, height) in capture pixels.
+            frame: The capture (BGR/BGRA or grayscale); the primary monitor
+                is captured if omitted.
+            variant: Template variant; defaults to "dark" or "light" by the
+                region's brightness.
+
+        Returns:
+            Path of the template written (``<slug>.<platform>.<variant>.png``).
+        """
+        import cv2
+
+        gray = _to_gray(frame if frame is not None else capture())
+        left, top, width, height = box
+        crop = gray[top:top + height, left:left + width]
+        if min(crop.shape[:2]) < MIN_TEMPLATE_PIXELS:
+            raise ValueError(f"Template region too small: {box}")
+        # Stored at 100% display scaling, like every template
+        template_scale, _ = self._display(gray.shape[1])
+        if template_scale != 1.0:
+            size = (max(1, round(width / template_scale)), max(1, round(height / template_scale)))
+            crop = cv2.resize(crop, size, interpolation=cv2.INTER_AREA)
+        variant = variant or ("dark" if crop.mean() < DARK_THEME_LEVEL else "light")
+        name = slug(element)
+        path = self.template_dir / f"{name}.{_PLATFORM}.{variant}.png"
+        self.template_dir.mkdir(parents=True, exist_ok=True)
+        if not cv2.imwrite(str(path), crop):
+            raise OSError(f"Could not write template {path}")
+        with self._lock:
+            self._templates.pop(name, None)
+            self._scaled = {k: v for k, v in self._scaled.items() if k[0] != name}
+        return path
+
+    def resolve_highlight(self, ui_highlight: dict | None, frame=None) -> dict | None:
+        """Return ui_highlight with exact x, y and radius if its element is found.
+
+        The overlay draws explicit coordinates in preference to the coarse
+        location. A highlight that already has coordinates, or whose
+        element cannot be found, is returned unchanged.
+        """
+        if not ui_highlight or "x" in ui_highlight or not ui_highlight.get("element"):
+            return ui_highlight
+        try:
+            box = self.locate(ui_highlight["element"], frame, ui_highlight.get("location"))
+        except Exception as e:
+            warnings.warn(f"Locating {ui_highlight['element']!r} failed: {e}")
+            return ui_highlight
+        if box is None:
+            return ui_highlight
+        x, y = box["center"]
+        return {
+            **ui_highlight,
+            "x": x,
+            "y": y,
+            "radius": max(box["width"], box["height"]) // 2 + 8,
+        }
+
+
+def capture():
+    """Capture the primary monitor as a BGRA array."""
+    import mss
+    import numpy as np
+
+    with mss.mss() as sct:
+        return np.asarray(sct.grab(sct.monitors[1]))
+
+
+def _to_gray(frame):
+    import cv2
+
+    if frame.ndim == 2:
+        return frame
+    code = cv2.COLOR_BGRA2GRAY if frame.shape[2] == 4 else cv2.COLOR_BGR2GRAY
+    return cv2.cvtColor(frame, code)
+
+
+_locator = None
+_locator_lock = threading.Lock()
+
+
+def get_locator() -> Locator:
+    """Return the process-wide locator (templates stay cached)."""
+    global _locator
+    with _locator_lock:
+        if _locator is None:
+            _locator = Locator()
+        return _locator
+
+
+def main(argv: list[str] | None = None):
+    """``python -m fixme.locator learn|find "<element>" [location]``."""
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) < 2 or argv[0] not in ("learn", "find"):
+        print('usage: python -m fixme.locator learn|find "<element>" [location]')
+        sys.exit(2)
+    command, element = argv[0], argv[1]
+    enable_dpi_awareness()
+    locator = get_locator()
+    if command == "find":
+        print(locator.locate(element, location=argv[2] if len(argv) > 2 else None))
+        return
+
+    import cv2
+
+    print(f"Capturing the screen in {LEARN_DELAY} s; show {element!r} now.")
+    time.sleep(LEARN_DELAY)
+    frame = capture()
+    window = f"Drag a box around {element}, then press Enter (Esc cancels)"
+    box = cv2.selectROI(window, cv2.cvtColor(frame, cv2.COLOR_BGRA2BGR), showCrosshair=False)
+    cv2.destroyWindow(window)
+    if not box[2] or not box[3]:
+        print("Cancelled.")
+        return
+    print(f"Saved {locator.learn(element, tuple(int(v) for v in box), frame)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,31 @@
-"""Transparent click-through screen overlay for highlighting and annotating UI elements."""
-
+"""Transparent click-through screen overlay for highlighting and annotating UI elements.
+
+One long-lived overlay serves the whole app (see ``get_overlay``). Its Tk
+interpreter runs on a dedicated thread that is started once, without
+blocking the caller, on first use. Other threads never touch Tk: every
+call queues a command that the Tk thread applies on its next poll, and the
+window is shown while a step or the recording indicator is displayed and
+hidden again afterwards.
+
+Drawing is retained-mode: every element is a canvas item created once with
+its own tag, and commands only change its coordinates, text or visibility.
+Commands queued within one poll are coalesced, so only the latest state of
+each part of the scene is applied, and unchanged items are not touched.
+"""
+
+import queue
 import threading
 import warnings
 
+# How often the Tk thread applies queued commands
+POLL_MS = 16
+
+ACCENT = "#e94560"
+SUCCESS = "#4CAF50"
+BOX_WIDTH = 500
+# Highlight shapes, one canvas item each; only the one in use is visible
+HIGHLIGHT_ITEMS = {"circle": "hl_circle", "arrow": "hl_arrow", "box": "hl_box"}
+
 
 class Overlay:
     """Fullscreen transparent overlay for drawing highlights and annotations."""
@@ -12,15 +35,28 @@ class Overlay:
         self._canvas = None
         self._thread = None
         self._ready = threading.Event()
+        self._start_lock = threading.Lock()
+        self._commands = queue.Queue()
+        self._closed = False
         self._screen_width = 0
         self._screen_height = 0
-        self._start()
-
-    def _start(self):
-        """Start the overlay window in a dedicated thread."""
-        self._thread = threading.Thread(target=self._run_tk, daemon=True)
-        self._thread.start()
-        self._ready.wait(timeout=5)
+        self._prepared = {}  # step_num -> (ui_highlight, (x, y, radius))
+        # Scene state last applied to the canvas (tk thread only)
+        self._scene = {"step": None, "success": None, "recording": False}
+        self._applied = {}  # tag -> {option: value} last set on that item
+        self._visible = False
+
+    def start(self):
+        """Start the overlay thread if it isn't running; returns immediately."""
+        with self._start_lock:
+            if self._thread is None and not self._closed:
+                self._thread = threading.Thread(target=self._run_tk, daemon=True, name="overlay")
+                self._thread.start()
+
+    @property
+    def ready(self) -> bool:
+        """Whether the overlay window exists and is applying commands."""
+        return self._ready.is_set() and self._canvas is not None and not self._closed
 
     def _run_tk(self):
         """Run tkinter mainloop in a dedicated thread."""
@@ -50,23 +86,151 @@ class Overlay:
                 height=self._screen_height,
             )
             self._canvas.pack(fill=tk.BOTH, expand=True)
+            self._create_items()
 
             # Start hidden
             self._root.withdraw()
             self._ready.set()
+            self._root.after(0, self._drain)
             self._root.mainloop()
 
         except Exception as e:
             warnings.warn(f"Overlay initialization failed: {e}")
+            self._closed = True
             self._ready.set()
 
-    def _schedule(self, func, *args):
-        """Schedule a function to run on the tkinter thread."""
-        if self._root:
+    def _create_items(self):
+        """Create every scene item once, hidden (must run on tk thread)."""
+        c = self._canvas
+        hidden = {"state": "hidden"}
+        c.create_rectangle(0, 0, 0, 0, fill="#1a1a2e", outline=ACCENT, width=2, tags="box", **hidden)
+        c.create_text(0, 0, fill=ACCENT, font=("Segoe UI", 18, "bold"), tags="progress", **hidden)
+        c.create_text(0, 0, fill="white", font=("Segoe UI", 12), width=BOX_WIDTH - 40,
+                      tags="description", **hidden)
+        c.create_oval(0, 0, 0, 0, outline=ACCENT, width=3, tags="hl_circle", **hidden)
+        c.create_rectangle(0, 0, 0, 0, outline=ACCENT, width=3, tags="hl_box", **hidden)
+        c.create_line(0, 0, 0, 0, fill=ACCENT, width=3, arrow="last", arrowshape=(12, 15, 5),
+                      tags="hl_arrow", **hidden)
+        c.create_text(0, 0, fill=ACCENT, font=("Segoe UI", 10, "bold"), tags="hl_label", **hidden)
+        c.create_text(0, 0, fill=SUCCESS, font=("Segoe UI", 16, "bold"), tags="success", **hidden)
+        c.create_oval(0, 0, 0, 0, fill="red", outline="red", tags="rec", **hidden)
+        c.create_text(0, 0, text="REC", fill="red", font=("Segoe UI", 9, "bold"),
+                      tags="rec_label", **hidden)
+
+    def _schedule(self, slot: str, value):
+        """Queue a scene change for the tkinter thread, starting it if needed."""
+        if self._closed:
+            return
+        self.start()
+        self._commands.put((slot, value))
+
+    def _drain(self):
+        """Apply queued scene changes, then poll again (must run on tk thread)."""
+        changes = {}
+        while True:
+            try:
+                slot, value = self._commands.get_nowait()
+            except queue.Empty:
+                break
+            # Only the latest value of each slot matters
+            changes[slot] = value
+            if slot == "step":
+                changes["success"] = None
+        if changes:
             try:
-                self._root.after(0, func, *args)
-            except Exception:
-                pass
+                self._render({**self._scene, **changes})
+            except Exception as e:
+                warnings.warn(f"Overlay update failed: {e}")
+        if self._closed:
+            self._root.destroy()
+            return
+        self._root.after(POLL_MS, self._drain)
+
+    def _update(self, tag: str, coords: tuple | None = None, **options):
+        """Change one item, skipping it if nothing differs (must run on tk thread)."""
+        applied = self._applied.setdefault(tag, {})
+        if coords is not None and applied.get("coords") != coords:
+            self._canvas.coords(tag, *coords)
+            applied["coords"] = coords
+        changed = {k: v for k, v in options.items() if applied.get(k) != v}
+        if changed:
+            self._canvas.itemconfigure(tag, **changed)
+            applied.update(changed)
+
+    def _hide(self, *tags: str):
+        for tag in tags:
+            self._update(tag, state="hidden")
+
+    def _render(self, scene: dict):
+        """Bring the canvas in line with scene (must run on tk thread)."""
+        if not self._canvas:
+            return
+        sw = self._screen_width
+
+        step = scene["step"]
+        if step is None:
+            self._hide("box", "progress", "description", "hl_label", *HIGHLIGHT_ITEMS.values())
+        else:
+            step_num, total_steps, description, ui_highlight = step
+            box_x = (sw - BOX_WIDTH) // 2
+            self._update("box", (box_x, 20, box_x + BOX_WIDTH, 110), state="normal")
+            self._update("progress", (sw // 2, 45), text=f"Step {step_num} of {total_steps}",
+                         state="normal")
+            self._update("description", (sw // 2, 80), text=description, state="normal")
+            self._render_highlight(step_num, ui_highlight)
+
+        if scene["success"] is None:
+            self._hide("success")
+        else:
+            self._update("success", (sw // 2, 140), text=f"✓ Step {scene['success']} Complete",
+                         state="normal")
+
+        if scene["recording"]:
+            self._update("rec", (sw - 50, 15, sw - 30, 35), state="normal")
+            self._update("rec_label", (sw - 65, 25), state="normal")
+        else:
+            self._hide("rec", "rec_label")
+
+        visible = step is not None or scene["recording"]
+        if visible != self._visible:
+            if visible:
+                self._root.deiconify()
+            else:
+                self._root.withdraw()
+            self._visible = visible
+        if step is None:
+            self._prepared.clear()
+        self._scene = scene
+
+    def _render_highlight(self, step_num, ui_highlight):
+        """Show the highlight shape and label for a step (must run on tk thread)."""
+        action = ui_highlight.get("action", "circle") if ui_highlight else None
+        shape = HIGHLIGHT_ITEMS.get(action)
+        for tag in HIGHLIGHT_ITEMS.values():
+            if tag != shape:
+                self._hide(tag)
+        if not ui_highlight:
+            self._hide("hl_label")
+            return
+
+        prepared = self._prepared.pop(step_num, None)
+        if prepared is not None and prepared[0] is ui_highlight:
+            x, y, r = prepared[1]
+        else:
+            x, y, r = self._get_location_coords(ui_highlight)
+
+        if shape == "hl_arrow":
+            # Arrow pointing to the location
+            self._update(shape, (x - r - 40, y - r - 40, x - 5, y - 5), state="normal")
+        elif shape is not None:
+            self._update(shape, (x - r, y - r, x + r, y + r), state="normal")
+
+        # Label for the highlighted element
+        element_name = ui_highlight.get("element", "")
+        if element_name:
+            self._update("hl_label", (x, y - r - 15), text=element_name, state="normal")
+        else:
+            self._hide("hl_label")
 
     def _get_location_coords(self, ui_highlight: dict) -> tuple[int, int, int]:
         """Map a ui_highlight location to screen pixel coordinates.
@@ -99,6 +263,32 @@ class Overlay:
 
         return location_map.get(location, (sw // 2, sh // 2, 60))
 
+    def prepare_step(
+        self,
+        step_num: int,
+        total_steps: int,
+        description: str,
+        ui_highlight: dict | None = None,
+    ):
+        """Work out a step's highlight ahead of show_step() (any thread).
+
+        An element without explicit coordinates is looked up on screen
+        (fixme.locator) so the highlight lands on it rather than on the
+        coarse location; the lookup falls back to the location quietly.
+
+        Args match show_step().
+        """
+        if ui_highlight and self.ready:
+            resolved = ui_highlight
+            if "x" not in ui_highlight and ui_highlight.get("element"):
+                try:
+                    from fixme.locator import get_locator
+
+                    resolved = get_locator().resolve_highlight(ui_highlight)
+                except ImportError:
+                    pass
+            self._prepared[step_num] = (ui_highlight, self._get_location_coords(resolved))
+
     def show_step(
         self,
         step_num: int,
@@ -108,139 +298,45 @@ class Overlay:
     ):
         """Display step information and highlight on the overlay.
 
+        Replaces the previous step (and its success mark) in place.
+
         Args:
             step_num: Current step number (1-based).
             total_steps: Total number of steps.
             description: Description text for this step.
             ui_highlight: Optional dict with "element", "location", "action" keys.
         """
-        self._schedule(self._draw_step, step_num, total_steps, description, ui_highlight)
-
-    def _draw_step(self, step_num, total_steps, description, ui_highlight):
-        """Draw step info on the canvas (must run on tk thread)."""
-        if not self._canvas:
-            return
-
-        self._canvas.delete("all")
-        self._root.deiconify()
-
-        sw = self._screen_width
-
-        # Background box for step info at top center
-        box_width = 500
-        box_x = (sw - box_width) // 2
-        self._canvas.create_rectangle(
-            box_x, 20, box_x + box_width, 110,
-            fill="#1a1a2e", outline="#e94560", width=2,
-        )
-
-        # Step progress text
-        self._canvas.create_text(
-            sw // 2, 45,
-            text=f"Step {step_num} of {total_steps}",
-            fill="#e94560", font=("Segoe UI", 18, "bold"),
-        )
-
-        # Description text
-        self._canvas.create_text(
-            sw // 2, 80,
-            text=description,
-            fill="white", font=("Segoe UI", 12),
-            width=box_width - 40,
-        )
-
-        # Draw highlight if provided
-        if ui_highlight:
-            x, y, r = self._get_location_coords(ui_highlight)
-            action = ui_highlight.get("action", "circle")
-
-            if action == "circle":
-                self._canvas.create_oval(
-                    x - r, y - r, x + r, y + r,
-                    outline="#e94560", width=3,
-                )
-            elif action == "arrow":
-                # Draw arrow pointing to the location
-                self._canvas.create_line(
-                    x - r - 40, y - r - 40, x - 5, y - 5,
-                    fill="#e94560", width=3, arrow="last", arrowshape=(12, 15, 5),
-                )
-            elif action == "box":
-                self._canvas.create_rectangle(
-                    x - r, y - r, x + r, y + r,
-                    outline="#e94560", width=3,
-                )
-
-            # Label for the highlighted element
-            element_name = ui_highlight.get("element", "")
-            if element_name:
-                self._canvas.create_text(
-                    x, y - r - 15,
-                    text=element_name,
-                    fill="#e94560", font=("Segoe UI", 10, "bold"),
-                )
+        self._schedule("step", (step_num, total_steps, description, ui_highlight))
 
     def show_success(self, step_num: int):
         """Show a green checkmark for a completed step."""
-        self._schedule(self._draw_success, step_num)
-
-    def _draw_success(self, step_num):
-        """Draw success indicator (must run on tk thread)."""
-        if not self._canvas:
-            return
-
-        sw = self._screen_width
-        self._canvas.create_text(
-            sw // 2, 140,
-            text=f"✓ Step {step_num} Complete",
-            fill="#4CAF50", font=("Segoe UI", 16, "bold"),
-        )
+        self._schedule("success", step_num)
 
     def clear_step(self):
-        """Clear all drawings from the overlay."""
-        self._schedule(self._clear)
-
-    def _clear(self):
-        """Clear canvas and hide window (must run on tk thread)."""
-        if self._canvas:
-            self._canvas.delete("all")
-        if self._root:
-            self._root.withdraw()
+        """Remove the step drawings; the window hides unless recording."""
+        self._schedule("step", None)
 
     def show_recording_indicator(self):
-        """Show a red recording dot in the top-right corner."""
-        self._schedule(self._draw_recording)
-
-    def _draw_recording(self):
-        """Draw recording indicator (must run on tk thread)."""
-        if not self._canvas:
-            return
-
-        self._root.deiconify()
-        sw = self._screen_width
-        # Red filled circle
-        self._canvas.create_oval(
-            sw - 50, 15, sw - 30, 35,
-            fill="red", outline="red", tags="rec",
-        )
-        self._canvas.create_text(
-            sw - 65, 25,
-            text="REC", fill="red", font=("Segoe UI", 9, "bold"), tags="rec",
-        )
+        """Show a recording indicator in the top-right corner."""
+        self._schedule("recording", True)
 
     def hide_recording_indicator(self):
         """Remove the recording indicator."""
-        self._schedule(self._hide_recording)
-
-    def _hide_recording(self):
-        """Remove recording indicator (must run on tk thread)."""
-        if self._canvas:
-            self._canvas.delete("rec")
+        self._schedule("recording", False)
 
     def destroy(self):
-        """Close the overlay window."""
-        if self._root:
-            try:
-                self._root.after(0, self._root.destroy)
-            except Exception:
-                pass
+        """Close the overlay window for good (on app exit)."""
+        self._closed = True
+
+
+_overlay = None
+_overlay_lock = threading.Lock()
+
+
+def get_overlay() -> Overlay:
+    """Return the app-wide overlay; its window thread starts on first use."""
+    global _overlay
+    with _overlay_lock:
+        if _overlay is None:
+            _overlay = Overlay()
+        return _overlay
@@ -0,0 +1,331 @@
+"""In-process audio playback engine with one ordered queue.
+
+All speech goes through a single worker thread so utterances never overlap.
+Each ``play()`` returns a ``PlaybackHandle`` that can be waited on, cancelled,
+or used to learn when audio actually finished. Audio is raw 16-bit mono PCM
+played from memory through ``sounddevice``; sources may be byte strings or
+iterables of chunks (e.g. a streaming TTS response), which are read on their
+own thread as soon as they are queued so synthesis overlaps playback.
+"""
+
+import io
+import itertools
+import os
+import queue
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import warnings
+import wave
+
+try:
+    import sounddevice as sd
+except ImportError:
+    sd = None
+
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+
+DEFAULT_SAMPLE_RATE = 22050
+# Audio is written in blocks this long, which bounds interruption latency
+BLOCK_SECONDS = 0.05
+
+
+class PlaybackHandle:
+    """Tracks one queued utterance.
+
+    Attributes:
+        priority: Queue priority (lower plays first).
+        info: Free-form metadata; sources may annotate it (e.g. "cached").
+        queued_at, first_audio_at, source_done_at, finished_at:
+            perf_counter() timestamps, None until reached.
+        interrupted: True if playback was cancelled or barged in on.
+        error: Exception raised by the source, if any.
+    """
+
+    def __init__(self, priority: int):
+        self.priority = priority
+        self.info = {}
+        self.queued_at = time.perf_counter()
+        self.first_audio_at = None
+        self.source_done_at = None
+        self.finished_at = None
+        self.interrupted = False
+        self.error = None
+        self._cancelled = threading.Event()
+        self._done = threading.Event()
+        self._callbacks = []
+        self._lock = threading.Lock()
+
+    @property
+    def done(self) -> bool:
+        """Whether playback has finished, failed or been interrupted."""
+        return self._done.is_set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Block until playback ends; return False on timeout."""
+        return self._done.wait(timeout)
+
+    def cancel(self) -> None:
+        """Stop this utterance, whether it is playing or still queued."""
+        self._cancelled.set()
+
+    def add_done_callback(self, fn) -> None:
+        """Call fn(handle) when playback ends (immediately if it already has)."""
+        with self._lock:
+            if not self._done.is_set():
+                self._callbacks.append(fn)
+                return
+        fn(self)
+
+    def _finish(self, interrupted: bool = False, error: Exception | None = None) -> None:
+        with self._lock:
+            if self._done.is_set():
+                return
+            self.interrupted = interrupted
+            self.error = error
+            self.finished_at = time.perf_counter()
+            self._done.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for fn in callbacks:
+            try:
+                fn(self)
+            except Exception as e:
+                warnings.warn(f"Playback callback failed: {e}")
+
+
+class _Item:
+    """A queued utterance: its handle plus the chunks read from its source."""
+
+    def __init__(self, handle: PlaybackHandle, sample_rate: int):
+        self.handle = handle
+        self.sample_rate = sample_rate
+        self.chunks = queue.Queue()
+
+    def read(self, source) -> None:
+        """Drain source into the chunk queue (runs on its own thread)."""
+        try:
+            if isinstance(source, (bytes, bytearray, memoryview)):
+                self.chunks.put(bytes(source))
+            else:
+                for chunk in source:
+                    if self.handle.cancelled:
+                        break
+                    if chunk:
+                        self.chunks.put(chunk)
+        except Exception as e:
+            self.handle.error = e
+        finally:
+            self.handle.source_done_at = time.perf_counter()
+            self.chunks.put(None)
+
+
+class AudioPlayer:
+    """Plays queued PCM utterances one at a time in priority order."""
+
+    def __init__(self):
+        self._queue = queue.PriorityQueue()
+        self._seq = itertools.count()
+        self._pending = set()
+        self._pending_lock = threading.Lock()
+        self._current = None
+        self._stream = None
+        self._stream_rate = None
+        self._thread = threading.Thread(target=self._run, daemon=True, name="audio-player")
+        self._thread.start()
+
+    def play(
+        self,
+        source,
+        priority: int = PRIORITY_NORMAL,
+        interrupt: bool = False,
+        sample_rate: int = DEFAULT_SAMPLE_RATE,
+    ) -> PlaybackHandle:
+        """Queue audio for playback.
+
+        Args:
+            source: PCM bytes, or an iterable of PCM byte chunks. Iterables
+                start being read immediately on a background thread.
+            priority: PRIORITY_HIGH, PRIORITY_NORMAL or PRIORITY_LOW.
+            interrupt: Barge in — stop the current utterance and drop queued
+                ones of the same or lower priority before queueing this one.
+            sample_rate: Sample rate of the PCM data.
+
+        Returns:
+            A PlaybackHandle for the queued utterance.
+        """
+        if interrupt:
+            self.interrupt(priority)
+
+        handle = PlaybackHandle(priority)
+        item = _Item(handle, sample_rate)
+        threading.Thread(target=item.read, args=(source,), daemon=True).start()
+        with self._pending_lock:
+            self._pending.add(item)
+        self._queue.put((priority, next(self._seq), item))
+        return handle
+
+    def interrupt(self, priority: int = PRIORITY_LOW) -> None:
+        """Stop current and queued utterances with priority >= the given one.
+
+        With the default, everything is stopped.
+        """
+        with self._pending_lock:
+            items = list(self._pending)
+        for item in items:
+            if item.handle.priority >= priority:
+                item.handle.cancel()
+
+    def stop_all(self) -> None:
+        """Stop the current utterance and clear the queue."""
+        self.interrupt(PRIORITY_HIGH)
+
+    @property
+    def busy(self) -> bool:
+        """Whether anything is playing or queued."""
+        with self._pending_lock:
+            return bool(self._pending)
+
+    def _run(self):
+        while True:
+            _priority, _seq, item = self._queue.get()
+            self._current = item
+            try:
+                if item.handle.cancelled:
+                    item.handle._finish(interrupted=True)
+                elif sd is not None and self._ensure_stream(item.sample_rate):
+                    self._play_stream(item)
+                else:
+                    self._play_fallback(item)
+            except Exception as e:
+                warnings.warn(f"Audio playback failed: {e}")
+                item.handle._finish(error=e)
+            finally:
+                self._current = None
+                with self._pending_lock:
+                    self._pending.discard(item)
+
+    def _ensure_stream(self, sample_rate: int) -> bool:
+        """Open (or reopen at a new rate) the persistent output stream."""
+        if self._stream is not None and self._stream_rate == sample_rate:
+            return True
+        self._close_stream()
+        try:
+            self._stream = sd.RawOutputStream(samplerate=sample_rate, channels=1, dtype="int16")
+            self._stream_rate = sample_rate
+            return True
+        except Exception as e:
+            warnings.warn(f"Audio output unavailable, falling back to system player: {e}")
+            self._stream = None
+            return False
+
+    def _close_stream(self):
+        if self._stream is not None:
+            try:
+                self._stream.close()
+            except Exception:
+                pass
+        self._stream = None
+        self._stream_rate = None
+
+    def _play_stream(self, item: _Item) -> None:
+        stream = self._stream
+        handle = item.handle
+        block_bytes = max(2, int(item.sample_rate * BLOCK_SECONDS) * 2)
+        carry = b""
+        while True:
+            if handle.cancelled:
+                if stream.active:
+                    stream.abort()  # discard buffered audio immediately
+                handle._finish(interrupted=True)
+                return
+            try:
+                chunk = item.chunks.get(timeout=BLOCK_SECONDS)
+            except queue.Empty:
+                continue
+            if chunk is None:
+                break
+            # PCM chunks can split a 2-byte sample; carry the odd byte over
+            data = carry + chunk
+            cut = len(data) - len(data) % 2
+            carry = data[cut:]
+            for offset in range(0, cut, block_bytes):
+                if handle.cancelled:
+                    break
+                if not stream.active:
+                    stream.start()
+                stream.write(data[offset:min(offset + block_bytes, cut)])
+                if handle.first_audio_at is None:
+                    handle.first_audio_at = time.perf_counter()
+
+        if stream.active:
+            stream.stop()  # returns once the buffered audio has been played
+        handle._finish(interrupted=handle.cancelled, error=handle.error)
+
+    def _play_fallback(self, item: _Item) -> None:
+        """Play through the OS when no audio device can be opened directly."""
+        handle = item.handle
+        chunks = []
+        while True:
+            chunk = item.chunks.get()
+            if chunk is None:
+                break
+            chunks.append(chunk)
+        pcm = b"".join(chunks)
+        if handle.cancelled or not pcm:
+            handle._finish(interrupted=handle.cancelled, error=handle.error)
+            return
+
+        wav = _to_wav(pcm, item.sample_rate)
+        handle.first_audio_at = time.perf_counter()
+        if sys.platform == "win32":
+            import winsound
+            # Plays straight from memory; blocks until done
+            winsound.PlaySound(wav, winsound.SND_MEMORY)
+        else:
+            player = "afplay" if sys.platform == "darwin" else "aplay"
+            tmp = tempfile.NamedTemporaryFile(suffix=".wav", delete=False)
+            tmp.write(wav)
+            tmp.close()
+            try:
+                proc = subprocess.Popen([player, tmp.name],
+                                        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                while proc.poll() is None:
+                    if handle.cancelled:
+                        proc.terminate()
+                        break
+                    time.sleep(BLOCK_SECONDS)
+            finally:
+                os.unlink(tmp.name)
+        handle._finish(interrupted=handle.cancelled, error=handle.error)
+
+
+def _to_wav(pcm: bytes, sample_rate: int) -> bytes:
+    """Wrap raw 16-bit mono PCM in a WAV container."""
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(sample_rate)
+        wf.writeframes(pcm)
+    return buf.getvalue()
+
+
+_player = None
+_player_lock = threading.Lock()
+
+
+def get_player() -> AudioPlayer:
+    """Return the process-wide audio player, starting it on first use."""
+    global _player
+    with _player_lock:
+        if _player is None:
+            _player = AudioPlayer()
+        return _player
@@ -1,24 +1,376 @@
-"""Screen recording using mss frame capture and OpenCV MP4 encoding."""
+"""Screen recording using mss frame capture and a fixme.encoders backend.
 
+Capture and encoding run on separate threads joined by a bounded queue, so
+a slow encoder never stalls capture. Frames are captured on a monotonic
+schedule and carry their capture timestamp; the encoder places each frame
+in the constant-rate video by that timestamp, repeating the previous frame
+over any gap left by dropped frames, so the recording keeps real time.
+
+Most of a fix session the screen is static. Each capture is compared
+pixel for pixel with a reference copy of the screen (``changed_rect``);
+unchanged frames are not queued or converted at all, and the encoder holds
+the previous frame over their slots (without re-encoding it, see
+``Encoder.repeat``). With ``dirty_rects`` only the bounding box of the
+changed pixels is copied and queued, and the encoder patches it into its
+copy of the screen.
+
+Frames stay BGRA from capture to the encoder (ffmpeg or OpenCV, see
+``fixme.encoders``), which scales and converts them according to the
+recording profile. Nothing on the way copies a whole frame: mss captures
+are wrapped through the buffer protocol, and sources that can fill a
+caller's buffer (``GdiSource`` on Windows, ``grab_into``) capture into
+buffers recycled through a ``FramePool``, so a steady recording allocates
+no frame memory at all.
+
+Walkthrough events passed to ``mark()`` (see ConversationFlow's
+``on_event``) are timestamped on the video's clock. When recording stops,
+a chapter index (``<name>.chapters.json`` and a WebVTT ``<name>.chapters.vtt``)
+is written next to the video, one chapter per step, and with ``captions``
+the current step is burned into the frames by the encoder thread.
+"""
+
+import json
 import os
+import queue
+import sys
 import threading
 import time
 import warnings
+from collections import deque
 from datetime import datetime
 
-import cv2
 import mss
 import numpy as np
 
+from fixme.encoders import get_profile, open_encoder
+
+# Frames buffered between the capture and encoder threads
+QUEUE_FRAMES = 8
+
+# What to do when the encoder falls behind and the queue is full
+DROP_OLDEST = "oldest"  # discard the oldest queued frame (video stays current)
+DROP_NEWEST = "newest"  # discard the frame just captured
+
+# Encode latencies kept for the stats window
+LATENCY_WINDOW = 100
+
+# Seconds stop() waits for queued frames to be encoded and the file closed
+ENCODER_JOIN_TIMEOUT = 45
+
+def changed_rect(
+    reference: np.ndarray | None,
+    frame: np.ndarray,
+    mask: np.ndarray | None = None,
+) -> tuple[int, int, int, int] | None:
+    """Return the (x0, y0, x1, y1) box of pixels in which frame differs from reference.
+
+    Every pixel is compared. Without a reference (or one of another size)
+    the whole frame counts as changed.
+
+    Args:
+        reference: The screen as last queued (BGRA), or None.
+        frame: The new capture (BGRA).
+        mask: A (height, width) bool array reused for the comparison.
+
+    Returns:
+        The box, or None if nothing changed.
+
+    >>> screen = np.zeros((5, 7, 4), np.uint8)
+    >>> frame = screen.copy()
+    >>> frame[3, 5, 2] = 1
+    >>> changed_rect(screen, frame)
+    (5, 3, 6, 4)
+    >>> changed_rect(screen, screen.copy()) is None
+    True
+    """
+    height, width = frame.shape[:2]
+    if reference is None or reference.shape != frame.shape:
+        return 0, 0, width, height
+    # One packed 32-bit compare per pixel
+    mask = np.not_equal(frame.view(np.uint32)[..., 0], reference.view(np.uint32)[..., 0], out=mask)
+    rows = np.flatnonzero(mask.any(axis=1))
+    if not rows.size:
+        return None
+    y0, y1 = int(rows[0]), int(rows[-1]) + 1
+    cols = np.flatnonzero(mask[y0:y1].any(axis=0))
+    return int(cols[0]), y0, int(cols[-1]) + 1, y1
+
+
+# Events that start a chapter -> title template (filled from the event data)
+CHAPTER_TITLES = {
+    "walkthrough_started": "Diagnosis: {diagnosis}",
+    "step_shown": "Step {step}: {description}",
+    "walkthrough_ended": "Summary",
+}
+# Events that change the status shown after a step's caption
+STEP_STATUS = {
+    "step_approved": "approved",
+    "step_executing": "running",
+    "step_skipped": "skipped",
+    "walkthrough_aborted": "stopped",
+}
+# Caption bar height as a fraction of the frame height
+CAPTION_HEIGHT = 0.05
+
+
+def chapter_title(event: dict) -> str | None:
+    """Return the chapter title an event starts, or None."""
+    template = CHAPTER_TITLES.get(event["event"])
+    if template is None:
+        return None
+    try:
+        return template.format(**event)
+    except (KeyError, IndexError):
+        return template
+
+
+def caption_at(events: list[dict], t: float) -> str:
+    """Return the caption for video time t: the chapter, plus step status."""
+    title, status = "", ""
+    for event in events:
+        if event["t"] > t:
+            break
+        chapter = chapter_title(event)
+        if chapter is not None:
+            title, status = chapter, ""
+        elif event["event"] == "step_result":
+            status = "done" if event.get("ok") else "failed"
+        elif event["event"] in STEP_STATUS:
+            status = STEP_STATUS[event["event"]]
+    return f"{title} ({status})" if title and status else title
+
+
+def _vtt_time(seconds: float) -> str:
+    ms = round(seconds * 1000)
+    return f"{ms // 3600000:02d}:{ms // 60000 % 60:02d}:{ms // 1000 % 60:02d}.{ms % 1000:03d}"
+
+
+def write_chapters(video_path: str, events: list[dict], start: float, end: float) -> str | None:
+    """Write the chapter index for a video covering [start, end] of the event clock.
+
+    Writes ``<name>.chapters.json`` (chapters and all events, times in video
+    seconds) and ``<name>.chapters.vtt``. A chapter already running at start
+    begins the video.
+
+    Returns:
+        Path of the JSON index, or None if there were no events.
+    """
+    events = [e for e in events if e["t"] <= end]
+    if not events:
+        return None
+    chapters = []
+    for event in events:
+        title = chapter_title(event)
+        if title is None:
+            continue
+        chapter_start = max(0.0, event["t"] - start)
+        if chapters and chapters[-1]["start"] >= chapter_start:
+            chapters.pop()  # superseded before the video begins
+        chapters.append({"start": round(chapter_start, 3), "title": title})
+    for chapter, following in zip(chapters, chapters[1:] + [None]):
+        chapter["end"] = following["start"] if following else round(end - start, 3)
+
+    base = os.path.splitext(video_path)[0]
+    index = {
+        "video": os.path.basename(video_path),
+        "duration": round(end - start, 3),
+        "chapters": chapters,
+        "events": [{**e, "t": round(e["t"] - start, 3)} for e in events if e["t"] >= start],
+    }
+    with open(base + ".chapters.json", "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False, indent=1)
+    lines = ["WEBVTT", ""]
+    for n, chapter in enumerate(chapters, 1):
+        lines += [str(n), f"{_vtt_time(chapter['start'])} --> {_vtt_time(chapter['end'])}",
+                  chapter["title"], ""]
+    with open(base + ".chapters.vtt", "w", encoding="utf-8") as f:
+        f.write("\n".join(lines))
+    return base + ".chapters.json"
+
+
+class FramePool:
+    """Recycled frame buffers of one shape.
+
+    The pool grows to the number of frames in flight (being captured,
+    queued, encoded and held as the previous frame) and then stops
+    allocating.
+    """
+
+    def __init__(self, shape: tuple[int, ...]):
+        self.shape = shape
+        self.allocated = 0
+        self._free = []
+        self._lock = threading.Lock()
+
+    def acquire(self) -> np.ndarray:
+        """Return a free buffer (contents undefined)."""
+        with self._lock:
+            if self._free:
+                return self._free.pop()
+            self.allocated += 1
+        return np.empty(self.shape, np.uint8)
+
+    def release(self, buffer: np.ndarray) -> None:
+        """Return a buffer from acquire() once nothing refers to it."""
+        with self._lock:
+            self._free.append(buffer)
+
+
+class GdiSource:
+    """Captures the primary monitor with GDI into caller buffers (Windows).
+
+    BitBlt copies the screen into a bitmap kept for the whole recording and
+    GetDIBits writes its pixels straight into the numpy buffer passed to
+    grab_into(), so capturing allocates nothing.
+    """
+
+    def __init__(self):
+        import ctypes
+        from ctypes import wintypes
+
+        # Physical pixels when the process is DPI-aware (fixme.locator.enable_dpi_awareness() at startup)
+        self._ctypes = ctypes
+        # Private library handles, so these signatures don't leak to mss
+        user32, gdi32 = ctypes.WinDLL("user32"), ctypes.WinDLL("gdi32")
+        user32.GetDC.argtypes = [wintypes.HWND]
+        user32.GetDC.restype = wintypes.HDC
+        user32.ReleaseDC.argtypes = [wintypes.HWND, wintypes.HDC]
+        gdi32.CreateCompatibleDC.argtypes = [wintypes.HDC]
+        gdi32.CreateCompatibleDC.restype = wintypes.HDC
+        gdi32.CreateCompatibleBitmap.argtypes = [wintypes.HDC, ctypes.c_int, ctypes.c_int]
+        gdi32.CreateCompatibleBitmap.restype = wintypes.HBITMAP
+        gdi32.SelectObject.argtypes = [wintypes.HDC, wintypes.HGDIOBJ]
+        gdi32.SelectObject.restype = wintypes.HGDIOBJ
+        gdi32.BitBlt.argtypes = [wintypes.HDC] + [ctypes.c_int] * 4 + [wintypes.HDC] + [ctypes.c_int] * 2 + [wintypes.DWORD]
+        gdi32.BitBlt.restype = wintypes.BOOL
+        gdi32.GetDIBits.argtypes = [wintypes.HDC, wintypes.HBITMAP, wintypes.UINT, wintypes.UINT,
+                                    ctypes.c_void_p, ctypes.c_void_p, wintypes.UINT]
+        gdi32.GetDIBits.restype = ctypes.c_int
+        gdi32.DeleteObject.argtypes = [wintypes.HGDIOBJ]
+        gdi32.DeleteDC.argtypes = [wintypes.HDC]
+        self._user32, self._gdi32 = user32, gdi32
+
+        width, height = user32.GetSystemMetrics(0), user32.GetSystemMetrics(1)  # primary monitor
+        self.size = (width, height)
+        self._screen_dc = user32.GetDC(None)
+        self._memory_dc = gdi32.CreateCompatibleDC(self._screen_dc)
+        self._bitmap = gdi32.CreateCompatibleBitmap(self._screen_dc, width, height)
+        if not self._bitmap:
+            self.close()
+            raise OSError("CreateCompatibleBitmap failed")
+        gdi32.SelectObject(self._memory_dc, self._bitmap)
+
+        # BITMAPINFOHEADER: top-down (negative height), 1 plane, 32 bpp, BI_RGB
+        self._info = (ctypes.c_int32 * 10)(40, width, -height, 1 | (32 << 16))
+
+    def grab_into(self, out: np.ndarray) -> np.ndarray:
+        """Capture the screen into out, a C-contiguous (height, width, 4) uint8 array."""
+        width, height = self.size
+        # SRCCOPY | CAPTUREBLT (include layered windows)
+        if not self._gdi32.BitBlt(self._memory_dc, 0, 0, width, height, self._screen_dc, 0, 0,
+                                  0x00CC0020 | 0x40000000):
+            raise OSError("BitBlt failed")
+        lines = self._gdi32.GetDIBits(self._memory_dc, self._bitmap, 0, height, out.ctypes.data,
+                                      self._ctypes.addressof(self._info), 0)
+        if lines != height:
+            raise OSError("GetDIBits failed")
+        return out
+
+    def grab(self) -> np.ndarray:
+        """Return the current screen as a new BGRA array."""
+        return self.grab_into(np.empty((self.size[1], self.size[0], 4), np.uint8))
+
+    def close(self):
+        if self._bitmap:
+            self._gdi32.DeleteObject(self._bitmap)
+        if self._memory_dc:
+            self._gdi32.DeleteDC(self._memory_dc)
+        if self._screen_dc:
+            self._user32.ReleaseDC(None, self._screen_dc)
+        self._bitmap = self._memory_dc = self._screen_dc = None
+
+
+def default_source():
+    """Return the best frame source for this platform."""
+    if sys.platform == "win32":
+        try:
+            return GdiSource()
+        except Exception as e:
+            warnings.warn(f"GDI capture unavailable, using mss: {e}")
+    return MonitorSource()
+
+
+class MonitorSource:
+    """Captures the primary monitor with mss.
+
+    mss allocates a new buffer per capture; it is wrapped, not copied.
+    """
+
+    def __init__(self):
+        self._sct = mss.mss()
+        self._monitor = self._sct.monitors[1]  # Primary monitor
+        self.size = (self._monitor["width"], self._monitor["height"])
+
+    def grab(self) -> np.ndarray:
+        """Return the current screen as a new BGRA array."""
+        return np.asarray(self._sct.grab(self._monitor))
+
+    def close(self):
+        self._sct.close()
+
 
 class ScreenRecorder:
-    """Records the primary monitor to an MP4 file."""
+    """Records the primary monitor to an MP4 file.
+
+    Args:
+        fps: Target capture and video frame rate; defaults to the profile's.
+        profile: Recording profile name from encoders.PROFILES, or a dict
+            of overrides of the default profile.
+        encoder: Encoder name ("ffmpeg", "opencv") or preference list;
+            defaults to encoders.ENCODER_PREFERENCE.
+        queue_frames: Capacity of the capture -> encoder queue.
+        drop_policy: DROP_OLDEST or DROP_NEWEST when the queue is full.
+        elide_duplicates: Skip frames in which nothing changed.
+        dirty_rects: Queue only the changed region of each frame
+            (implies elide_duplicates).
+        source: Frame source with grab() and size, and optionally
+            grab_into(buffer) to capture into recycled buffers; defaults to
+            default_source(), opened when recording starts.
+        captions: Burn the current step (from mark()) into the frames.
+    """
 
-    def __init__(self, fps: int = 10):
-        self.fps = fps
+    def __init__(
+        self,
+        fps: int | None = None,
+        profile: str | dict | None = None,
+        encoder: str | list[str] | None = None,
+        queue_frames: int = QUEUE_FRAMES,
+        drop_policy: str = DROP_OLDEST,
+        elide_duplicates: bool = True,
+        dirty_rects: bool = False,
+        source=None,
+        captions: bool = False,
+    ):
+        self.profile = get_profile(profile)
+        self.fps = fps or self.profile["fps"]
+        self.encoder_preference = [encoder] if isinstance(encoder, str) else encoder
+        self.queue_frames = queue_frames
+        self.drop_policy = drop_policy
+        self.elide_duplicates = elide_duplicates or dirty_rects
+        self.dirty_rects = dirty_rects
+        self.source = source
+        self.captions = captions
+        self._resync = False
+        self._events = []
+        self._caption_frame = None
+        self._pool = None
         self._recording = False
         self._thread = None
+        self._encode_thread = None
+        self._frames = None
         self._output_path = None
+        self._stats_lock = threading.Lock()
+        self._reset_stats()
 
     @property
     def is_recording(self) -> bool:
@@ -26,7 +378,7 @@ class ScreenRecorder:
         return self._recording
 
     def start(self, output_path: str = None) -> None:
-        """Start screen recording in a background thread.
+        """Start screen recording in background threads.
 
         Args:
             output_path: Where to save the MP4. Defaults to Desktop.
@@ -40,13 +392,19 @@ class ScreenRecorder:
             output_path = os.path.join(desktop, f"FixMe_Recording_{timestamp}.mp4")
 
         self._output_path = output_path
+        self._reset_stats()
+        with self._stats_lock:
+            self._events = []
+        self._frames = queue.Queue(maxsize=self.queue_frames)
         self._recording = True
-        self._thread = threading.Thread(target=self._record_loop, daemon=True)
+        self._thread = threading.Thread(target=self._capture_loop, daemon=True)
         self._thread.start()
 
     def stop(self) -> str | None:
         """Stop recording and return the output file path.
 
+        Frames already captured are encoded before this returns.
+
         Returns:
             Path to the saved MP4 file, or None if not recording.
         """
@@ -57,39 +415,280 @@ class ScreenRecorder:
         if self._thread:
             self._thread.join(timeout=5)
             self._thread = None
+        if self._encode_thread:
+            # The encoder may still be finishing the file (FFMPEG_CLOSE_TIMEOUT)
+            self._encode_thread.join(timeout=ENCODER_JOIN_TIMEOUT)
+            self._encode_thread = None
 
+        self._finish()
         return self._output_path
 
-    def _record_loop(self):
-        """Capture frames and write to video file."""
+    def _finish(self):
+        """Write the chapter index next to the finished video."""
+        with self._stats_lock:
+            events = list(self._events)
+            started, ended = self._stats["capture_started"], self._stats["capture_ended"]
+        if started is not None and ended is not None:
+            try:
+                write_chapters(self._output_path, events, 0.0, ended - started)
+            except OSError as e:
+                warnings.warn(f"Writing recording chapters failed: {e}")
+
+    def mark(self, event: str, **data) -> None:
+        """Record a walkthrough event at the current video time.
+
+        Args:
+            event: Event name, e.g. a ConversationFlow on_event name;
+                see CHAPTER_TITLES and STEP_STATUS for those shown.
+            **data: Event details (step, description, ok, ...).
+        """
+        if not self._recording:
+            return
+        with self._stats_lock:
+            started = self._stats["capture_started"]
+            t = time.monotonic() - started if started is not None else 0.0
+            self._events.append({"t": t, "event": event, **data})
+        if self.captions:
+            # A new caption needs a frame even if the screen is unchanged
+            self._resync = True
+
+    def _reset_stats(self):
+        with self._stats_lock:
+            self._stats = {
+                "captured": 0,
+                "encoded": 0,
+                "dropped": 0,
+                "repeated": 0,
+                "elided": 0,
+                "queued_bytes": 0,
+                "frame_buffers": 0,
+                "encoder": None,
+                "capture_started": None,
+                "capture_ended": None,
+            }
+            self._encode_ms = deque(maxlen=LATENCY_WINDOW)
+
+    def _count(self, key: str, n: int = 1):
+        with self._stats_lock:
+            self._stats[key] += n
+
+    def stats(self) -> dict:
+        """Return counters for the current or last recording.
+
+        Returns:
+            Dict with "captured", "encoded", "dropped", "elided" (unchanged,
+            never queued) and "repeated" (written again to hold the previous
+            frame) counts, "queued_bytes" (pixel data passed to the encoder),
+            "achieved_fps" (frames captured per second), "target_fps",
+            "queue_depth", "frame_buffers" (recycled capture buffers
+            allocated), "encoder" (backend name) and "encode_ms" (mean and
+            max over recent frames).
+        """
+        with self._stats_lock:
+            stats = dict(self._stats)
+            latencies = list(self._encode_ms)
+        started = stats.pop("capture_started")
+        ended = stats.pop("capture_ended") or time.monotonic()
+        elapsed = ended - started if started is not None else 0
+        stats["achieved_fps"] = round(stats["captured"] / elapsed, 2) if elapsed > 0 else 0.0
+        stats["target_fps"] = self.fps
+        stats["queue_depth"] = self._frames.qsize() if self._frames is not None else 0
+        stats["frame_buffers"] = self._pool.allocated if self._pool is not None else 0
+        stats["encode_ms"] = {
+            "mean": round(sum(latencies) / len(latencies), 2) if latencies else 0.0,
+            "max": round(max(latencies), 2) if latencies else 0.0,
+        }
+        return stats
+
+    def _enqueue(self, item):
+        """Queue a captured frame, applying the drop policy when full.
+
+        A dropped frame may carry a change later frames are compared
+        against, so the next capture is then queued whole.
+        """
+        try:
+            self._frames.put_nowait(item)
+            return
+        except queue.Full:
+            pass
+        self._resync = True
+        if self.drop_policy == DROP_NEWEST:
+            self._discard(item)
+            return
+        try:
+            self._discard(self._frames.get_nowait())
+        except queue.Empty:
+            pass
         try:
-            sct = mss.mss()
-            monitor = sct.monitors[1]  # Primary monitor
-            width = monitor["width"]
-            height = monitor["height"]
+            self._frames.put_nowait(item)
+        except queue.Full:
+            self._discard(item)
 
-            fourcc = cv2.VideoWriter_fourcc(*"mp4v")
-            writer = cv2.VideoWriter(
-                self._output_path, fourcc, self.fps, (width, height)
-            )
+    def _discard(self, item):
+        """Count a dropped frame and recycle its buffer."""
+        self._count("dropped")
+        self._recycle(item[1], item[2])
 
-            frame_interval = 1.0 / self.fps
+    def _recycle(self, frame, origin=None):
+        # Only whole frames come from the pool; patches are copies
+        if self._pool is not None and frame is not None and origin is None:
+            self._pool.release(frame)
 
-            while self._recording:
-                start_time = time.time()
+    def _capture_loop(self):
+        """Capture frames on a monotonic schedule and hand them to the encoder."""
+        frames = self._frames
+        source = None
+        started = time.monotonic()
+        try:
+            source = self.source or default_source()
+            size = source.size
+            # Sources that fill a given buffer capture into recycled ones
+            pool = self._pool = FramePool((size[1], size[0], 4)) if hasattr(source, "grab_into") else None
 
-                frame = np.array(sct.grab(monitor))
-                frame = cv2.cvtColor(frame, cv2.COLOR_BGRA2BGR)
-                writer.write(frame)
+            self._encode_thread = threading.Thread(target=self._encode_loop, args=(frames, size), daemon=True)
+            self._encode_thread.start()
 
-                # Maintain target FPS
-                elapsed = time.time() - start_time
-                sleep_time = frame_interval - elapsed
-                if sleep_time > 0:
-                    time.sleep(sleep_time)
+            started = time.monotonic()
+            with self._stats_lock:
+                self._stats["capture_started"] = started
+            next_due = started
+            reference = mask = None  # the screen as last queued; compare buffer
+            self._resync = False
 
-            writer.release()
+            while self._recording:
+                now = time.monotonic()
+                if now < next_due:
+                    time.sleep(next_due - now)
+                    continue
+                frame_interval = self._frame_interval()
+                captured_at = time.monotonic()
+                frame = source.grab() if pool is None else source.grab_into(pool.acquire())
+                self._count("captured")
+                rect = (0, 0, *size)
+                if self.elide_duplicates:
+                    if reference is None:
+                        reference = np.empty((size[1], size[0], 4), np.uint8)
+                        mask = np.empty((size[1], size[0]), bool)
+                        self._resync = True
+                    rect = changed_rect(None if self._resync else reference, frame, mask)
+                    self._resync = False
+                    if rect is not None:
+                        x0, y0, x1, y1 = rect
+                        reference[y0:y1, x0:x1] = frame[y0:y1, x0:x1]
+                if rect is None:
+                    self._count("elided")
+                    self._recycle(frame)
+                else:
+                    if self.dirty_rects and rect != (0, 0, *size):
+                        x0, y0, x1, y1 = rect
+                        item = (captured_at - started, frame[y0:y1, x0:x1].copy(), (x0, y0))
+                        self._recycle(frame)
+                    else:
+                        item = (captured_at - started, frame, None)
+                    self._count("queued_bytes", item[1].nbytes)
+                    self._enqueue(item)
+                # Catch up by skipping missed slots rather than bursting
+                next_due += frame_interval
+                if next_due < time.monotonic():
+                    missed = int((time.monotonic() - next_due) / frame_interval) + 1
+                    next_due += missed * frame_interval
 
         except Exception as e:
             self._recording = False
             warnings.warn(f"Screen recording failed: {e}")
+        finally:
+            ended = time.monotonic()
+            with self._stats_lock:
+                self._stats["capture_ended"] = ended
+            if source is not None and source is not self.source:
+                source.close()
+            # End marker, so the last frame is held until the end; waits for room
+            frames.put((ended - started, None, None))
+
+    def _frame_interval(self) -> float:
+        """Seconds between captures (capture thread)."""
+        return 1.0 / self.fps
+
+    def _open_encoder(self, size: tuple[int, int]):
+        """Return the encoder frames are written to (encoder thread)."""
+        return open_encoder(self._output_path, size, self.fps, self.profile, self.encoder_preference)
+
+    def _encode_loop(self, frames: queue.Queue, size: tuple[int, int]):
+        """Encode queued frames, placing each by its timestamp.
+
+        Slots with no frame of their own (elided or dropped) repeat the
+        previous frame. Patches from dirty_rects are applied to the last
+        full frame, which only this thread holds.
+        """
+        encoder = None
+        try:
+            encoder = self._open_encoder(size)
+            with self._stats_lock:
+                self._stats["encoder"] = encoder.name
+            written = 0
+            previous = None
+            output = None  # previous as written (with its caption)
+
+            while True:
+                timestamp, frame, origin = frames.get()
+                slot = round(timestamp * self.fps)
+                if previous is not None and slot > written:
+                    encoder.repeat(output, slot - written)
+                    self._count("repeated", slot - written)
+                    written = slot
+                if frame is None:
+                    break
+                started = time.perf_counter()
+                if origin is None:
+                    # The last full frame is only needed until the next one
+                    self._recycle(previous)
+                    previous = frame
+                elif previous is not None:
+                    x, y = origin
+                    h, w = frame.shape[:2]
+                    previous[y:y + h, x:x + w] = frame
+                else:
+                    continue
+                output = self._burn_caption(previous, timestamp) if self.captions else previous
+                encoder.write(output)
+                written += 1
+                with self._stats_lock:
+                    self._stats["encoded"] += 1
+                    self._encode_ms.append((time.perf_counter() - started) * 1000)
+
+        except Exception as e:
+            self._recording = False
+            warnings.warn(f"Screen recording encoder failed: {e}")
+            # Keep draining so the capture thread can always post its end marker
+            while True:
+                _, frame, origin = frames.get()
+                if frame is None:
+                    break
+                self._recycle(frame, origin)
+        finally:
+            if encoder is not None:
+                encoder.close()
+
+    def _burn_caption(self, frame: np.ndarray, timestamp: float) -> np.ndarray:
+        """Return frame with the caption for timestamp drawn in a bar at the bottom.
+
+        Draws on a copy kept for reuse, so frame (the encoder's copy of the
+        screen) stays clean.
+        """
+        import cv2
+
+        with self._stats_lock:
+            caption = caption_at(self._events, timestamp)
+        if not caption:
+            return frame
+        if self._caption_frame is None or self._caption_frame.shape != frame.shape:
+            self._caption_frame = np.empty_like(frame)
+        out = self._caption_frame
+        np.copyto(out, frame)
+        height = frame.shape[0]
+        bar = max(16, int(height * CAPTION_HEIGHT))
+        out[height - bar:, :, :3] //= 4
+        scale = bar / 40
+        cv2.putText(out, caption, (bar // 2, height - bar // 3), cv2.FONT_HERSHEY_SIMPLEX,
+                    scale, (255, 255, 255, 255), max(1, round(scale * 2)), cv2.LINE_AA)
+        return out
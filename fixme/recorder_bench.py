@@ -0,0 +1,186 @@
+"""Benchmarks of the fixme.recorder frame path.
+
+Run with ``python -m fixme.recorder_bench [seconds]``. Records a scripted,
+mostly static synthetic screen (idle desktop, a typing burst, a window
+opening, a progress spinner) in real time with constant-rate recording,
+with duplicate elision, and with dirty rectangles, and prints CPU time
+(including an ffmpeg encoder process), peak traced memory, pixel data
+queued to the encoder and file size for each.
+
+``python -m fixme.recorder_bench alloc [frames]`` instead runs the per-frame
+work (capture, change detection, encode) on a 4K screen synchronously and
+prints the memory allocated per frame, with a source that returns a new
+array per capture and with one capturing into pooled buffers.
+"""
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from fixme.encoders import OpenCVEncoder, get_profile
+from fixme.recorder import FramePool, ScreenRecorder, changed_rect
+
+WIDTH, HEIGHT = 1920, 1080
+FPS = 10
+
+# (first frame, last frame, activity) at FPS; frames outside these are idle
+SCRIPT = [
+    (20, 40, "typing"),
+    (60, 61, "window"),
+    (80, 120, "spinner"),
+    (150, 151, "window"),
+]
+
+MODES = [
+    ("constant", {"elide_duplicates": False}),
+    ("elide", {"elide_duplicates": True}),
+    ("dirty rects", {"dirty_rects": True}),
+]
+
+ALLOC_SIZE = (3840, 2160)
+
+
+class ScriptedScreen:
+    """Frame source replaying SCRIPT by frame number."""
+
+    def __init__(self, size: tuple[int, int] = (WIDTH, HEIGHT)):
+        self.size = size
+        rng = np.random.default_rng(0)
+        self._desktop = rng.integers(0, 256, (size[1], size[0], 4), dtype=np.uint8)
+        self._window = rng.integers(0, 256, (size[1] // 2, size[0] // 2, 4), dtype=np.uint8)
+        self._screen = self._desktop.copy()
+        self.frame = 0
+
+    def grab(self) -> np.ndarray:
+        self._advance()
+        return self._screen.copy()
+
+    def grab_into(self, out: np.ndarray) -> np.ndarray:
+        self._advance()
+        np.copyto(out, self._screen)
+        return out
+
+    def _advance(self):
+        n = self.frame % (SCRIPT[-1][1] + 30)
+        self.frame += 1
+        for first, last, activity in SCRIPT:
+            if first <= n < last:
+                self._apply(activity, n - first)
+        if n == 0:
+            self._screen[:] = self._desktop
+
+    def _apply(self, activity: str, step: int):
+        w, h = self.size
+        if activity == "typing":
+            # One more character on a text line
+            x = 200 + step * 12
+            self._screen[300:316, x:x + 10, :3] = 20
+        elif activity == "window":
+            top, left = h // 4, w // 4
+            if step == 0 and not self._screen[top, left].any():
+                self._screen[top:top + h // 2, left:left + w // 2] = self._desktop[top:top + h // 2, left:left + w // 2]
+            else:
+                self._screen[top:top + h // 2, left:left + w // 2] = self._window
+        elif activity == "spinner":
+            self._screen[h // 2 - 16:h // 2 + 16, w // 2 - 16:w // 2 + 16, :3] = (step * 37) % 256
+
+    def close(self):
+        pass
+
+
+def run(options: dict, seconds: float) -> dict:
+    """Record the scripted screen for a while; return stats and costs."""
+    path = os.path.join(tempfile.mkdtemp(prefix="fixme_bench_"), "bench.mp4")
+    recorder = ScreenRecorder(fps=FPS, source=ScriptedScreen(), **options)
+    tracemalloc.start()
+    started = os.times()
+    recorder.start(path)
+    time.sleep(seconds)
+    recorder.stop()
+    ended = os.times()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    result = recorder.stats()
+    # Child times cover the ffmpeg encoder, which has exited by now
+    result["cpu_s"] = sum(ended[:4]) - sum(started[:4])
+    result["encoder_cpu_s"] = ended.children_user + ended.children_system - started.children_user - started.children_system
+    result["peak_mb"] = peak / 1e6
+    result["file_mb"] = os.path.getsize(path) / 1e6 if os.path.exists(path) else None
+    return result
+
+
+def alloc(pooled: bool, frames: int, size: tuple[int, int] = ALLOC_SIZE) -> dict:
+    """Run capture, change detection and encode for frames; return per-frame allocation."""
+    screen = ScriptedScreen(size)
+    pool = FramePool((size[1], size[0], 4))
+    encoder = None
+    if OpenCVEncoder.available():
+        path = os.path.join(tempfile.mkdtemp(prefix="fixme_bench_"), "alloc.mp4")
+        encoder = OpenCVEncoder(path, size, FPS, get_profile("standard"))
+    frame = None
+    reference = np.empty((size[1], size[0], 4), np.uint8)
+    mask = np.empty((size[1], size[0]), bool)
+    peaks = []
+    tracemalloc.start()
+    try:
+        for i in range(frames + 2):  # the first two fill the pool
+            if pooled and frame is not None:
+                pool.release(frame)
+            tracemalloc.reset_peak()
+            baseline, _ = tracemalloc.get_traced_memory()
+            frame = screen.grab_into(pool.acquire()) if pooled else screen.grab()
+            rect = changed_rect(reference if i else None, frame, mask)
+            if rect is not None:
+                x0, y0, x1, y1 = rect
+                reference[y0:y1, x0:x1] = frame[y0:y1, x0:x1]
+            if encoder is not None:
+                encoder.write(frame)
+            if i >= 2:
+                peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+    finally:
+        tracemalloc.stop()
+        if encoder is not None:
+            encoder.close()
+    return {
+        "mean_bytes": sum(peaks) / len(peaks),
+        "max_bytes": max(peaks),
+        "frame_bytes": size[0] * size[1] * 4,
+        "buffers": pool.allocated,
+        "encoder": encoder.name if encoder is not None else None,
+    }
+
+
+def main_alloc(frames: int):
+    width, height = ALLOC_SIZE
+    print(f"{width}x{height}, {frames} frames")
+    for name, pooled in (("allocating", False), ("pooled", True)):
+        r = alloc(pooled, frames)
+        print(f"{name:12s} allocated per frame {r['mean_bytes'] / 1e6:7.2f} MB "
+              f"(max {r['max_bytes'] / 1e6:.2f} MB, {r['max_bytes'] / r['frame_bytes']:.2f} frames)  "
+              f"buffers {r['buffers']}  encoder {r['encoder'] or 'none'}")
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "alloc":
+        main_alloc(int(sys.argv[2]) if len(sys.argv) > 2 else 50)
+        return
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 20.0
+    print(f"{WIDTH}x{HEIGHT} at {FPS} fps, {seconds:.0f} s per mode")
+    baseline = None
+    for name, options in MODES:
+        r = run(options, seconds)
+        baseline = baseline or r
+        file_mb = f"{r['file_mb']:.1f} MB" if r["file_mb"] is not None else "n/a"
+        print(f"{name:12s} cpu {r['cpu_s']:5.2f} s ({r['cpu_s'] / baseline['cpu_s']:.0%}, "
+              f"encoder process {r['encoder_cpu_s']:.2f} s)  "
+              f"peak {r['peak_mb']:6.1f} MB  queued {r['queued_bytes'] / 1e6:7.1f} MB  "
+              f"file {file_mb}  elided {r['elided']}/{r['captured']}  "
+              f"encode {r['encode_ms']['mean']:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,383 @@
+"""Always-on instant replay: the last minute of screen, kept in memory.
+
+``ReplayBuffer`` is a ``ScreenRecorder`` whose encoder, instead of writing a
+file, compresses frames to JPEG into short in-memory segments and drops the
+oldest segments beyond ``REPLAY_SECONDS`` or ``MAX_REPLAY_MB``. ``save()``
+writes what is buffered to an MP4 with the regular encoders, so the lead-up
+to an issue can be kept after the fact without recording everything to
+disk.
+
+Only changed frames are compressed (see ``fixme.recorder``); a held frame
+costs a counter. Capture slows down when the buffer's threads use more than
+``CPU_BUDGET`` of one core. Automatic saves (``save_in_background``) count
+against the same budget: they are paced to it, their CPU slows capture
+meanwhile, and they run at most once per ``AUTO_SAVE_INTERVAL``.
+"""
+
+import os
+import threading
+import time
+import warnings
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+
+from fixme.encoders import Encoder, open_encoder
+from fixme.recorder import ScreenRecorder, chapter_title, write_chapters
+
+REPLAY_SECONDS = 60
+SEGMENT_SECONDS = 5
+MAX_REPLAY_MB = 48
+# Fraction of one core the capture and compression threads may use together
+CPU_BUDGET = 0.1
+# Capture is never slowed below one frame per this many seconds
+MAX_INTERVAL = 2.0
+JPEG_QUALITY = 70
+
+# Automatic saves go here; the oldest are deleted beyond MAX_SAVED_REPLAYS
+REPLAY_DIR = Path.home() / ".fixme" / "replays"
+MAX_SAVED_REPLAYS = 20
+# Seconds between automatic saves; one sooner would mostly repeat the last
+AUTO_SAVE_INTERVAL = REPLAY_SECONDS / 2
+
+
+class _Segment:
+    """SEGMENT_SECONDS of video as [jpeg bytes, frame count] runs."""
+
+    def __init__(self, start_frame: int):
+        self.start_frame = start_frame
+        self.frames = []
+        self.nbytes = 0
+
+
+class _RingEncoder(Encoder):
+    """Encoder that keeps JPEG frames in a ReplayBuffer's segments."""
+
+    name = "replay"
+
+    @classmethod
+    def available(cls) -> bool:
+        return True
+
+    def __init__(self, replay: "ReplayBuffer", size: tuple[int, int], fps: float, profile: dict):
+        super().__init__("", size, fps, profile)
+        import cv2
+        import numpy as np
+
+        self._cv2 = cv2
+        self._replay = replay
+        self._bgr = np.empty((size[1], size[0], 3), np.uint8)
+        self._scaled = None
+        if self.output_size != size:
+            self._scaled = np.empty((self.output_size[1], self.output_size[0], 3), np.uint8)
+
+    def write(self, frame) -> None:
+        cpu = time.thread_time()
+        cv2 = self._cv2
+        image = cv2.cvtColor(frame, cv2.COLOR_BGRA2BGR, dst=self._bgr)
+        if self._scaled is not None:
+            image = cv2.resize(image, self.output_size, dst=self._scaled, interpolation=cv2.INTER_AREA)
+        ok, jpeg = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY])
+        if not ok:
+            raise ValueError("JPEG encoding failed")
+        self._replay._append(jpeg.tobytes(), time.thread_time() - cpu)
+
+    def repeat(self, frame, count: int) -> None:
+        self._replay._extend(count)
+
+    def close(self) -> None:
+        pass
+
+
+class ReplayBuffer(ScreenRecorder):
+    """Keeps the last seconds of the screen in memory, ready to save.
+
+    Args:
+        seconds: Length of replay kept.
+        max_mb: Memory cap for the compressed frames.
+        cpu_budget: Fraction of one core capture and compression may use.
+        profile: Recording profile (scale and fps of the replay).
+        **kwargs: Passed to ScreenRecorder (source, dirty_rects, ...).
+    """
+
+    def __init__(
+        self,
+        seconds: float = REPLAY_SECONDS,
+        max_mb: float = MAX_REPLAY_MB,
+        cpu_budget: float = CPU_BUDGET,
+        profile: str | dict = "replay",
+        **kwargs,
+    ):
+        super().__init__(profile=profile, **kwargs)
+        self.seconds = seconds
+        self.max_bytes = int(max_mb * 1e6)
+        self.cpu_budget = cpu_budget
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._auto_saving = False
+        self._last_auto_save = None
+        self._clear()
+
+    def _clear(self):
+        with self._lock:
+            self._segments = deque()
+            self._nbytes = 0
+            self._frame_count = 0  # video frames (slots) since start
+            self._output_size = None
+            self._encode_cpu = 0.0
+            self._cpu_mark = None  # (wall, capture cpu, encode cpu) at last check
+            self._interval = 1.0 / self.fps
+
+    def start(self, output_path: str = None) -> None:
+        """Start buffering (output_path is unused; see save())."""
+        if self._recording:
+            return
+        self._clear()
+        super().start(os.devnull)
+
+    def _finish(self):
+        pass  # nothing is written unless save() is called
+
+    def mark(self, event: str, **data) -> None:
+        """Record a walkthrough event; only those in the window are kept."""
+        super().mark(event, **data)
+        with self._stats_lock:
+            if not self._events:
+                return
+            cutoff = self._events[-1]["t"] - self.seconds - SEGMENT_SECONDS
+            old = [i for i, e in enumerate(self._events) if e["t"] < cutoff]
+            if old:
+                # Keep the chapter still running at the cutoff
+                chapters = [i for i in old if chapter_title(self._events[i]) is not None]
+                first = chapters[-1] if chapters else old[-1] + 1
+                del self._events[:first]
+
+    def _open_encoder(self, size: tuple[int, int]) -> Encoder:
+        encoder = _RingEncoder(self, size, self.fps, self.profile)
+        with self._lock:
+            self._output_size = encoder.output_size
+        return encoder
+
+    # ── Segments (encoder thread) ────────────────────────────────────────────
+
+    def _segment_for_new_frame(self) -> _Segment:
+        frames_per_segment = max(1, round(SEGMENT_SECONDS * self.fps))
+        if not self._segments or self._frame_count - self._segments[-1].start_frame >= frames_per_segment:
+            self._segments.append(_Segment(self._frame_count))
+        return self._segments[-1]
+
+    def _append(self, jpeg: bytes, cpu: float):
+        with self._lock:
+            segment = self._segment_for_new_frame()
+            segment.frames.append([jpeg, 1])
+            segment.nbytes += len(jpeg)
+            self._nbytes += len(jpeg)
+            self._frame_count += 1
+            self._encode_cpu += cpu
+            self._evict()
+
+    def _extend(self, count: int):
+        with self._lock:
+            if self._segments and self._segments[-1].frames:
+                self._segments[-1].frames[-1][1] += count
+            self._frame_count += count
+            self._evict()
+
+    def _evict(self):
+        """Drop the oldest segments beyond the time or memory cap (lock held)."""
+        keep_from = self._frame_count - self.seconds * self.fps
+        while len(self._segments) > 1 and (
+            self._segments[1].start_frame <= keep_from or self._nbytes > self.max_bytes
+        ):
+            self._nbytes -= self._segments.popleft().nbytes
+
+    # ── CPU budget (capture thread) ──────────────────────────────────────────
+
+    def _frame_interval(self) -> float:
+        """Stretch the capture interval while over the CPU budget."""
+        now, capture_cpu = time.monotonic(), time.thread_time()
+        with self._lock:
+            encode_cpu = self._encode_cpu
+            mark, self._cpu_mark = self._cpu_mark, (now, capture_cpu, encode_cpu)
+            if mark is not None and now > mark[0]:
+                used = (capture_cpu - mark[1] + encode_cpu - mark[2]) / (now - mark[0])
+                # Proportional correction, smoothed over a few captures
+                target = self._interval * max(0.5, min(2.0, used / self.cpu_budget))
+                target = min(MAX_INTERVAL, max(1.0 / self.fps, target))
+                self._interval += (target - self._interval) * 0.3
+            return self._interval
+
+    # ── Saving ───────────────────────────────────────────────────────────────
+
+    def save(
+        self,
+        path: str | None = None,
+        cpu_budget: float | None = None,
+        directory: str | Path | None = None,
+    ) -> str | None:
+        """Write the buffered replay to an MP4 and return its path.
+
+        Args:
+            path: Output file; defaults to a new file in directory (see
+                replay_path()).
+            cpu_budget: Fraction of one core the save may use; it sleeps
+                between frames to stay under it. None saves at full speed.
+            directory: Where the default file goes; REPLAY_DIR if None.
+
+        Returns:
+            The path, or None if nothing is buffered yet.
+        """
+        with self._stats_lock:
+            started = self._stats["capture_started"]
+        with self._lock:
+            runs = [list(run) for segment in self._segments for run in segment.frames]
+            size = self._output_size
+            written = self._frame_count
+        if not runs or size is None:
+            return None
+        # The encoder only learns how long the screen stayed unchanged when
+        # the next change arrives; hold the last frame until now
+        if started is not None and self._recording:
+            held = max(0, round((time.monotonic() - started) * self.fps) - written)
+            runs[-1][1] += held
+            written += held
+        # A long static stretch is one run in an old segment; keep only the
+        # last `seconds` of it
+        excess = sum(count for _, count in runs) - round(self.seconds * self.fps)
+        while excess > 0:
+            if runs[0][1] > excess or len(runs) == 1:
+                runs[0][1] = max(1, runs[0][1] - excess)
+                break
+            excess -= runs.pop(0)[1]
+        frames = sum(count for _, count in runs)
+
+        if path is None:
+            path = str(replay_path(directory or REPLAY_DIR))
+
+        import cv2
+        import numpy as np
+
+        # Frames are already scaled to the profile
+        profile = {**self.profile, "scale": 1.0}
+        with self._save_lock:
+            encoder = open_encoder(path, size, self.fps, profile, self.encoder_preference)
+            bgra = np.empty((size[1], size[0], 4), np.uint8)
+            try:
+                for jpeg, count in runs:
+                    cpu = time.thread_time()
+                    image = cv2.imdecode(np.frombuffer(jpeg, np.uint8), cv2.IMREAD_COLOR)
+                    cv2.cvtColor(image, cv2.COLOR_BGR2BGRA, dst=bgra)
+                    encoder.write(bgra)
+                    if count > 1:
+                        encoder.repeat(bgra, count - 1)
+                    cpu = time.thread_time() - cpu
+                    with self._lock:
+                        # Counted with compression, so capture slows meanwhile
+                        self._encode_cpu += cpu
+                    if cpu_budget:
+                        time.sleep(max(0.0, cpu / cpu_budget - cpu))
+            finally:
+                encoder.close()
+        with self._stats_lock:
+            events = list(self._events)
+        try:
+            write_chapters(path, events, (written - frames) / self.fps, written / self.fps)
+        except OSError as e:
+            warnings.warn(f"Writing replay chapters failed: {e}")
+        if Path(path).parent == REPLAY_DIR:
+            _prune(REPLAY_DIR)
+        return path
+
+    def save_in_background(self, on_saved=None) -> bool:
+        """Save to REPLAY_DIR on a background thread (for automatic saves).
+
+        The save is paced to the CPU budget. It is skipped while another
+        automatic save runs or within AUTO_SAVE_INTERVAL of the last one.
+
+        Args:
+            on_saved: Called with the saved path (or None) when done.
+
+        Returns:
+            Whether a save was started.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if self._auto_saving or (
+                self._last_auto_save is not None and now - self._last_auto_save < AUTO_SAVE_INTERVAL
+            ):
+                return False
+            self._auto_saving = True
+            self._last_auto_save = now
+
+        def work():
+            try:
+                path = self.save(cpu_budget=self.cpu_budget)
+            except Exception as e:
+                warnings.warn(f"Saving replay failed: {e}")
+                return
+            finally:
+                with self._lock:
+                    self._auto_saving = False
+            if on_saved is not None:
+                on_saved(path)
+
+        threading.Thread(target=work, daemon=True).start()
+        return True
+
+    def stats(self) -> dict:
+        """ScreenRecorder.stats() plus buffered "replay_seconds", "replay_mb",
+        "segments" and the current "capture_interval"."""
+        stats = super().stats()
+        with self._lock:
+            buffered = self._frame_count - self._segments[0].start_frame if self._segments else 0
+            stats["replay_seconds"] = round(min(buffered / self.fps, self.seconds), 1)
+            stats["replay_mb"] = round(self._nbytes / 1e6, 2)
+            stats["segments"] = len(self._segments)
+            stats["capture_interval"] = round(self._interval, 3)
+        return stats
+
+
+def replay_path(directory: str | Path) -> Path:
+    """Return a new, empty ``FixMe_Replay_<time>.mp4`` in directory.
+
+    The name has millisecond resolution and a counter if still taken; the
+    file is created (exclusively) so concurrent saves never share it.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
+    n = 1
+    while True:
+        suffix = f"_{n}" if n > 1 else ""
+        path = directory / f"FixMe_Replay_{timestamp}{suffix}.mp4"
+        try:
+            with open(path, "x"):
+                return path
+        except FileExistsError:
+            n += 1
+
+
+def _prune(directory: Path, keep: int = MAX_SAVED_REPLAYS):
+    """Delete all but the newest keep replays, with their chapter indexes."""
+    saved = sorted(directory.glob("FixMe_Replay_*.mp4"), key=lambda p: p.stat().st_mtime)
+    for old in saved[:-keep]:
+        for path in (old, old.with_suffix(".chapters.json"), old.with_suffix(".chapters.vtt")):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                warnings.warn(f"Could not delete old replay {path}: {e}")
+
+
+_replay = None
+_replay_lock = threading.Lock()
+
+
+def get_replay() -> ReplayBuffer:
+    """Return the process-wide replay buffer (not started)."""
+    global _replay
+    with _replay_lock:
+        if _replay is None:
+            _replay = ReplayBuffer()
+        return _replay
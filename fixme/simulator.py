@@ -0,0 +1,481 @@
+"""Headless simulator for timing ConversationFlow walkthroughs.
+
+Run with ``python -m fixme.simulator``. Drives the real ``ConversationFlow``
+against fake TTS, speech input, overlay and command execution backends and
+a stub LLM, each with configurable latency, and a scripted user who answers
+every prompt after a sampled think time. Needs no audio device, display,
+network or API key, so it runs on Linux CI machines.
+
+Time is scaled (``TIME_SCALE``) so a walkthrough that would take a minute
+runs in a few seconds; every figure reported is in simulated seconds.
+For each scenario it prints:
+
+- ``total``: wall time of the walkthrough
+- ``user``: time the user spent thinking and speaking
+- ``speech``: time audio was playing
+- ``waiting``: dead air, when neither the user nor the system was talking
+- ``resolved``: time to resolution, until the last successful fix step ended
+- per-state totals from ``ConversationFlow.timings``
+
+Each scenario is run with the one-consent approval of low-risk steps and
+again asking about every step, so the two can be compared.
+
+``python -m fixme.simulator quick-fixes`` instead walks through every tray
+menu quick fix (``fixes.quick_fix_plan``) and checks that its walkthrough
+events give a chapter index with one chapter per step, as written next to
+recordings; it exits with status 1 if one does not.
+"""
+
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from fixme.answers import AnswerCache
+from fixme.conversation import ConversationFlow
+from fixme.fixes import MAC_FIXES, WIN_FIXES, quick_fix_plan
+
+# Real seconds per simulated second
+TIME_SCALE = 0.02
+# Speaking rate of the synthesized voice and of the simulated user
+TTS_CHARS_PER_SECOND = 15.0
+USER_WORDS_PER_SECOND = 2.5
+
+# Read-only check, reversible Wi-Fi toggle around a WAIT, then an admin step
+DEFAULT_STEPS = [
+    {"description": "check your Wi-Fi adapter status", "command": "netsh wlan show interfaces"},
+    {"description": "turn your Wi-Fi off", "command": "netsh wlan disconnect"},
+    {"description": "wait for the adapter to reset", "command": "WAIT:3"},
+    {"description": "turn your Wi-Fi back on", "command": "netsh wlan connect name={ssid}"},
+    {"description": "clear the DNS cache", "command": "ipconfig /flushdns", "needs_admin": True},
+]
+
+
+class Latencies:
+    """Simulated backend latencies in seconds.
+
+    Args:
+        tts_first_audio: Synthesis before a new phrase can start playing.
+        stt: Recognition after the user stops speaking.
+        execute: Running one fix command.
+        overlay: Drawing one step.
+        llm_first_token: Before the first token of an answer.
+        llm_per_sentence: Between sentences of an answer.
+    """
+
+    def __init__(
+        self,
+        tts_first_audio: float = 0.6,
+        stt: float = 0.4,
+        execute: float = 1.5,
+        overlay: float = 0.02,
+        llm_first_token: float = 1.2,
+        llm_per_sentence: float = 0.5,
+    ):
+        self.tts_first_audio = tts_first_audio
+        self.stt = stt
+        self.execute = execute
+        self.overlay = overlay
+        self.llm_first_token = llm_first_token
+        self.llm_per_sentence = llm_per_sentence
+
+
+class SimClock:
+    """Scaled clock shared by the fakes; records activity intervals."""
+
+    def __init__(self, scale: float = TIME_SCALE):
+        self.scale = scale
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+        self.intervals = {"user": [], "speech": []}
+
+    def now(self) -> float:
+        """Simulated seconds since the clock started."""
+        return (time.perf_counter() - self.started) / self.scale
+
+    def sleep(self, seconds: float) -> None:
+        if seconds > 0:
+            time.sleep(seconds * self.scale)
+
+    def record(self, kind: str, start: float, end: float) -> None:
+        with self._lock:
+            self.intervals[kind].append((start, end))
+
+
+def _covered(intervals: list[tuple[float, float]]) -> float:
+    """Total length of the union of intervals."""
+    total = 0.0
+    end = float("-inf")
+    for s, e in sorted(intervals):
+        if e <= end:
+            continue
+        total += e - max(s, end)
+        end = e
+    return total
+
+
+class _Utterance:
+    def __init__(self):
+        self._done = threading.Event()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        return self._done.wait(timeout)
+
+
+class FakeTTS:
+    """Stands in for fixme.tts: ordered playback, synthesis ahead of playback.
+
+    Synthesis of each phrase starts as soon as it is spoken or presynthesized;
+    phrases already rendered play without synthesis latency.
+    """
+
+    def __init__(self, clock: SimClock, latencies: Latencies):
+        self.clock = clock
+        self.latencies = latencies
+        self.spoken = []
+        self._rendered = {}  # text -> Event set once its audio is ready
+        self._lock = threading.Lock()
+        self._queue_lock = threading.Lock()
+        self._last = None  # Event set when the most recently queued phrase ends
+
+    def _render(self, text: str) -> threading.Event:
+        with self._lock:
+            ready = self._rendered.get(text)
+            if ready is None:
+                ready = self._rendered[text] = threading.Event()
+                threading.Thread(target=self._synthesize, args=(ready,), daemon=True).start()
+            return ready
+
+    def _synthesize(self, ready: threading.Event) -> None:
+        self.clock.sleep(self.latencies.tts_first_audio)
+        ready.set()
+
+    def presynthesize(self, texts: list[str], lang: str = "en"):
+        for text in texts:
+            self._render(text)
+        return _Job()
+
+    def prepare_phrases(self, texts: list[str], lang: str) -> None:
+        pass
+
+    def speak(self, text: str, lang: str = "en", block: bool = True, **_kwargs):
+        self.spoken.append(text)
+        ready = self._render(text)
+        handle = _Utterance()
+        with self._queue_lock:
+            previous, self._last = self._last, handle._done
+        threading.Thread(target=self._play, args=(text, ready, previous, handle), daemon=True).start()
+        if block:
+            handle.wait()
+        return handle
+
+    def _play(self, text, ready, previous, handle) -> None:
+        if previous is not None:
+            previous.wait()
+        ready.wait()
+        start = self.clock.now()
+        self.clock.sleep(len(text) / TTS_CHARS_PER_SECOND)
+        self.clock.record("speech", start, self.clock.now())
+        handle._done.set()
+
+
+class _Job:
+    def cancel(self) -> None:
+        pass
+
+
+class ScriptedUser:
+    """A user who gives scripted answers after a random think time.
+
+    Args:
+        answers: What the user says to each successive step prompt, e.g.
+            ["yes", "is it safe?", "yes", "skip"]. When the script runs out
+            the user says "yes".
+        think: (low, high) seconds of thinking before answering.
+        seed: Seed for the think-time draws.
+        consent: The answer to an offer to approve all low-risk steps.
+    """
+
+    def __init__(
+        self,
+        answers: list[str],
+        think: tuple[float, float] = (0.5, 2.0),
+        seed: int = 0,
+        consent: str = "yes",
+    ):
+        self.think = think
+        self.consent = consent
+        self._rng = random.Random(seed)
+        self._script = iter(answers)
+
+    def next_answer(self, prompt: str = "") -> tuple[str, float, float]:
+        """Return (answer, think seconds, speaking seconds) to the last prompt."""
+        if "without asking" in prompt:
+            answer = self.consent
+        else:
+            answer = next(self._script, "yes")
+        speaking = max(1, len(answer.split())) / USER_WORDS_PER_SECOND
+        return answer, self._rng.uniform(*self.think), speaking
+
+
+class FakeVoiceInput:
+    """Stands in for fixme.voice_input: the scripted user answers listen()."""
+
+    def __init__(self, clock: SimClock, latencies: Latencies, user: ScriptedUser, tts: FakeTTS):
+        self.clock = clock
+        self.latencies = latencies
+        self.user = user
+        self.tts = tts
+        self.heard = []
+
+    def listen(self, mode: str = "open", lang: str = "en", timeout: int = 15, **_kwargs) -> str:
+        prompt = self.tts.spoken[-1] if self.tts.spoken else ""
+        answer, think, speaking = self.user.next_answer(prompt)
+        start = self.clock.now()
+        self.clock.sleep(think + speaking)
+        self.clock.record("user", start, self.clock.now())
+        self.clock.sleep(self.latencies.stt)
+        self.heard.append(answer)
+        return answer
+
+
+class FakeOverlay:
+    """Stands in for fixme.overlay.Overlay."""
+
+    def __init__(self, clock: SimClock, latencies: Latencies):
+        self.clock = clock
+        self.latencies = latencies
+        self.shown = []
+
+    def prepare_step(self, step_num, total_steps, description, ui_highlight=None):
+        pass
+
+    def show_step(self, step_num, total_steps, description, ui_highlight=None):
+        self.clock.sleep(self.latencies.overlay)
+        self.shown.append(step_num)
+
+    def show_success(self, step_num):
+        pass
+
+    def clear_step(self):
+        pass
+
+
+class FakeFixes:
+    """Stands in for fixme.fixes; commands listed in fail always fail."""
+
+    def __init__(self, clock: SimClock, latencies: Latencies, fail: tuple = ()):
+        self.clock = clock
+        self.latencies = latencies
+        self.fail = set(fail)
+        self.executed = []
+
+    def execute(self, command: str, needs_admin: bool = False) -> tuple[bool, str]:
+        self.clock.sleep(self.latencies.execute)
+        self.executed.append(command)
+        if command in self.fail:
+            return False, "Command exited with code 1"
+        return True, ""
+
+
+class StubLLM:
+    """Stands in for anthropic.Anthropic: streams a canned answer."""
+
+    ANSWER = (
+        "This step only resets a network setting. It doesn't touch your files. "
+        "You can carry on using your computer afterwards."
+    )
+
+    def __init__(self, clock: SimClock, latencies: Latencies):
+        self.messages = _StubMessages(clock, latencies, self.ANSWER)
+
+
+class _StubMessages:
+    def __init__(self, clock, latencies, answer):
+        self._clock = clock
+        self._latencies = latencies
+        self._answer = answer
+
+    def stream(self, **_kwargs):
+        return _StubStream(self._clock, self._latencies, self._answer)
+
+
+class _StubStream:
+    def __init__(self, clock, latencies, answer):
+        self._clock = clock
+        self._latencies = latencies
+        self._answer = answer
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    @property
+    def text_stream(self):
+        self._clock.sleep(self._latencies.llm_first_token)
+        for sentence in self._answer.split(". "):
+            yield sentence.rstrip(".") + ". "
+            self._clock.sleep(self._latencies.llm_per_sentence)
+
+
+# Scenario name -> (step answers, think-time range, answer to the low-risk batch offer)
+SCENARIOS = {
+    "decisive": (["yes", "yes", "yes"], (0.3, 0.8), "yes"),
+    "cautious": (
+        ["is it safe?", "yes", "what does that do?", "yes", "why would I do that", "yes"],
+        (1.0, 3.0), "yes",
+    ),
+    "skeptic": (["no", "how long will it take?", "skip", "stop"], (0.5, 2.0), "no"),
+    "mumbler": (["", "uh", "yes", "yeah go ahead", "yes"], (0.5, 1.5), "yes"),
+}
+
+
+def simulate(
+    answers: list[str],
+    think: tuple[float, float] = (0.5, 2.0),
+    steps: list[dict] = DEFAULT_STEPS,
+    latencies: Latencies | None = None,
+    scale: float = TIME_SCALE,
+    seed: int = 0,
+    fail: tuple = (),
+    consent: str = "yes",
+    batch_consent: bool = True,
+    diagnosis: str = "Your computer can't reach the internet",
+) -> dict:
+    """Run one walkthrough against fakes and return its timings.
+
+    Args:
+        answers: The scripted user's answers (see ScriptedUser).
+        think: (low, high) think time per answer in seconds.
+        steps: Fix steps, as returned by diagnose_screenshot().
+        latencies: Backend latencies; defaults to Latencies().
+        scale: Real seconds per simulated second.
+        seed: Seed for think times.
+        fail: Commands that fail when executed.
+        consent: The user's answer to the low-risk batch offer.
+        batch_consent: Offer one consent for all low-risk steps.
+        diagnosis: Diagnosis text the walkthrough opens with.
+
+    Returns:
+        Dict with total, user, speech, waiting and resolved (simulated
+        seconds; resolved is None if no step succeeded), states
+        ({state: total seconds}), spoken, executed and events (as
+        ScreenRecorder.mark() records them, in simulated seconds).
+    """
+    latencies = latencies or Latencies()
+    clock = SimClock(scale)
+    tts = FakeTTS(clock, latencies)
+    voice = FakeVoiceInput(clock, latencies, ScriptedUser(answers, think, seed, consent), tts)
+    fixes = FakeFixes(clock, latencies, fail)
+    events = []
+    with tempfile.TemporaryDirectory() as tmp:
+        flow = ConversationFlow(
+            "en", tts, voice, FakeOverlay(clock, latencies), fixes,
+            client=StubLLM(clock, latencies),
+            answer_cache=AnswerCache(path=Path(tmp) / "answers.json"),
+            batch_consent=batch_consent,
+            on_event=lambda name, **data: events.append({"event": name, "t": clock.now(), **data}),
+        )
+        flow.run_fix({"diagnosis": diagnosis, "steps": steps})
+    total = clock.now()
+
+    active = _covered(clock.intervals["user"] + clock.intervals["speech"])
+    summary = flow.timings.summary()
+    return {
+        "total": total,
+        "user": _covered(clock.intervals["user"]),
+        "speech": _covered(clock.intervals["speech"]),
+        "waiting": max(0.0, total - active),
+        "resolved": (
+            summary["resolved_ms"] / 1000 / scale if summary["resolved_ms"] is not None else None
+        ),
+        "states": {
+            state: entry["total_ms"] / 1000 / scale
+            for state, entry in summary["states"].items()
+        },
+        "spoken": tts.spoken,
+        "executed": fixes.executed,
+        "events": events,
+    }
+
+
+def run_scenario(
+    name: str, runs: int = 3, scale: float = TIME_SCALE, batch_consent: bool = True,
+) -> dict:
+    """Run a scenario from SCENARIOS several times; return mean figures."""
+    answers, think, consent = SCENARIOS[name]
+    results = [
+        simulate(answers, think, scale=scale, seed=i, consent=consent, batch_consent=batch_consent)
+        for i in range(runs)
+    ]
+    states = {}
+    for result in results:
+        for state, seconds in result["states"].items():
+            states.setdefault(state, []).append(seconds)
+    resolved = [r["resolved"] for r in results if r["resolved"] is not None]
+    return {
+        key: statistics.mean(r[key] for r in results)
+        for key in ("total", "user", "speech", "waiting")
+    } | {
+        "resolved": statistics.mean(resolved) if resolved else None,
+        "states": {s: statistics.mean(v) for s, v in states.items()},
+    }
+
+
+def check_quick_fixes(scale: float = TIME_SCALE) -> list[str]:
+    """Walk through every quick fix, approving each step; return the problems found.
+
+    Each walkthrough must give a chapter index with the diagnosis, one
+    chapter per step and the summary.
+    """
+    from fixme.recorder import write_chapters
+
+    problems = []
+    for platform, table in (("mac", MAC_FIXES), ("win", WIN_FIXES)):
+        for fix_id, fix in table.items():
+            plan = quick_fix_plan(fix, "HomeWiFi")
+            result = simulate(["yes"] * len(plan["steps"]), (0.2, 0.5), steps=plan["steps"],
+                              scale=scale, diagnosis=plan["diagnosis"])
+            with tempfile.TemporaryDirectory() as tmp:
+                index = write_chapters(os.path.join(tmp, "quick_fix.mp4"), result["events"],
+                                       0.0, result["total"])
+                chapters = []
+                if index is not None:
+                    with open(index, encoding="utf-8") as f:
+                        chapters = json.load(f)["chapters"]
+            expected = len(plan["steps"]) + 2
+            if len(chapters) != expected:
+                problems.append(f"{platform}/{fix_id}: {len(chapters)} chapters, expected {expected}")
+    return problems
+
+
+def main(argv: list[str] | None = None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == "quick-fixes":
+        problems = check_quick_fixes()
+        for problem in problems:
+            print(problem)
+        print(f"quick fixes: {len(MAC_FIXES) + len(WIN_FIXES)} walked through, {len(problems)} problems")
+        sys.exit(1 if problems else 0)
+    names = [a for a in argv if a in SCENARIOS] or list(SCENARIOS)
+    print(f"{'scenario':<21} {'total':>7} {'user':>7} {'speech':>7} {'waiting':>8} {'resolved':>9}"
+          "   (simulated seconds)")
+    for name in names:
+        for batch_consent, label in ((True, "batch"), (False, "ask each")):
+            report = run_scenario(name, batch_consent=batch_consent)
+            resolved = f"{report['resolved']:9.1f}" if report["resolved"] is not None else f"{'-':>9}"
+            print(f"{f'{name} ({label})':<21} {report['total']:7.1f} {report['user']:7.1f} "
+                  f"{report['speech']:7.1f} {report['waiting']:8.1f} {resolved}")
+            by_time = sorted(report["states"].items(), key=lambda kv: kv[1], reverse=True)
+            print(" " * 22 + ", ".join(f"{state} {seconds:.1f}" for state, seconds in by_time))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,327 @@
+"""Pluggable speech recognition backends.
+
+Every backend transcribes 16-bit mono PCM that has already been captured
+(see ``fixme.audio_capture``). ``SpeechRecognizer`` tries backends in
+preference order: the offline Vosk engine first, so short answers such as
+"yes", "no" and "skip" are recognized locally without a network round-trip,
+then Google's web recognizer for languages without a local model or when
+Vosk is not installed.
+"""
+
+import io
+import json
+import os
+import threading
+import time
+import warnings
+import wave
+from pathlib import Path
+
+# Recognizer language tags for the UI languages (see translate.LANG_NAMES)
+LANG_MAP = {
+    "en": "en-US", "es": "es-ES", "pa": "pa-IN",
+    "hi": "hi-IN", "fr": "fr-FR",
+}
+
+# Directory holding unpacked Vosk models, one per language
+VOSK_MODEL_DIR = Path(os.environ.get("FIXME_VOSK_MODELS", Path.home() / ".fixme" / "vosk"))
+# Small (~50 MB) CPU models from https://alphacephei.com/vosk/models.
+# Punjabi has no Vosk model and always goes to the next backend.
+VOSK_MODELS = {
+    "en": "vosk-model-small-en-us-0.15",
+    "es": "vosk-model-small-es-0.42",
+    "hi": "vosk-model-small-hi-0.22",
+    "fr": "vosk-model-small-fr-0.22",
+}
+
+
+class STTBackend:
+    """Interface for speech recognition engines."""
+
+    name = "base"
+    offline = False  # runs without a network connection
+
+    def available(self, lang: str) -> bool:
+        """Whether the engine can transcribe lang right now."""
+        raise NotImplementedError
+
+    def transcribe(self, pcm: bytes, sample_rate: int, lang: str) -> str:
+        """Return the transcript of 16-bit mono PCM ("" if nothing was understood).
+
+        Raises:
+            Exception: If the engine failed, so the next backend is tried.
+        """
+        raise NotImplementedError
+
+    def warm(self, lang: str) -> None:
+        """Load whatever transcribing lang needs ahead of time."""
+
+    def open_stream(self, lang: str, sample_rate: int):
+        """Return an incremental decoder for lang, or None if unsupported.
+
+        The decoder has accept(pcm) -> partial transcript so far, and
+        final() -> complete transcript.
+        """
+        return None
+
+
+class VoskBackend(STTBackend):
+    """Offline recognition with Vosk; models are loaded once and kept in memory."""
+
+    name = "vosk"
+    offline = True
+
+    def __init__(self, model_dir: Path = VOSK_MODEL_DIR, models: dict = VOSK_MODELS):
+        self.model_dir = Path(model_dir)
+        self.models = models
+        self._loaded = {}
+        self._lock = threading.Lock()
+
+    def _model_path(self, lang: str) -> Path | None:
+        name = self.models.get(lang)
+        if name is None:
+            return None
+        path = self.model_dir / name
+        return path if path.is_dir() else None
+
+    def available(self, lang: str) -> bool:
+        if lang in self._loaded:
+            return True
+        try:
+            import vosk  # noqa: F401
+        except ImportError:
+            return False
+        return self._model_path(lang) is not None
+
+    def _get_model(self, lang: str):
+        with self._lock:
+            if lang not in self._loaded:
+                import vosk
+                vosk.SetLogLevel(-1)
+                self._loaded[lang] = vosk.Model(str(self._model_path(lang)))
+            return self._loaded[lang]
+
+    def warm(self, lang: str) -> None:
+        if self.available(lang):
+            self._get_model(lang)
+
+    def transcribe(self, pcm: bytes, sample_rate: int, lang: str) -> str:
+        stream = self.open_stream(lang, sample_rate)
+        stream.accept(pcm)
+        return stream.final()
+
+    def open_stream(self, lang: str, sample_rate: int):
+        from vosk import KaldiRecognizer
+
+        return _VoskStream(KaldiRecognizer(self._get_model(lang), sample_rate))
+
+
+class _VoskStream:
+    """Incremental Vosk decoding; text of completed segments is kept."""
+
+    def __init__(self, recognizer):
+        self._recognizer = recognizer
+        self._segments = []
+
+    def _text(self, result: str, key: str) -> str:
+        return json.loads(result).get(key, "").strip()
+
+    def accept(self, pcm: bytes) -> str:
+        if self._recognizer.AcceptWaveform(pcm):
+            segment = self._text(self._recognizer.Result(), "text")
+            if segment:
+                self._segments.append(segment)
+            current = ""
+        else:
+            current = self._text(self._recognizer.PartialResult(), "partial")
+        return " ".join(self._segments + ([current] if current else []))
+
+    def final(self) -> str:
+        segment = self._text(self._recognizer.FinalResult(), "text")
+        return " ".join(self._segments + ([segment] if segment else []))
+
+
+class GoogleBackend(STTBackend):
+    """Google's web speech API via the speech_recognition package."""
+
+    name = "google"
+
+    def available(self, lang: str) -> bool:
+        try:
+            import speech_recognition  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def transcribe(self, pcm: bytes, sample_rate: int, lang: str) -> str:
+        import speech_recognition as sr
+
+        wav_buffer = io.BytesIO()
+        with wave.open(wav_buffer, "wb") as wf:
+            wf.setnchannels(1)
+            wf.setsampwidth(2)
+            wf.setframerate(sample_rate)
+            wf.writeframes(pcm)
+        wav_buffer.seek(0)
+
+        recognizer = sr.Recognizer()
+        with sr.AudioFile(wav_buffer) as source:
+            audio = recognizer.record(source)
+        try:
+            return recognizer.recognize_google(audio, language=LANG_MAP.get(lang, "en-US"))
+        except sr.UnknownValueError:
+            return ""
+        except sr.RequestError as e:
+            raise ConnectionError(f"Speech recognition service error: {e}") from e
+
+
+class SpeechRecognizer:
+    """Transcribes with the first backend that supports the language.
+
+    Args:
+        backends: Backends in preference order. A backend that raises is
+            skipped for that request and the next one is tried.
+    """
+
+    def __init__(self, backends: list[STTBackend]):
+        self.backends = backends
+
+    def candidates(self, lang: str, offline_only: bool = False) -> list[STTBackend]:
+        """Backends able to handle lang, in preference order."""
+        return [
+            b for b in self.backends
+            if b.available(lang) and (b.offline or not offline_only)
+        ]
+
+    def open_stream(self, lang: str, sample_rate: int, offline_only: bool = False):
+        """Start incremental recognition with the first backend that streams.
+
+        Returns:
+            A RecognitionStream, or None if no available backend can stream.
+        """
+        for backend in self.candidates(lang, offline_only):
+            try:
+                stream = backend.open_stream(lang, sample_rate)
+            except Exception as e:
+                warnings.warn(f"{backend.name} streaming unavailable: {e}")
+                continue
+            if stream is not None:
+                return RecognitionStream(backend.name, stream)
+        return None
+
+    def warm(self, lang: str) -> None:
+        """Preload the preferred backend for lang on a background thread."""
+        candidates = self.candidates(lang)
+        if candidates:
+            threading.Thread(target=_warm, args=(candidates[0], lang), daemon=True).start()
+
+    def transcribe(
+        self,
+        pcm: bytes,
+        sample_rate: int,
+        lang: str,
+        offline_only: bool = False,
+        exclude: tuple = (),
+    ) -> dict:
+        """Transcribe 16-bit mono PCM.
+
+        Args:
+            pcm: 16-bit mono samples.
+            sample_rate: Sample rate of pcm.
+            lang: Language code from LANG_MAP.
+            offline_only: Only use backends that run locally.
+            exclude: Names of backends to skip (e.g. one that already tried).
+
+        Returns:
+            Dict with "text" ("" if nothing was understood), "backend" (the
+            name that answered, or None) and "elapsed_ms". If every backend
+            failed, "error" holds the last failure.
+        """
+        started = time.perf_counter()
+        last_error = None
+        for backend in self.candidates(lang, offline_only):
+            if backend.name in exclude:
+                continue
+            try:
+                text = backend.transcribe(pcm, sample_rate, lang)
+            except Exception as e:
+                warnings.warn(f"{backend.name} recognition failed: {e}")
+                last_error = e
+                continue
+            return {
+                "text": text,
+                "backend": backend.name,
+                "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+            }
+        return {
+            "text": "",
+            "backend": None,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+            "error": str(last_error) if last_error else "No speech recognizer available",
+        }
+
+
+class RecognitionStream:
+    """A backend's incremental decoder, with timing and error handling.
+
+    Attributes:
+        backend: Name of the backend doing the decoding.
+        failed: True once the decoder has raised; later audio is ignored.
+    """
+
+    def __init__(self, backend: str, stream):
+        self.backend = backend
+        self.failed = False
+        self._stream = stream
+
+    def accept(self, pcm: bytes) -> str:
+        """Decode more audio and return the partial transcript so far."""
+        if self.failed:
+            return ""
+        try:
+            return self._stream.accept(pcm)
+        except Exception as e:
+            warnings.warn(f"{self.backend} streaming recognition failed: {e}")
+            self.failed = True
+            return ""
+
+    def finish(self) -> dict:
+        """Flush the decoder.
+
+        Returns:
+            Same shape as SpeechRecognizer.transcribe(); elapsed_ms is the
+            time spent finishing, i.e. the latency after capture ended.
+        """
+        started = time.perf_counter()
+        text = ""
+        if not self.failed:
+            try:
+                text = self._stream.final()
+            except Exception as e:
+                warnings.warn(f"{self.backend} streaming recognition failed: {e}")
+                self.failed = True
+        return {
+            "text": text,
+            "backend": self.backend,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+
+
+def _warm(backend: STTBackend, lang: str):
+    try:
+        backend.warm(lang)
+    except Exception as e:
+        warnings.warn(f"Could not load {backend.name} model for {lang}: {e}")
+
+
+_recognizer = None
+_recognizer_lock = threading.Lock()
+
+
+def get_recognizer() -> SpeechRecognizer:
+    """Return the process-wide recognizer (offline first, then Google)."""
+    global _recognizer
+    with _recognizer_lock:
+        if _recognizer is None:
+            _recognizer = SpeechRecognizer([VoskBackend(), GoogleBackend()])
+        return _recognizer
@@ -0,0 +1,211 @@
+"""Claude-backed translation with a persistent translation memory.
+
+Every (source text, target language) pair is translated at most once; results
+are kept in memory and persisted to ``~/.fixme/translations.json``. Whole fix
+plans can be translated in a single batched request via ``translate_batch``.
+"""
+
+import json
+import os
+import threading
+import warnings
+from collections import OrderedDict
+from pathlib import Path
+
+import anthropic
+
+TRANSLATE_MODEL = "claude-sonnet-4-20250514"
+MEMORY_PATH = Path.home() / ".fixme" / "translations.json"
+# Translations kept per language; least recently used ones are dropped
+MAX_TRANSLATIONS = 1000
+
+# Languages offered by the UI (Sidebar.LANGS and the desktop app)
+LANG_NAMES = {
+    "en": "English",
+    "es": "Spanish",
+    "pa": "Punjabi",
+    "hi": "Hindi",
+    "fr": "French",
+}
+
+
+class TranslationMemory:
+    """Thread-safe (source text, lang) -> translation LRU store backed by a JSON file.
+
+    One-off strings (command output, answers) are translated too, so each
+    language keeps at most max_entries translations, least recently used
+    dropped first.
+    """
+
+    def __init__(self, path: Path = MEMORY_PATH, max_entries: int = MAX_TRANSLATIONS):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._data = self._load()  # lang -> OrderedDict, least recently used first
+
+    def _load(self) -> dict:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict):
+            return {}
+        return {lang: OrderedDict(pairs) for lang, pairs in data.items() if isinstance(pairs, dict)}
+
+    def _save(self):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(self._data, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp, self.path)
+        except OSError as e:
+            warnings.warn(f"Could not save translation memory: {e}")
+
+    def get(self, text: str, lang: str) -> str | None:
+        with self._lock:
+            pairs = self._data.get(lang)
+            if pairs is None or text not in pairs:
+                return None
+            pairs.move_to_end(text)
+            return pairs[text]
+
+    def put_many(self, pairs: dict, lang: str) -> None:
+        """Store {source: translation} pairs for lang and persist once."""
+        if not pairs:
+            return
+        with self._lock:
+            stored = self._data.setdefault(lang, OrderedDict())
+            for text, translation in pairs.items():
+                stored.pop(text, None)
+                stored[text] = translation
+            while len(stored) > self.max_entries:
+                stored.popitem(last=False)
+            self._save()
+
+
+_memory = None
+
+
+def _get_memory() -> TranslationMemory:
+    global _memory
+    if _memory is None:
+        _memory = TranslationMemory()
+    return _memory
+
+
+def _get_client():
+    api_key = os.environ.get("ANTHROPIC_API_KEY")
+    if not api_key:
+        warnings.warn("ANTHROPIC_API_KEY not set, returning original text")
+        return None
+    return anthropic.Anthropic(api_key=api_key)
+
+
+def translate(text: str, lang: str) -> str:
+    """Translate English text into lang, consulting the translation memory first.
+
+    Args:
+        text: English text to translate.
+        lang: Target language code from LANG_NAMES.
+
+    Returns:
+        The translation, or the original text for English, unknown languages
+        or when translation fails.
+    """
+    return translate_batch([text], lang)[0]
+
+
+def translate_batch(texts: list[str], lang: str) -> list[str]:
+    """Translate several strings into lang with at most one Claude request.
+
+    Strings already in the translation memory are not sent again.
+
+    Args:
+        texts: English strings to translate.
+        lang: Target language code from LANG_NAMES.
+
+    Returns:
+        Translations in the same order as texts. Strings that could not be
+        translated are returned unchanged.
+    """
+    if lang == "en" or lang not in LANG_NAMES:
+        return list(texts)
+
+    memory = _get_memory()
+    results = [memory.get(t, lang) for t in texts]
+    missing = list(dict.fromkeys(
+        t for t, r in zip(texts, results) if r is None and t.strip()
+    ))
+    if not missing:
+        return [r if r is not None else t for t, r in zip(texts, results)]
+
+    translated = _request_translations(missing, lang)
+    if translated:
+        memory.put_many(translated, lang)
+
+    return [
+        r if r is not None else translated.get(t, t)
+        for t, r in zip(texts, results)
+    ]
+
+
+def _parse_json_array(reply: str):
+    """Parse the JSON array in a model reply, ignoring code fences or prose around it.
+
+    >>> _parse_json_array('```json\\n["Hola", "Adiós"]\\n```')
+    ['Hola', 'Adiós']
+    >>> _parse_json_array('["Bonjour"]')
+    ['Bonjour']
+
+    Raises:
+        ValueError: If the reply contains no JSON array.
+    """
+    start, end = reply.find("["), reply.rfind("]")
+    if start == -1 or end < start:
+        raise ValueError(f"No JSON array in reply: {reply[:200]!r}")
+    return json.loads(reply[start:end + 1])
+
+
+def _request_translations(texts: list[str], lang: str) -> dict:
+    """Ask Claude to translate texts into lang in one request.
+
+    Returns:
+        Dict mapping each successfully translated source string to its
+        translation (empty on failure).
+    """
+    client = _get_client()
+    if client is None:
+        return {}
+
+    name = LANG_NAMES[lang]
+    try:
+        message = client.messages.create(
+            model=TRANSLATE_MODEL,
+            max_tokens=min(8192, 256 + 128 * len(texts)),
+            messages=[
+                {
+                    "role": "user",
+                    "content": (
+                        f"Translate each string in the following JSON array to natural {name}. "
+                        "Keep numbers, commands and product names unchanged. "
+                        "Return only a JSON array of the translations, in the same order "
+                        "and with the same length, nothing else:\n\n"
+                        f"{json.dumps(texts, ensure_ascii=False)}"
+                    ),
+                }
+            ],
+        )
+        translations = _parse_json_array(message.content[0].text)
+    except Exception as e:
+        warnings.warn(f"Translation failed, using English: {e}")
+        return {}
+
+    if not isinstance(translations, list) or len(translations) != len(texts):
+        warnings.warn("Translation response did not match the request, using English")
+        return {}
+
+    return {
+        src: str(dst).strip()
+        for src, dst in zip(texts, translations)
+        if isinstance(dst, str) and dst.strip()
+    }
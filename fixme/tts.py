@@ -1,21 +1,65 @@
-"""Bilingual text-to-speech using ElevenLabs API with Spanish translation via Claude."""
+"""Multilingual text-to-speech using ElevenLabs API with translation via Claude.
 
-import os
-import tempfile
-import warnings
+Falls back to a local offline engine when ElevenLabs is unconfigured, slow
+or unreachable (see fixme.tts_backends).
+"""
 
-import anthropic
+import sys
+import threading
+import time
+import warnings
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
 
-try:
-    from elevenlabs import ElevenLabs
-except ImportError:
-    ElevenLabs = None
+from fixme.audio_cache import AudioCache, cache_key
+from fixme.playback import PRIORITY_NORMAL, get_player
+from fixme.translate import LANG_NAMES, translate, translate_batch
+from fixme.tts_backends import SAMPLE_RATE, ElevenLabsBackend, LocalBackend, TTSRouter
 
 # Configurable voice IDs — update these with your preferred ElevenLabs voices
 ENGLISH_VOICE_ID = "21m00Tcm4TlvDq8ikWAM"  # "Rachel" - default English voice
 SPANISH_VOICE_ID = "ThT5KcBeYPX3keUQqHPh"  # "Dorothy" - works well for Spanish
 
-TRANSLATE_MODEL = "claude-sonnet-4-20250514"
+# The multilingual model speaks every UI language; languages without a
+# dedicated voice use the default one.
+VOICE_IDS = {
+    "en": ENGLISH_VOICE_ID,
+    "es": SPANISH_VOICE_ID,
+}
+
+TTS_MODEL_ID = "eleven_multilingual_v2"
+
+# Raw PCM can be played chunk by chunk as it streams in, unlike MP3
+OUTPUT_FORMAT = "pcm_22050"
+
+# Parallel ElevenLabs requests used when pre-rendering a fix plan
+MAX_PRESYNTH_WORKERS = 3
+# How long speak() waits for an in-flight pre-render before synthesizing itself
+PRESYNTH_WAIT_SECONDS = 15
+
+_cache = None
+_router = None
+_metrics = deque(maxlen=100)
+_inflight = {}  # cache key -> Future of a background render
+_inflight_lock = threading.Lock()
+
+
+def _get_cache() -> AudioCache:
+    """Return the shared on-disk audio cache, creating it on first use."""
+    global _cache
+    if _cache is None:
+        _cache = AudioCache()
+    return _cache
+
+
+def cache_stats() -> dict:
+    """Return hit/miss counters and size of the TTS audio cache."""
+    return _get_cache().stats()
+
+
+def voice_for(lang: str) -> str:
+    """Return the ElevenLabs voice ID for a language code."""
+    return VOICE_IDS.get(lang, ENGLISH_VOICE_ID)
 
 
 def translate_to_spanish(text: str) -> str:
@@ -27,83 +71,279 @@ def translate_to_spanish(text: str) -> str:
     Returns:
         Translated Spanish text.
     """
-    api_key = os.environ.get("ANTHROPIC_API_KEY")
-    if not api_key:
-        warnings.warn("ANTHROPIC_API_KEY not set, returning original text")
-        return text
+    return translate(text, "es")
+
+
+def prepare_phrases(texts: list[str], lang: str) -> None:
+    """Warm the translation memory for phrases that are about to be spoken.
+
+    All untranslated phrases go to Claude in one batched request, so the
+    later speak() calls for them need no translation round-trip.
+
+    Args:
+        texts: English phrases, e.g. every prompt of a fix walkthrough.
+        lang: Target language code.
+    """
+    if lang != "en" and lang in LANG_NAMES:
+        translate_batch(texts, lang)
+
+
+def _key_for(text: str, lang: str) -> str:
+    return cache_key(text, voice_for(lang), TTS_MODEL_ID, lang, OUTPUT_FORMAT)
+
+
+def _get_router() -> TTSRouter:
+    """Return the shared router: ElevenLabs first, local offline engine as fallback."""
+    global _router
+    if _router is None:
+        _router = TTSRouter([
+            ElevenLabsBackend(voice_for, TTS_MODEL_ID, OUTPUT_FORMAT),
+            LocalBackend(),
+        ])
+    return _router
+
+
+def backend_stats() -> dict:
+    """Return rolling latency, error rate and health for each TTS backend."""
+    return _get_router().stats()
+
+
+def recent_metrics() -> list[dict]:
+    """Return timing metrics for the most recent utterances, oldest first.
+
+    Each entry has "chars", "cached", "backend", "ttfa_ms" (speak() call to first audio
+    sent to the output device), "synthesis_ms" (speak() call to last audio
+    chunk received) and "interrupted".
+    """
+    return list(_metrics)
+
 
+def synthesize(text: str, lang: str = "en", cancelled: threading.Event | None = None) -> bytes | None:
+    """Render text to PCM audio and store it in the cache without playing it.
+
+    Args:
+        text: The text to render.
+        lang: Language code from translate.LANG_NAMES.
+        cancelled: Optional event; rendering stops and nothing is cached once
+            it is set.
+
+    Returns:
+        The PCM bytes, or None if the remote engine is unavailable or
+        unhealthy, or rendering was cancelled. The local engine is fast
+        enough to run on demand, so nothing is pre-rendered with it.
+    """
+    remote = _get_router().backends[0]
+    if not _get_router().healthy(remote):
+        return None
+
+    key = _key_for(text, lang)
+    speak_text = translate(text, lang)
+    chunks = []
+    started = time.monotonic()
+    first_chunk = None
     try:
-        client = anthropic.Anthropic(api_key=api_key)
-        message = client.messages.create(
-            model=TRANSLATE_MODEL,
-            max_tokens=1024,
-            messages=[
-                {
-                    "role": "user",
-                    "content": (
-                        "Translate the following text to natural Spanish. "
-                        "Return only the translation, nothing else:\n\n"
-                        f"{text}"
-                    ),
-                }
-            ],
-        )
-        return message.content[0].text.strip()
-    except Exception as e:
-        warnings.warn(f"Translation failed, using English: {e}")
-        return text
-
-
-def speak(text: str, lang: str = "en") -> None:
-    """Convert text to speech and play it.
+        for chunk in remote.stream(speak_text, lang):
+            if cancelled is not None and cancelled.is_set():
+                return None
+            if first_chunk is None and chunk:
+                first_chunk = time.monotonic() - started
+            chunks.append(chunk)
+        if first_chunk is None:
+            raise RuntimeError(f"{remote.name} returned no audio")
+    except Exception:
+        _get_router().record(remote.name, None, ok=False)
+        raise
+    # Pre-renders count toward the router's latency ranking like live requests
+    _get_router().record(remote.name, first_chunk, ok=True)
+
+    audio = b"".join(chunks)
+    if lang == "en" or speak_text != text:
+        _get_cache().put(key, audio)
+    return audio
+
 
-    For Spanish, translates the text first via Claude, then uses ElevenLabs
-    with a Spanish voice.
+class PreSynthesisJob:
+    """Renders a batch of phrases into the audio cache in the background.
+
+    Phrases are submitted in order to a bounded thread pool; ones already
+    cached or already being rendered are skipped. speak() waits for an
+    in-flight render of its text instead of requesting it a second time.
+    """
+
+    def __init__(self, texts: list[str], lang: str, max_workers: int = MAX_PRESYNTH_WORKERS):
+        self.lang = lang
+        self._cancelled = threading.Event()
+        self._futures = []
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tts-presynth")
+        cache = _get_cache()
+        for text in dict.fromkeys(texts):
+            key = _key_for(text, lang)
+            with _inflight_lock:
+                if key in _inflight or key in cache:
+                    continue
+                future = executor.submit(self._render, text)
+                _inflight[key] = future
+            future.add_done_callback(lambda f, k=key: _forget_inflight(k, f))
+            self._futures.append(future)
+        executor.shutdown(wait=False)
+
+    def _render(self, text: str) -> bytes | None:
+        if self._cancelled.is_set():
+            return None
+        try:
+            return synthesize(text, self.lang, self._cancelled)
+        except Exception as e:
+            warnings.warn(f"Pre-synthesis failed for {text[:40]!r}: {e}")
+            return None
+
+    def cancel(self) -> None:
+        """Stop rendering: queued phrases are dropped, running ones discarded."""
+        self._cancelled.set()
+        for future in self._futures:
+            future.cancel()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Block until every phrase is rendered; return True if all finished."""
+        _done, not_done = wait(self._futures, timeout=timeout)
+        return not not_done
+
+
+def _forget_inflight(key: str, future) -> None:
+    with _inflight_lock:
+        if _inflight.get(key) is future:
+            del _inflight[key]
+
+
+def presynthesize(texts: list[str], lang: str = "en", max_workers: int = MAX_PRESYNTH_WORKERS) -> PreSynthesisJob:
+    """Start rendering phrases in the background so later speak() calls hit the cache.
 
     Args:
-        text: The text to speak.
-        lang: Language code - "en" for English, "es" for Spanish.
+        texts: Phrases to render, in the order they will likely be spoken.
+        lang: Language code from translate.LANG_NAMES.
+        max_workers: Maximum concurrent ElevenLabs requests.
+
+    Returns:
+        A PreSynthesisJob that can be cancelled if the plan is aborted.
     """
-    if ElevenLabs is None:
-        print(f"[TTS] ({lang}): {text}")
+    return PreSynthesisJob(texts, lang, max_workers)
+
+
+def _utterance_source(text: str, lang: str, info: dict):
+    """Yield PCM chunks for text, from the cache or streamed from ElevenLabs.
+
+    Runs lazily on the playback engine's reader thread, so translation and
+    synthesis never block the caller of speak(). Streamed audio is cached
+    once it has been received completely.
+    """
+    key = _key_for(text, lang)
+    cache = _get_cache()
+
+    # A background pre-render of this phrase is usually nearly done
+    with _inflight_lock:
+        pending = _inflight.get(key)
+    if pending is not None:
+        try:
+            pending.result(timeout=PRESYNTH_WAIT_SECONDS)
+        except Exception:
+            pass
+
+    cached = cache.get(key)
+    if cached is not None:
+        info["cached"] = True
+        yield cached
         return
 
-    api_key = os.environ.get("ELEVENLABS_API_KEY")
-    if not api_key:
-        print(f"[TTS] ({lang}): {text}")
+    router = _get_router()
+    if not router.candidates():
+        _print_fallback(text, lang)
         return
 
-    # Translate if Spanish
-    speak_text = text
-    if lang == "es":
-        speak_text = translate_to_spanish(text)
+    # Translate non-English text (served from the translation memory if known)
+    speak_text = translate(text, lang)
+    info["cached"] = False
+    received = []
+    for chunk in router.stream(speak_text, lang, info):
+        received.append(chunk)
+        yield chunk
 
-    voice_id = SPANISH_VOICE_ID if lang == "es" else ENGLISH_VOICE_ID
+    # Only cache ElevenLabs audio of real translations (a failed translation
+    # returns the English text); local audio is cheap to regenerate
+    if info.get("backend") == ElevenLabsBackend.name and (lang == "en" or speak_text != text):
+        cache.put(key, b"".join(received))
 
-    try:
-        client = ElevenLabs(api_key=api_key)
-        audio_generator = client.text_to_speech.convert(
-            voice_id=voice_id,
-            text=speak_text,
-            model_id="eleven_multilingual_v2",
-        )
-
-        # Collect audio bytes from generator
-        audio_bytes = b"".join(audio_generator)
-
-        # Save to temp file and play
-        tmp = tempfile.NamedTemporaryFile(suffix=".mp3", delete=False)
-        tmp.write(audio_bytes)
-        tmp.close()
-
-        # Play audio
-        try:
-            os.startfile(tmp.name)  # Windows
-        except AttributeError:
-            # Fallback for non-Windows (e.g., macOS during development)
-            import subprocess
-            subprocess.Popen(["open", tmp.name])
-
-    except Exception as e:
-        warnings.warn(f"TTS failed, printing instead: {e}")
-        print(f"[TTS] ({lang}): {speak_text}")
+
+def _print_fallback(text: str, lang: str) -> None:
+    # stderr: under the sidecar, stdout is the JSON-RPC channel and this
+    # runs on playback threads
+    print(f"[TTS] ({lang}): {text}", file=sys.stderr, flush=True)
+
+
+def _on_spoken(text: str, lang: str, handle) -> None:
+    """Record timing metrics for a finished utterance and report failures."""
+    if handle.error is not None:
+        warnings.warn(f"TTS failed, printing instead: {handle.error}")
+        _print_fallback(text, lang)
+    if "cached" not in handle.info:
+        return  # nothing was synthesized (TTS unavailable)
+    _metrics.append({
+        "chars": len(text),
+        "cached": handle.info["cached"],
+        "backend": handle.info.get("backend"),
+        "ttfa_ms": (
+            round((handle.first_audio_at - handle.queued_at) * 1000, 1)
+            if handle.first_audio_at else None
+        ),
+        "synthesis_ms": (
+            round((handle.source_done_at - handle.queued_at) * 1000, 1)
+            if handle.source_done_at else None
+        ),
+        "interrupted": handle.interrupted,
+    })
+
+
+def speak(
+    text: str,
+    lang: str = "en",
+    priority: int = PRIORITY_NORMAL,
+    interrupt: bool = False,
+    block: bool = True,
+):
+    """Convert text to speech and play it.
+
+    For languages other than English, translates the text first via Claude
+    (see fixme.translate), then uses ElevenLabs' multilingual model. Audio
+    is requested as raw PCM and queued on the shared playback engine
+    (fixme.playback), which plays utterances in order from memory and starts
+    as soon as the first chunk arrives. Audio is cached on disk keyed by the
+    source text, voice, model and language, so repeated phrases skip both
+    the translation and the ElevenLabs call.
+
+    Args:
+        text: The text to speak.
+        lang: Language code from translate.LANG_NAMES ("en", "es", "pa",
+            "hi" or "fr").
+        priority: playback.PRIORITY_HIGH, PRIORITY_NORMAL or PRIORITY_LOW.
+        interrupt: Barge in on current and queued speech of the same or
+            lower priority.
+        block: Wait until the utterance has finished playing.
+
+    Returns:
+        The PlaybackHandle; wait() on it to learn when the audio ended.
+    """
+    info = {}
+    handle = get_player().play(
+        _utterance_source(text, lang, info),
+        priority=priority,
+        interrupt=interrupt,
+        sample_rate=SAMPLE_RATE,
+    )
+    handle.info = info
+    handle.add_done_callback(lambda h: _on_spoken(text, lang, h))
+    if block:
+        handle.wait()
+    return handle
+
+
+def stop() -> None:
+    """Interrupt current speech and drop everything queued."""
+    get_player().stop_all()
@@ -0,0 +1,358 @@
+"""Pluggable TTS backends and a latency-aware router between them.
+
+Every backend yields raw 16-bit mono PCM at ``SAMPLE_RATE`` so the playback
+engine can play any of them. The router prefers the first healthy backend
+(ElevenLabs) and falls back to the next one (a local offline engine) when the
+remote's rolling p95 time-to-first-audio exceeds the budget, its error rate
+is too high, or it fails or stalls on the current request.
+"""
+
+import io
+import os
+import queue
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import wave
+from collections import deque
+
+SAMPLE_RATE = 22050
+
+# Remote p95 time-to-first-audio above this (seconds) routes to the local engine
+LATENCY_BUDGET = 2.5
+MAX_ERROR_RATE = 0.3
+# Give up on a request whose first chunk hasn't arrived after this long
+FIRST_CHUNK_TIMEOUT = 4.0
+# Local engines render the whole utterance before the first chunk (and
+# their subprocesses time out after 30 s)
+LOCAL_FIRST_CHUNK_TIMEOUT = 35.0
+STATS_WINDOW = 20
+MIN_SAMPLES = 3
+# How long an unhealthy backend is skipped before it is probed again
+RETRY_AFTER = 30.0
+
+ESPEAK_VOICES = {"en": "en-us", "es": "es", "pa": "pa", "hi": "hi", "fr": "fr"}
+
+
+class TTSBackend:
+    """Interface for speech synthesis engines."""
+
+    name = "base"
+    # Stall limit for this engine; None uses the router's first_chunk_timeout
+    first_chunk_timeout = None
+
+    def available(self) -> bool:
+        """Whether the engine can be used at all (installed, configured)."""
+        raise NotImplementedError
+
+    def stream(self, text: str, lang: str):
+        """Yield PCM chunks (16-bit mono, SAMPLE_RATE) for already-translated text."""
+        raise NotImplementedError
+
+
+class ElevenLabsBackend(TTSBackend):
+    """Remote ElevenLabs synthesis, streamed as raw PCM."""
+
+    name = "elevenlabs"
+
+    def __init__(self, voice_for, model_id: str, output_format: str = "pcm_22050"):
+        self._voice_for = voice_for
+        self.model_id = model_id
+        self.output_format = output_format
+        self._client = None
+
+    def available(self) -> bool:
+        try:
+            import elevenlabs  # noqa: F401
+        except ImportError:
+            return False
+        return bool(os.environ.get("ELEVENLABS_API_KEY"))
+
+    def _get_client(self):
+        # Shared so its HTTP connection is reused between utterances
+        if self._client is None:
+            from elevenlabs import ElevenLabs
+            self._client = ElevenLabs(api_key=os.environ.get("ELEVENLABS_API_KEY"))
+        return self._client
+
+    def stream(self, text: str, lang: str):
+        yield from self._get_client().text_to_speech.convert(
+            voice_id=self._voice_for(lang),
+            text=text,
+            model_id=self.model_id,
+            output_format=self.output_format,
+        )
+
+
+class LocalBackend(TTSBackend):
+    """Offline synthesis via espeak-ng, macOS `say`, or pyttsx3 (SAPI5 on Windows)."""
+
+    name = "local"
+    first_chunk_timeout = LOCAL_FIRST_CHUNK_TIMEOUT
+
+    def __init__(self):
+        self._engine = self._detect()
+        self._lock = threading.Lock()  # pyttsx3 is not thread-safe
+
+    @staticmethod
+    def _detect() -> str | None:
+        if shutil.which("espeak-ng"):
+            return "espeak-ng"
+        if sys.platform == "darwin" and shutil.which("say"):
+            return "say"
+        try:
+            import pyttsx3  # noqa: F401
+            return "pyttsx3"
+        except ImportError:
+            return None
+
+    def available(self) -> bool:
+        return self._engine is not None
+
+    def stream(self, text: str, lang: str):
+        if self._engine == "espeak-ng":
+            result = subprocess.run(
+                ["espeak-ng", "--stdout", "-v", ESPEAK_VOICES.get(lang, "en-us"), text],
+                capture_output=True, timeout=30, check=True,
+            )
+            wav_bytes = result.stdout
+        else:
+            wav_bytes = self._render_to_file(text)
+        yield _wav_to_pcm(wav_bytes)
+
+    def _render_to_file(self, text: str) -> bytes:
+        tmp = tempfile.NamedTemporaryFile(suffix=".wav", delete=False)
+        tmp.close()
+        try:
+            if self._engine == "say":
+                subprocess.run(
+                    ["say", "-o", tmp.name, f"--data-format=LEI16@{SAMPLE_RATE}", text],
+                    capture_output=True, timeout=30, check=True,
+                )
+            else:
+                import pyttsx3
+                with self._lock:
+                    engine = pyttsx3.init()
+                    engine.save_to_file(text, tmp.name)
+                    engine.runAndWait()
+            with open(tmp.name, "rb") as f:
+                return f.read()
+        finally:
+            os.unlink(tmp.name)
+
+
+class FakeRemoteBackend(TTSBackend):
+    """Deterministic stand-in for a remote engine, for tests and benchmarks.
+
+    Args:
+        latency: Seconds before the first chunk, or a callable returning it.
+        fail: If True (or a callable returning True), raise ConnectionError.
+        chunks: Number of chunks of silence to yield.
+    """
+
+    name = "fake_remote"
+
+    def __init__(self, latency=0.1, fail=False, chunks: int = 3):
+        self.latency = latency
+        self.fail = fail
+        self.chunks = chunks
+        self.calls = 0
+
+    def available(self) -> bool:
+        return True
+
+    def stream(self, text: str, lang: str):
+        self.calls += 1
+        latency = self.latency() if callable(self.latency) else self.latency
+        fail = self.fail() if callable(self.fail) else self.fail
+        time.sleep(latency)
+        if fail:
+            raise ConnectionError("fake remote unavailable")
+        for _ in range(self.chunks):
+            yield b"\0\0" * (SAMPLE_RATE // 10)
+
+
+def _wav_to_pcm(wav_bytes: bytes) -> bytes:
+    """Convert a WAV file to 16-bit mono PCM at SAMPLE_RATE."""
+    import numpy as np
+
+    with wave.open(io.BytesIO(wav_bytes), "rb") as wf:
+        channels, width, rate = wf.getnchannels(), wf.getsampwidth(), wf.getframerate()
+        frames = wf.readframes(wf.getnframes())
+    if width != 2:
+        raise ValueError(f"Unsupported sample width: {width}")
+    samples = np.frombuffer(frames, dtype=np.int16)
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1).astype(np.int16)
+    if rate != SAMPLE_RATE and len(samples):
+        n_out = int(len(samples) * SAMPLE_RATE / rate)
+        positions = np.linspace(0, len(samples) - 1, n_out)
+        samples = np.interp(positions, np.arange(len(samples)), samples).astype(np.int16)
+    return samples.tobytes()
+
+
+class _BackendStats:
+    """Rolling time-to-first-audio and error samples for one backend."""
+
+    def __init__(self, window: int):
+        self.latencies = deque(maxlen=window)
+        self.outcomes = deque(maxlen=window)  # True = success
+        self.down_until = 0.0
+
+    def p95(self) -> float | None:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return 1 - sum(self.outcomes) / len(self.outcomes)
+
+
+class TTSRouter:
+    """Routes each utterance to the first healthy backend, in preference order.
+
+    Args:
+        backends: Backends in preference order; the last one is used even
+            when unhealthy, as the fallback of last resort.
+        latency_budget: Maximum acceptable p95 time-to-first-chunk (seconds).
+        max_error_rate: Maximum acceptable rolling error rate.
+        first_chunk_timeout: Per-request stall limit before falling back.
+        retry_after: Seconds an unhealthy backend is skipped before a probe.
+    """
+
+    def __init__(
+        self,
+        backends: list[TTSBackend],
+        latency_budget: float = LATENCY_BUDGET,
+        max_error_rate: float = MAX_ERROR_RATE,
+        first_chunk_timeout: float = FIRST_CHUNK_TIMEOUT,
+        retry_after: float = RETRY_AFTER,
+        window: int = STATS_WINDOW,
+    ):
+        self.backends = backends
+        self.latency_budget = latency_budget
+        self.max_error_rate = max_error_rate
+        self.first_chunk_timeout = first_chunk_timeout
+        self.retry_after = retry_after
+        self._stats = {b.name: _BackendStats(window) for b in backends}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, latency: float | None, ok: bool) -> None:
+        """Record one request's outcome and mark the backend down if unhealthy."""
+        with self._lock:
+            stats = self._stats[name]
+            if ok and stats.down_until and time.monotonic() >= stats.down_until:
+                # A successful probe after an outage starts a fresh window
+                stats.latencies.clear()
+                stats.outcomes.clear()
+                stats.down_until = 0.0
+            stats.outcomes.append(ok)
+            if latency is not None:
+                stats.latencies.append(latency)
+            over_budget = (
+                len(stats.latencies) >= MIN_SAMPLES and stats.p95() > self.latency_budget
+            )
+            too_many_errors = (
+                len(stats.outcomes) >= MIN_SAMPLES and stats.error_rate() > self.max_error_rate
+            )
+            if not ok or over_budget or too_many_errors:
+                stats.down_until = time.monotonic() + self.retry_after
+
+    def healthy(self, backend: TTSBackend) -> bool:
+        """Whether backend is available and not currently marked down."""
+        with self._lock:
+            down = time.monotonic() < self._stats[backend.name].down_until
+        return not down and backend.available()
+
+    def candidates(self) -> list[TTSBackend]:
+        """Available backends to try, healthy ones first in preference order."""
+        available = [b for b in self.backends if b.available()]
+        healthy = [b for b in available if self.healthy(b)]
+        return healthy + [b for b in available if b not in healthy]
+
+    def stats(self) -> dict:
+        """Return p95 latency, error rate and health per backend."""
+        with self._lock:
+            now = time.monotonic()
+            return {
+                name: {
+                    "p95_ms": round(s.p95() * 1000, 1) if s.p95() is not None else None,
+                    "error_rate": round(s.error_rate(), 3),
+                    "samples": len(s.outcomes),
+                    "down": now < s.down_until,
+                }
+                for name, s in self._stats.items()
+            }
+
+    def stream(self, text: str, lang: str, info: dict | None = None):
+        """Yield PCM for text from the best backend, falling back on failure.
+
+        A backend that raises, ends without audio, or produces nothing
+        within its first-chunk timeout (the backend's own, else
+        first_chunk_timeout) is recorded as failed and the next one is
+        tried. Once audio has started, the rest comes from the same backend.
+
+        Args:
+            text: Already-translated text.
+            lang: Language code.
+            info: Optional dict; "backend" is set to the name that served.
+        """
+        last_error = None
+        for backend in self.candidates():
+            chunks = queue.Queue()
+            stop = threading.Event()
+            threading.Thread(
+                target=_pump, args=(backend, text, lang, chunks, stop), daemon=True,
+            ).start()
+
+            started = time.monotonic()
+            timeout = backend.first_chunk_timeout or self.first_chunk_timeout
+            try:
+                kind, first = chunks.get(timeout=timeout)
+            except queue.Empty:
+                stop.set()
+                self.record(backend.name, timeout, ok=False)
+                last_error = TimeoutError(f"{backend.name} produced no audio in time")
+                continue
+            if kind == "error":
+                self.record(backend.name, None, ok=False)
+                last_error = first
+                continue
+            if kind == "end":
+                self.record(backend.name, None, ok=False)
+                last_error = RuntimeError(f"{backend.name} returned no audio")
+                continue
+
+            self.record(backend.name, time.monotonic() - started, ok=True)
+            if info is not None:
+                info["backend"] = backend.name
+            try:
+                while kind == "chunk":
+                    yield first
+                    kind, first = chunks.get()
+            finally:
+                stop.set()
+            if kind == "error":
+                raise first
+            return
+
+        raise last_error or RuntimeError("No TTS backend available")
+
+
+def _pump(backend: TTSBackend, text: str, lang: str, chunks: queue.Queue, stop: threading.Event):
+    """Read a backend's stream on its own thread so stalls can be timed out."""
+    try:
+        for chunk in backend.stream(text, lang):
+            if stop.is_set():
+                return
+            if chunk:
+                chunks.put(("chunk", chunk))
+        chunks.put(("end", None))
+    except Exception as e:
+        chunks.put(("error", e))
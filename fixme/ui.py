@@ -489,7 +489,7 @@ class FixMeUI(tk.Tk):
         """Main-thread voice input dialog using tk.Toplevel."""
         dlg = tk.Toplevel(self)
         dlg.title("FixMe — Voice Input")
-        dlg.geometry("420x160")
+        dlg.geometry("420x190")
         dlg.resizable(False, False)
         dlg.configure(bg=P["bg"])
         dlg.transient(self)
@@ -497,7 +497,7 @@ class FixMeUI(tk.Tk):
 
         dlg.update_idletasks()
         x = self.winfo_x() + (self.winfo_width() - 420) // 2
-        y = self.winfo_y() + (self.winfo_height() - 160) // 2
+        y = self.winfo_y() + (self.winfo_height() - 190) // 2
         dlg.geometry(f"+{x}+{y}")
 
         lang = self.sidebar.lang_code
@@ -515,8 +515,12 @@ class FixMeUI(tk.Tk):
                          highlightthickness=0, width=40)
         entry.pack(padx=16, ipady=6)
         entry.focus_set()
+        heard = tk.Label(dlg, text="", bg=P["bg"], fg=P["text_muted"],
+                         font=FONT_SM, wraplength=380)
+        heard.pack(pady=(4, 0))
 
         def submit(e=None):
+            stop.set()
             t = entry.get().strip()
             dlg.destroy()
             if t:
@@ -529,9 +533,17 @@ class FixMeUI(tk.Tk):
                 self._reset()
 
         def cancel():
+            stop.set()
             dlg.destroy()
             self._reset()
 
+        def on_text(text):
+            entry.delete(0, "end")
+            entry.insert(0, text)
+            submit()
+
+        stop = self._listen_in_dialog(dlg, heard, "open", lang, on_text)
+
         entry.bind("<Return>", submit)
         dlg.protocol("WM_DELETE_WINDOW", cancel)
 
@@ -549,7 +561,7 @@ class FixMeUI(tk.Tk):
         """Show a Yes/No/Skip dialog on the main thread for diagnose steps."""
         dlg = tk.Toplevel(self)
         dlg.title("FixMe — Permission")
-        dlg.geometry("400x160")
+        dlg.geometry("400x190")
         dlg.resizable(False, False)
         dlg.configure(bg=P["bg"])
         dlg.transient(self)
@@ -557,17 +569,22 @@ class FixMeUI(tk.Tk):
 
         dlg.update_idletasks()
         x = self.winfo_x() + (self.winfo_width() - 400) // 2
-        y = self.winfo_y() + (self.winfo_height() - 160) // 2
+        y = self.winfo_y() + (self.winfo_height() - 190) // 2
         dlg.geometry(f"+{x}+{y}")
 
         tk.Label(dlg, text=prompt_text, bg=P["bg"], fg=P["text"],
                  font=FONT, wraplength=360, justify="center").pack(pady=(16, 12))
 
         def respond(val):
+            stop.set()
             answer_dict["value"] = val
             dlg.destroy()
             event.set()
 
+        heard = tk.Label(dlg, text="", bg=P["bg"], fg=P["text_muted"],
+                         font=FONT_SM, wraplength=360)
+        stop = self._listen_in_dialog(dlg, heard, "permission", lang, respond)
+
         def on_close():
             respond("no")
 
@@ -588,6 +605,39 @@ class FixMeUI(tk.Tk):
         tk.Button(btn_row, text=skip_lbl, bg=P["surface_hover"],
                   fg=P["text_secondary"], font=FONT_SM, relief="flat",
                   bd=0, width=8, command=lambda: respond("skip")).pack(side="left", padx=4)
+        heard.pack(pady=(4, 0))
+
+    def _listen_in_dialog(self, dlg, label, mode, lang, on_text):
+        """Listen offline while a dialog is open, showing partials in label.
+
+        Does nothing unless an offline recognizer is installed for lang.
+
+        Returns:
+            A threading.Event that stops the capture when set.
+        """
+        stop = threading.Event()
+        try:
+            from fixme import listener, stt_backends
+            if not stt_backends.get_recognizer().candidates(lang, offline_only=True):
+                return stop
+        except ImportError:
+            return stop
+
+        def show(text):
+            if not stop.is_set() and dlg.winfo_exists():
+                label.configure(text=f"\u201c{text}\u201d")
+
+        def work():
+            result = listener.listen(
+                lang=lang, stop_event=stop, mode=mode, offline_only=True,
+                on_partial=lambda t: self.after(0, lambda: show(t)),
+            )
+            text = result.get("text", "")
+            if text and not stop.is_set():
+                self.after(0, lambda: dlg.winfo_exists() and on_text(text))
+
+        threading.Thread(target=work, daemon=True).start()
+        return stop
 
     def _reset(self):
         self.after(0, lambda: self.orb.set_state("idle"))
@@ -612,9 +662,8 @@ class FixMeUI(tk.Tk):
         _os = "macOS" if sys.platform == "darwin" else "Windows"
         try:
             cl = anthropic.Anthropic(api_key=os.environ.get("ANTHROPIC_API_KEY"))
+            from fixme.translate import LANG_NAMES as names
             lang = self.sidebar.lang_code
-            names = {"en": "English", "es": "Spanish", "pa": "Punjabi",
-                     "hi": "Hindi", "fr": "French"}
             m = cl.messages.create(
                 model="claude-sonnet-4-20250514", max_tokens=1024,
                 system=(
@@ -682,12 +731,43 @@ class FixMeUI(tk.Tk):
         else:
             self._reset()
 
+    def _ask_batch_consent(self, steps, lang):
+        """Offer one consent for all low-risk steps (worker thread).
+
+        Returns:
+            The set of step indexes that may run without their own dialog:
+            WAIT pseudo-steps always, plus the low-risk steps if approved.
+        """
+        from fixme import fixes, intents
+        auto = {i for i, s in enumerate(steps) if fixes.is_wait(s.get("command", ""))}
+        risks = fixes.plan_risks(steps)
+        batch = [
+            i for i, s in enumerate(steps)
+            if i not in auto and risks[i] != fixes.RISK_HIGH
+        ]
+        if len(batch) < 2:
+            return auto
+
+        names = "\n".join(f"{i + 1}. {steps[i].get('description', 'Unknown')}" for i in batch)
+        self.after(0, lambda: self._speak(
+            f"{len(batch)} steps are low risk. Shall I do those without asking each time?"))
+        answer = {"value": ""}
+        evt = threading.Event()
+        self.after(0, lambda: self._ask_permission(
+            f"These steps are low risk:\n{names}\nRun them without asking each time?",
+            lang, answer, evt))
+        evt.wait(timeout=60)
+        if intents.classify(answer["value"], lang) == intents.YES:
+            return auto | set(batch)
+        return auto
+
     def _run_fix_steps(self, steps):
         """Execute a list of fix steps with permission dialogs."""
         from fixme.fixes import execute
-        from fixme.voice_input import is_affirmative, is_negative
+        from fixme import intents
         lang = self.sidebar.lang_code
         applied = 0
+        auto = self._ask_batch_consent(steps, lang)
 
         for i, step in enumerate(steps):
             n, t = i + 1, len(steps)
@@ -698,27 +778,31 @@ class FixMeUI(tk.Tk):
             self.after(0, lambda d=desc, sn=n, st=t: self._step(sn, st, d, "running"))
             self.after(0, lambda sn=n, st=t: self._set_status(f"Step {sn}/{st}", P["warning"]))
 
-            answer = {"value": ""}
-            evt = threading.Event()
-            self.after(0, lambda d=desc, sn=n, c=cmd: self._ask_permission(
-                f"Step {sn}: {d}\nCommand: {c}\nProceed?", lang, answer, evt))
-            evt.wait(timeout=60)
-            resp = answer["value"]
-
+            if i in auto:
+                resp, intent = "", intents.YES
+            else:
+                answer = {"value": ""}
+                evt = threading.Event()
+                self.after(0, lambda d=desc, sn=n, c=cmd: self._ask_permission(
+                    f"Step {sn}: {d}\nCommand: {c}\nProceed?", lang, answer, evt))
+                evt.wait(timeout=60)
+                resp = answer["value"]
+                intent = intents.classify(resp, lang)
             if resp:
                 self.after(0, lambda r=resp: self._msg(r, "user"))
-            if resp and is_affirmative(resp, lang):
+            if intent == intents.YES:
                 self.after(0, lambda: self.orb.set_state("processing"))
                 ok, msg = execute(cmd, admin)
                 st_status = "done" if ok else "failed"
                 applied += 1 if ok else 0
                 self.after(0, lambda d=desc, sn=n, st=t, ss=st_status: self._step(sn, st, d, ss))
                 self.after(0, lambda m=msg: self._msg(f"Result: {m}", "assistant"))
-            elif resp and is_negative(resp, lang):
+            elif intent in (intents.NO, intents.SKIP):
                 self.after(0, lambda d=desc, sn=n, st=t: self._step(sn, st, d, "skipped"))
-            elif resp and any(k in resp.lower() for k in ("stop", "abort", "quit")):
+            elif intent == intents.ABORT:
                 break
-            time.sleep(0.5)
+            if i not in auto:
+                time.sleep(0.5)
 
         summary = f"Done! {applied}/{len(steps)} steps applied." if applied else "No fixes applied."
         self.after(0, lambda: self._msg(summary, "assistant"))
@@ -738,9 +822,10 @@ class FixMeUI(tk.Tk):
         threading.Thread(target=self._diag_work, daemon=True).start()
 
     def _diag_work(self):
+        presynth = None
         try:
             from fixme import screenshot, diagnose, fixes
-            from fixme.voice_input import is_affirmative, is_negative
+            from fixme import intents
             lang = self.sidebar.lang_code
 
             self.after(0, lambda: self._set_status("Capturing", P["warning"]))
@@ -755,6 +840,15 @@ class FixMeUI(tk.Tk):
             diag = result.get("diagnosis", "Unknown issue")
             steps = result.get("steps", [])
             self.after(0, lambda: self._msg(f"Diagnosis: {diag}", "assistant"))
+            # Translate every spoken prompt of this plan in one request and
+            # render the audio in the background before the walkthrough needs it
+            from fixme import tts
+            phrases = [f"I found the issue: {diag}", "No fixes applied."]
+            phrases += [f"Step {i + 1}: {s.get('description', 'Unknown')}. Shall I proceed?"
+                        for i, s in enumerate(steps)]
+            phrases += [f"Done! {i + 1}/{len(steps)} steps applied." for i in range(len(steps))]
+            tts.prepare_phrases(phrases, lang)
+            presynth = tts.presynthesize(phrases, lang)
             self.after(0, lambda: self._speak(f"I found the issue: {diag}"))
 
             if not steps:
@@ -766,6 +860,7 @@ class FixMeUI(tk.Tk):
             time.sleep(1)
 
             applied = 0
+            auto = self._ask_batch_consent(steps, lang)
             for i, step in enumerate(steps):
                 n, t = i + 1, len(steps)
                 desc = step.get("description", "Unknown")
@@ -773,30 +868,35 @@ class FixMeUI(tk.Tk):
 
                 self.after(0, lambda d=desc, sn=n, st=t: self._step(sn, st, d, "running"))
                 self.after(0, lambda sn=n, st=t: self._set_status(f"Step {sn}/{st}", P["warning"]))
-                self.after(0, lambda d=desc, sn=n: self._speak(f"Step {sn}: {d}. Shall I proceed?"))
-                self.after(0, lambda: self.orb.set_state("listening"))
-
-                # Ask permission on main thread, block worker until answered
-                answer = {"value": ""}
-                evt = threading.Event()
-                self.after(0, lambda: self._ask_permission(
-                    f"Step {n}: {desc}\nProceed?", lang, answer, evt))
-                evt.wait(timeout=60)
-                resp = answer["value"]
 
+                if i in auto:
+                    resp, intent = "", intents.YES
+                else:
+                    self.after(0, lambda d=desc, sn=n: self._speak(f"Step {sn}: {d}. Shall I proceed?"))
+                    self.after(0, lambda: self.orb.set_state("listening"))
+
+                    # Ask permission on main thread, block worker until answered
+                    answer = {"value": ""}
+                    evt = threading.Event()
+                    self.after(0, lambda: self._ask_permission(
+                        f"Step {n}: {desc}\nProceed?", lang, answer, evt))
+                    evt.wait(timeout=60)
+                    resp = answer["value"]
+                    intent = intents.classify(resp, lang)
                 if resp:
                     self.after(0, lambda r=resp: self._msg(r, "user"))
-                if resp and is_affirmative(resp, lang):
+                if intent == intents.YES:
                     self.after(0, lambda: self.orb.set_state("processing"))
                     ok, msg = fixes.execute(cmd, step.get("needs_admin", False))
                     st_status = "done" if ok else "failed"
                     applied += 1 if ok else 0
                     self.after(0, lambda d=desc, sn=n, st=t, ss=st_status: self._step(sn, st, d, ss))
-                elif resp and is_negative(resp, lang):
+                elif intent in (intents.NO, intents.SKIP):
                     self.after(0, lambda d=desc, sn=n, st=t: self._step(sn, st, d, "skipped"))
-                elif resp and any(k in resp.lower() for k in ("stop", "abort", "quit")):
+                elif intent == intents.ABORT:
                     break
-                time.sleep(0.5)
+                if i not in auto:
+                    time.sleep(0.5)
 
             summary = f"Done! {applied}/{len(steps)} steps applied." if applied else "No fixes applied."
             self.after(0, lambda: self._msg(summary, "assistant"))
@@ -808,6 +908,16 @@ class FixMeUI(tk.Tk):
                 self.after(0, lambda: self._set_status("Verifying fix", P["brand"]))
                 self.after(0, lambda: self._msg("Verifying if the fix worked...", "assistant"))
                 try:
+                    from fixme import verify
+                    verification = verify.verify_fix(result)
+                    if verification and verification["status"] != "unknown":
+                        if verification["status"] == "pass":
+                            self.after(0, lambda: self._msg(
+                                "Looks good! Network checks passed.", "assistant"))
+                        else:
+                            self.after(0, lambda d=verify.summarize(verification): self._msg(
+                                f"Still seeing an issue: {d}\nYou can try Diagnose again.", "assistant"))
+                        return
                     verify_img = screenshot.take_screenshot()
                     verify_result = diagnose.diagnose_screenshot(verify_img)
                     try:
@@ -827,17 +937,28 @@ class FixMeUI(tk.Tk):
         except Exception as e:
             self.after(0, lambda: self._msg(f"Diagnosis failed: {e}", "assistant"))
         finally:
+            if presynth is not None:
+                presynth.cancel()
             self._busy = False
             self.after(0, lambda: self._dbtn.configure(state="normal", text="Diagnose Screen"))
             self._reset()
 
     # ── GUI Automation ─────────────────────────────────────────────────────────
 
-    def _click_at(self, x, y, description=""):
-        """Click at screen coordinates using pyautogui."""
+    def _click_at(self, x, y, description="", element=None):
+        """Click at screen coordinates using pyautogui.
+
+        If element is given it is located on screen first and clicked at
+        its center; x and y are used when it cannot be found.
+        """
         try:
             import pyautogui
             pyautogui.FAILSAFE = True
+            if element:
+                from fixme.locator import get_locator
+                box = get_locator().locate(element)
+                if box is not None:
+                    x, y = box["center"]
             pyautogui.click(x, y)
             self.after(0, lambda: self._msg(
                 f"Clicked at ({x}, {y})" + (f": {description}" if description else ""),
@@ -895,13 +1016,12 @@ class FixMeUI(tk.Tk):
     # ── TTS ───────────────────────────────────────────────────────────────────
 
     def _speak(self, text):
-        def w():
-            try:
-                from fixme import tts
-                tts.speak(text, self.sidebar.lang_code)
-            except Exception:
-                pass
-        threading.Thread(target=w, daemon=True).start()
+        # Queued on the shared playback engine, which plays in order
+        try:
+            from fixme import tts
+            tts.speak(text, self.sidebar.lang_code, block=False)
+        except Exception:
+            pass
 
 
 # ─── Entry ────────────────────────────────────────────────────────────────────
@@ -917,6 +1037,10 @@ def main():
               "Create a .env file:\n  ANTHROPIC_API_KEY=sk-ant-...\n  ELEVENLABS_API_KEY=...\n")
         sys.exit(1)
 
+    # Before any Tk window or pyautogui use, so all agree on pixels
+    from fixme.locator import enable_dpi_awareness
+    enable_dpi_awareness()
+
     # Prevent uncaught thread exceptions from crashing the app
     def _thread_exc(args):
         print(f"[FixMe] Thread error: {args.exc_value}")
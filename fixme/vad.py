@@ -0,0 +1,176 @@
+"""Energy / zero-crossing voice activity detection and endpointing.
+
+Audio is split into short frames; a frame counts as speech when its energy is
+well above the adaptive noise floor, or moderately above it with a high
+zero-crossing rate (unvoiced consonants such as "s" and "f"). The
+``Endpointer`` is fed audio as it is captured, decides when the user has
+finished speaking, and trims leading and trailing silence afterwards.
+"""
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+FRAME_SECONDS = 0.02
+
+# End the capture after this much silence following speech
+TRAILING_SILENCE = 0.8
+# Give up if no speech has started after this long
+NO_SPEECH_TIMEOUT = 8.0
+# Speech shorter than this is treated as a click or bump
+MIN_SPEECH_SECONDS = 0.1
+# Silence kept on either side of the speech when trimming
+PADDING_SECONDS = 0.15
+
+# Frames this far (dB) above the noise floor are speech
+SPEECH_MARGIN_DB = 10.0
+# Frames this far above the floor are speech if they are also noisy (fricatives)
+FRICATIVE_MARGIN_DB = 5.0
+FRICATIVE_ZCR = 0.25
+# Nothing quieter than this is speech, however quiet the room is
+MIN_SPEECH_DBFS = -50.0
+# How quickly the noise floor rises towards non-speech frames (it drops at once)
+NOISE_ADAPT = 0.05
+# Digital silence would otherwise pull the floor down to nothing
+MIN_NOISE_DBFS = -70.0
+
+
+def frame_features(samples: np.ndarray, frame_len: int) -> tuple[np.ndarray, np.ndarray]:
+    """Return per-frame energy (dBFS) and zero-crossing rate.
+
+    Args:
+        samples: int16 mono samples; a trailing partial frame is ignored.
+        frame_len: Samples per frame.
+
+    Returns:
+        (energy_db, zcr) arrays with one value per whole frame.
+    """
+    n = len(samples) // frame_len
+    if n == 0:
+        return np.zeros(0), np.zeros(0)
+    frames = samples[:n * frame_len].reshape(n, frame_len).astype(np.float32) / 32768.0
+    rms = np.sqrt(np.mean(frames * frames, axis=1))
+    energy_db = 20.0 * np.log10(rms + 1e-10)
+    signs = np.signbit(frames)
+    zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / (frame_len - 1)
+    return energy_db, zcr
+
+
+class Endpointer:
+    """Incremental speech detector that decides when an utterance has ended.
+
+    Args:
+        sample_rate: Sample rate of the fed audio.
+        trailing_silence: Seconds of silence after speech that end the capture.
+        no_speech_timeout: Seconds without any speech that end the capture.
+        min_speech: Shortest run of speech frames that counts as speech.
+        padding: Seconds of silence kept around the speech by trim().
+
+    Attributes:
+        done: True once an endpoint has been reached.
+        reason: "silence" or "no_speech" once done, else None.
+        speech_start, speech_end: Sample offsets of the detected speech,
+            relative to the first sample fed, or None if none was heard.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = SAMPLE_RATE,
+        trailing_silence: float = TRAILING_SILENCE,
+        no_speech_timeout: float = NO_SPEECH_TIMEOUT,
+        min_speech: float = MIN_SPEECH_SECONDS,
+        padding: float = PADDING_SECONDS,
+    ):
+        self.sample_rate = sample_rate
+        self.frame_len = int(sample_rate * FRAME_SECONDS)
+        self.trailing_frames = max(1, round(trailing_silence / FRAME_SECONDS))
+        self.timeout_frames = max(1, round(no_speech_timeout / FRAME_SECONDS))
+        self.min_speech_frames = max(1, round(min_speech / FRAME_SECONDS))
+        self.padding = int(padding * sample_rate)
+        self.noise_floor = None
+        self.done = False
+        self.reason = None
+        self.speech_start = None
+        self.speech_end = None
+        self._frames = 0  # whole frames processed so far
+        self._run_start = None  # first frame of the current speech run
+        self._last_speech = None  # last speech frame once speech has started
+        self._pending = np.zeros(0, dtype=np.int16)
+
+    def is_speech(self, energy_db: float, zcr: float) -> bool:
+        """Classify one frame against the current noise floor."""
+        floor = self.noise_floor if self.noise_floor is not None else energy_db
+        if energy_db < MIN_SPEECH_DBFS:
+            return False
+        if energy_db > floor + SPEECH_MARGIN_DB:
+            return True
+        return energy_db > floor + FRICATIVE_MARGIN_DB and zcr > FRICATIVE_ZCR
+
+    def feed(self, samples: np.ndarray) -> bool:
+        """Process newly captured samples.
+
+        Returns:
+            True once the utterance has ended (see ``reason``).
+        """
+        if self.done:
+            return True
+        data = np.concatenate((self._pending, samples)) if len(self._pending) else samples
+        whole = len(data) - len(data) % self.frame_len
+        self._pending = data[whole:].copy()
+        energy_db, zcr = frame_features(data[:whole], self.frame_len)
+
+        for e, z in zip(energy_db.tolist(), zcr.tolist()):
+            index = self._frames
+            self._frames += 1
+            if self.noise_floor is None:
+                self.noise_floor = max(e, MIN_NOISE_DBFS)
+            speech = self.is_speech(e, z)
+            if not speech:
+                if e < self.noise_floor:
+                    self.noise_floor = max(e, MIN_NOISE_DBFS)
+                else:
+                    self.noise_floor += NOISE_ADAPT * (e - self.noise_floor)
+                self._run_start = None
+            elif self._run_start is None:
+                self._run_start = index
+
+            if speech and self._run_start is not None and \
+                    index - self._run_start + 1 >= self.min_speech_frames:
+                if self.speech_start is None:
+                    self.speech_start = self._run_start * self.frame_len
+                self._last_speech = index
+                self.speech_end = (index + 1) * self.frame_len
+
+            if self._last_speech is not None:
+                if index - self._last_speech >= self.trailing_frames:
+                    self.done, self.reason = True, "silence"
+                    break
+            elif self._frames >= self.timeout_frames:
+                self.done, self.reason = True, "no_speech"
+                break
+        return self.done
+
+    def trim(self, samples: np.ndarray) -> tuple[np.ndarray, dict]:
+        """Cut the fed audio down to the detected speech plus padding.
+
+        Args:
+            samples: The same audio that was fed, from its first sample.
+
+        Returns:
+            (trimmed samples, stats) where stats has kept_ms, dropped_ms,
+            speech (bool) and endpoint (the reason, or None if capture was
+            ended some other way).
+        """
+        if self.speech_start is None:
+            kept = samples[:0]
+        else:
+            start = max(0, self.speech_start - self.padding)
+            end = min(len(samples), self.speech_end + self.padding)
+            kept = samples[start:end]
+        to_ms = 1000.0 / self.sample_rate
+        stats = {
+            "speech": self.speech_start is not None,
+            "endpoint": self.reason,
+            "kept_ms": round(len(kept) * to_ms),
+            "dropped_ms": round((len(samples) - len(kept)) * to_ms),
+        }
+        return kept, stats
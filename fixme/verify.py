@@ -0,0 +1,295 @@
+"""Local post-fix connectivity verification (gateway, DNS, interface, captive portal).
+
+Network fixes can usually be confirmed without another screenshot and vision
+call. Each check returns ``True`` (passed), ``False`` (failed) or ``None``
+(could not decide); the suite only reports "unknown" — and callers escalate to
+the screenshot re-diagnosis — when no check failed but some were undecided.
+"""
+
+import os
+import re
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+_IS_MAC = sys.platform == "darwin"
+_IS_WIN = sys.platform == "win32"
+
+DNS_CHECK_HOST = os.environ.get("FIXME_VERIFY_HOST", "www.google.com")
+CAPTIVE_PORTAL_URL = "http://connectivitycheck.gstatic.com/generate_204"
+CHECK_TIMEOUT = 3.0
+
+# Which checks prove each kind of fix. Wi-Fi/network resets must bring the
+# link back; a DNS flush only has to make names resolve again.
+CHECKS_BY_FIX = {
+    "toggle_wifi": ["interface", "gateway", "dns", "captive_portal"],
+    "restart_network": ["interface", "gateway", "dns", "captive_portal"],
+    "flush_dns": ["dns", "captive_portal"],
+}
+CHECKS_BY_CATEGORY = {
+    "wifi": CHECKS_BY_FIX["toggle_wifi"],
+    "dns": CHECKS_BY_FIX["flush_dns"],
+}
+
+
+# ── Default system probes (replaceable for offline tests) ───────────────────
+
+def _default_gateway() -> str | None:
+    """Return the default gateway IP address, or None if it can't be found."""
+    try:
+        if _IS_MAC:
+            result = subprocess.run(
+                ["route", "-n", "get", "default"],
+                capture_output=True, text=True, timeout=CHECK_TIMEOUT,
+            )
+            match = re.search(r"gateway:\s*(\S+)", result.stdout)
+        elif _IS_WIN:
+            result = subprocess.run(
+                "ipconfig", shell=True,
+                capture_output=True, text=True, timeout=CHECK_TIMEOUT,
+            )
+            match = re.search(r"Default Gateway[ .]*:\s*(\d+\.\d+\.\d+\.\d+)", result.stdout)
+        else:
+            result = subprocess.run(
+                ["ip", "route", "show", "default"],
+                capture_output=True, text=True, timeout=CHECK_TIMEOUT,
+            )
+            match = re.search(r"default via (\S+)", result.stdout)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    return match.group(1) if match else None
+
+
+def _ping(host: str, timeout: float) -> bool:
+    """Send a single ICMP echo to host via the system ping command."""
+    if _IS_WIN:
+        cmd = ["ping", "-n", "1", "-w", str(int(timeout * 1000)), host]
+    elif _IS_MAC:
+        cmd = ["ping", "-c", "1", "-t", str(max(1, int(timeout))), host]
+    else:
+        cmd = ["ping", "-c", "1", "-W", str(max(1, int(timeout))), host]
+    try:
+        result = subprocess.run(cmd, capture_output=True, timeout=timeout + 1)
+    except (OSError, subprocess.TimeoutExpired):
+        return False
+    return result.returncode == 0
+
+
+def _wifi_interface() -> str | None:
+    """Return the device name of the Wi-Fi interface (macOS, Linux), or None.
+
+    On Linux a machine without Wi-Fi reports the interface of its default
+    route instead, so a wired uplink is checked rather than nothing.
+    """
+    if _IS_MAC:
+        result = subprocess.run(
+            ["networksetup", "-listallhardwareports"],
+            capture_output=True, text=True, timeout=CHECK_TIMEOUT,
+        )
+        match = re.search(r"Hardware Port:\s*(?:Wi-Fi|AirPort)\s*\nDevice:\s*(\S+)", result.stdout)
+        return match.group(1) if match else None
+    result = subprocess.run(
+        ["ip", "route", "get", "1.1.1.1"],
+        capture_output=True, text=True, timeout=CHECK_TIMEOUT,
+    )
+    match = re.search(r"\bdev (\S+)", result.stdout)
+    routed = match.group(1) if match else None
+    try:
+        wireless = sorted(n for n in os.listdir("/sys/class/net")
+                          if os.path.isdir(f"/sys/class/net/{n}/wireless"))
+    except OSError:
+        wireless = []
+    if routed in wireless or not wireless:
+        return routed
+    return wireless[0]
+
+
+def _interface_up() -> bool | None:
+    """Return whether the Wi-Fi interface is up, or None if unknown."""
+    try:
+        if _IS_WIN:
+            result = subprocess.run(
+                "netsh wlan show interfaces", shell=True,
+                capture_output=True, text=True, timeout=CHECK_TIMEOUT,
+            )
+            match = re.search(r"^\s*State\s*:\s*(\w+)", result.stdout, re.MULTILINE)
+            return match.group(1).lower() == "connected" if match else None
+        device = _wifi_interface()
+        if device is None:
+            return None
+        if _IS_MAC:
+            result = subprocess.run(
+                ["networksetup", "-getairportpower", device],
+                capture_output=True, text=True, timeout=CHECK_TIMEOUT,
+            )
+            return result.stdout.strip().lower().endswith("on")
+        # Only this interface; docker and bridge devices are "UP" too
+        result = subprocess.run(
+            ["ip", "-o", "link", "show", "dev", device],
+            capture_output=True, text=True, timeout=CHECK_TIMEOUT,
+        )
+        return "state UP" in result.stdout
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+
+
+def _http_get(url: str, timeout: float) -> tuple[int, str]:
+    """Fetch url without following redirects and return (status, body)."""
+
+    class _NoRedirect(urllib.request.HTTPRedirectHandler):
+        def redirect_request(self, *args, **kwargs):
+            return None
+
+    opener = urllib.request.build_opener(_NoRedirect)
+    try:
+        with opener.open(url, timeout=timeout) as resp:
+            return resp.status, resp.read(512).decode("utf-8", "replace")
+    except urllib.error.HTTPError as e:
+        return e.code, ""
+
+
+# ── Verifier ─────────────────────────────────────────────────────────────────
+
+class ConnectivityVerifier:
+    """Runs fix-specific network post-condition checks.
+
+    Every system probe is injectable so the suite can run offline.
+
+    Args:
+        resolve: ``resolve(host) -> str`` returning an IP; raises OSError on failure.
+        gateway_lookup: ``gateway_lookup() -> str | None``.
+        ping: ``ping(host, timeout) -> bool``.
+        interface_state: ``interface_state() -> bool | None``.
+        http_get: ``http_get(url, timeout) -> (status, body)``; raises OSError
+            when the network is unreachable.
+        dns_host: Hostname used for the DNS check.
+        timeout: Per-check timeout in seconds.
+    """
+
+    def __init__(
+        self,
+        resolve=socket.gethostbyname,
+        gateway_lookup=_default_gateway,
+        ping=_ping,
+        interface_state=_interface_up,
+        http_get=_http_get,
+        dns_host: str = DNS_CHECK_HOST,
+        timeout: float = CHECK_TIMEOUT,
+    ):
+        self._resolve = resolve
+        self._gateway_lookup = gateway_lookup
+        self._ping = ping
+        self._interface_state = interface_state
+        self._http_get = http_get
+        self.dns_host = dns_host
+        self.timeout = timeout
+
+    def check_interface(self) -> tuple[bool | None, str]:
+        state = self._interface_state()
+        if state is None:
+            return None, "Interface state unknown"
+        return state, "Interface is up" if state else "Interface is down"
+
+    def check_gateway(self) -> tuple[bool | None, str]:
+        gateway = self._gateway_lookup()
+        if not gateway:
+            return False, "No default gateway"
+        if self._ping(gateway, self.timeout):
+            return True, f"Gateway {gateway} reachable"
+        # Many routers drop ICMP, so an unanswered ping alone is not a failure.
+        return None, f"Gateway {gateway} did not answer ping"
+
+    def check_dns(self) -> tuple[bool | None, str]:
+        try:
+            address = self._resolve(self.dns_host)
+        except (OSError, UnicodeError) as e:
+            return False, f"Could not resolve {self.dns_host}: {e}"
+        return True, f"{self.dns_host} resolved to {address}"
+
+    def check_captive_portal(self) -> tuple[bool | None, str]:
+        try:
+            status, _body = self._http_get(CAPTIVE_PORTAL_URL, self.timeout)
+        except (OSError, ValueError) as e:
+            return False, f"Internet check failed: {e}"
+        if status == 204:
+            return True, "Internet reachable, no captive portal"
+        if status in (301, 302, 303, 307, 308) or status == 200:
+            return False, "Captive portal detected — sign in via the browser"
+        return None, f"Unexpected internet check status {status}"
+
+    def run(self, checks: list[str]) -> dict:
+        """Run the named checks in order.
+
+        Args:
+            checks: Names from "interface", "gateway", "dns", "captive_portal".
+
+        Returns:
+            Dict with "status" ("pass", "fail" or "unknown"), "checks" (list of
+            {name, passed, detail, elapsed_ms}) and total "elapsed_ms".
+        """
+        results = []
+        start = time.perf_counter()
+        for name in checks:
+            check = getattr(self, f"check_{name}")
+            t0 = time.perf_counter()
+            try:
+                passed, detail = check()
+            except Exception as e:
+                passed, detail = None, f"Check error: {e}"
+            results.append({
+                "name": name,
+                "passed": passed,
+                "detail": detail,
+                "elapsed_ms": round((time.perf_counter() - t0) * 1000, 1),
+            })
+
+        if any(r["passed"] is False for r in results):
+            status = "fail"
+        elif results and all(r["passed"] for r in results):
+            status = "pass"
+        else:
+            status = "unknown"
+
+        return {
+            "status": status,
+            "checks": results,
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+        }
+
+
+def checks_for(diagnosis_result: dict) -> list[str]:
+    """Return the local checks that can verify this diagnosis, or [] if none."""
+    fix_id = diagnosis_result.get("fix_id")
+    if fix_id in CHECKS_BY_FIX:
+        return CHECKS_BY_FIX[fix_id]
+    return CHECKS_BY_CATEGORY.get(diagnosis_result.get("category"), [])
+
+
+def verify_fix(diagnosis_result: dict, verifier: ConnectivityVerifier | None = None) -> dict | None:
+    """Verify a network fix locally.
+
+    Args:
+        diagnosis_result: The diagnosis the fix was applied for (uses
+            "fix_id" and "category").
+        verifier: Optional pre-configured verifier.
+
+    Returns:
+        The verification result dict, or None if this fix has no local checks.
+    """
+    checks = checks_for(diagnosis_result)
+    if not checks:
+        return None
+    return (verifier or ConnectivityVerifier()).run(checks)
+
+
+def summarize(verification: dict) -> str:
+    """Return a one-line human-readable summary of a verification result."""
+    failed = [c["detail"] for c in verification["checks"] if c["passed"] is False]
+    if verification["status"] == "pass":
+        return "Network checks passed"
+    if failed:
+        return failed[0]
+    return "Network checks were inconclusive"
@@ -1,13 +1,9 @@
-"""Windows SAPI speech recognition with tkinter fallback."""
+"""Voice input: offline recognition, then Windows SAPI, then a tkinter fallback."""
 
 import threading
 import warnings
 
-AFFIRMATIVE_EN = {"yes", "yeah", "yep", "sure", "okay", "ok", "go ahead", "proceed", "do it"}
-AFFIRMATIVE_ES = {"sí", "si", "claro", "dale", "adelante", "hazlo", "ok", "okay"}
-
-NEGATIVE_EN = {"no", "nope", "nah", "skip", "don't", "cancel"}
-NEGATIVE_ES = {"no", "cancelar", "saltar", "para"}
+from fixme import intents
 
 
 def is_affirmative(text: str, lang: str = "en") -> bool:
@@ -15,29 +11,25 @@ def is_affirmative(text: str, lang: str = "en") -> bool:
 
     Args:
         text: Transcribed text to check.
-        lang: Language code - "en" or "es".
+        lang: Language code (any of translate.LANG_NAMES).
 
     Returns:
         True if the response is affirmative.
     """
-    words = text.lower().strip()
-    patterns = AFFIRMATIVE_ES if lang == "es" else AFFIRMATIVE_EN
-    return words in patterns or any(p in words for p in patterns)
+    return intents.classify(text, lang) == intents.YES
 
 
 def is_negative(text: str, lang: str = "en") -> bool:
-    """Check if the text is a negative response.
+    """Check if the text is a negative response ("no" or "skip").
 
     Args:
         text: Transcribed text to check.
-        lang: Language code - "en" or "es".
+        lang: Language code (any of translate.LANG_NAMES).
 
     Returns:
         True if the response is negative.
     """
-    words = text.lower().strip()
-    patterns = NEGATIVE_ES if lang == "es" else NEGATIVE_EN
-    return words in patterns or any(p in words for p in patterns)
+    return intents.classify(text, lang) in (intents.NO, intents.SKIP)
 
 
 def _tkinter_fallback(mode: str = "permission", lang: str = "en") -> str:
@@ -123,6 +115,35 @@ def _tkinter_fallback(mode: str = "permission", lang: str = "en") -> str:
     return result["value"]
 
 
+def _try_offline_listen(
+    mode: str = "permission", lang: str = "en", timeout: int = 10, on_partial=None,
+) -> str | None:
+    """Attempt to listen with the microphone and an offline recognizer (Vosk).
+
+    Capture ends once the user stops speaking, after timeout seconds without
+    speech, or (in permission mode) as soon as a clear yes/no is heard.
+
+    Returns:
+        Transcribed text, or None if no offline model is installed for lang
+        or nothing was understood.
+    """
+    try:
+        from fixme import listener, stt_backends
+    except ImportError:
+        return None
+
+    if not stt_backends.get_recognizer().candidates(lang, offline_only=True):
+        return None
+
+    result = listener.listen(
+        lang=lang, mode=mode, no_speech_timeout=timeout,
+        on_partial=on_partial, offline_only=True,
+    )
+    if result["error"] and result["error"].startswith("Microphone error"):
+        warnings.warn(result["error"])
+    return result["text"] or None
+
+
 def _try_sapi_listen(lang: str = "en", timeout: int = 10) -> str | None:
     """Attempt to listen using Windows SAPI speech recognition.
 
@@ -163,19 +184,26 @@ def _try_sapi_listen(lang: str = "en", timeout: int = 10) -> str | None:
         return None
 
 
-def listen(mode: str = "permission", lang: str = "en", timeout: int = 10) -> str:
+def listen(mode: str = "permission", lang: str = "en", timeout: int = 10, on_partial=None) -> str:
     """Listen for user voice input, falling back to tkinter popup on timeout.
 
+    Uses the offline recognizer when a model for lang is installed, then
+    Windows SAPI, then the popup.
+
     Args:
         mode: "permission" for yes/no, "open" for free-form speech.
         lang: Language code - "en" or "es".
         timeout: Seconds to wait for voice input before showing fallback.
+        on_partial: Called with partial transcripts while the user speaks
+            (offline recognizer only, from the listening thread).
 
     Returns:
         Transcribed text or selected button value.
     """
-    # Try SAPI first
-    result = _try_sapi_listen(lang=lang, timeout=timeout)
+    # Try a local model first, then SAPI
+    result = _try_offline_listen(mode=mode, lang=lang, timeout=timeout, on_partial=on_partial)
+    if not result:
+        result = _try_sapi_listen(lang=lang, timeout=timeout)
 
     if result:
         return result
@@ -50,6 +50,12 @@ def _get_module(name):
         elif name == "tts":
             from fixme import tts
             _modules[name] = tts
+        elif name == "verify":
+            from fixme import verify
+            _modules[name] = verify
+        elif name == "locator":
+            from fixme import locator
+            _modules[name] = locator
         elif name == "anthropic":
             import anthropic
             _modules[name] = anthropic
@@ -65,8 +71,7 @@ def handle_chat(params):
 
     _is_mac = sys.platform == "darwin"
     _os = "macOS" if _is_mac else "Windows"
-    names = {"en": "English", "es": "Spanish", "pa": "Punjabi",
-             "hi": "Hindi", "fr": "French"}
+    from fixme.translate import LANG_NAMES as names
 
     system_prompt = (
         f"You are FixMe, an IT support assistant running on {_os}. "
@@ -160,14 +165,35 @@ def handle_execute_step(params):
 
 
 def handle_speak(params):
-    """Text-to-speech via ElevenLabs."""
+    """Text-to-speech via ElevenLabs.
+
+    Resolves once the audio has finished playing (or was interrupted), so
+    the frontend can start listening exactly when the prompt ends.
+    """
     tts = _get_module("tts")
     text = params.get("text", "")
     lang = params.get("lang", "en")
-    tts.speak(text, lang)
+    handle = tts.speak(text, lang, interrupt=params.get("interrupt", False))
+    return {"ok": True, "interrupted": handle.interrupted}
+
+
+def handle_stop_speaking(params):
+    """Barge in: stop current speech and drop queued utterances."""
+    tts = _get_module("tts")
+    tts.stop()
     return {"ok": True}
 
 
+def handle_tts_stats(params):
+    """Return TTS cache hit rate, backend health and recent per-utterance timings."""
+    tts = _get_module("tts")
+    return {
+        "cache": tts.cache_stats(),
+        "backends": tts.backend_stats(),
+        "recent": tts.recent_metrics()[-10:],
+    }
+
+
 def handle_screenshot(params):
     """Take a screenshot and return the file path."""
     screenshot = _get_module("screenshot")
@@ -175,14 +201,37 @@ def handle_screenshot(params):
     return {"path": path}
 
 
+def handle_locate(params):
+    """Find a UI element on screen by template matching.
+
+    Returns the element's box in click coordinates, or {"found": False}.
+    """
+    locator = _get_module("locator")
+    box = locator.get_locator().locate(params["element"], location=params.get("location"))
+    if box is None:
+        return {"found": False}
+    return {"found": True, **box}
+
+
 def handle_click_at(params):
-    """Click at screen coordinates using pyautogui."""
+    """Click at screen coordinates, or on an element, using pyautogui.
+
+    Either "x" and "y", or "element" (with an optional "location" hint)
+    located on screen first.
+    """
     import pyautogui
     pyautogui.FAILSAFE = True
-    x = params.get("x", 0)
-    y = params.get("y", 0)
+    if "element" in params and "x" not in params:
+        locator = _get_module("locator")
+        box = locator.get_locator().locate(params["element"], location=params.get("location"))
+        if box is None:
+            raise ValueError(f"Element not found on screen: {params['element']}")
+        x, y = box["center"]
+    else:
+        x = params.get("x", 0)
+        y = params.get("y", 0)
     pyautogui.click(x, y)
-    return {"ok": True}
+    return {"ok": True, "x": x, "y": y}
 
 
 def handle_type_text(params):
@@ -197,91 +246,70 @@ def handle_type_text(params):
 _listen_stop = None  # threading.Event — signals "stop recording and transcribe"
 
 def handle_listen(params):
-    """Record audio from microphone and transcribe using speech recognition.
+    """Record audio from microphone and transcribe it.
+
+    Audio comes from a persistent callback-driven input stream writing into
+    a ring buffer (fixme.audio_capture), so the microphone is already warm,
+    a short pre-roll before the request is kept, and stop_listen ends the
+    capture within one callback period.
+
+    Unless ``vad`` is false, voice activity detection (fixme.vad) ends the
+    capture after ``trailing_silence`` seconds of silence following speech
+    and trims leading/trailing silence before transcription. The result's
+    ``vad`` entry reports how much audio was kept and dropped.
+
+    Transcription uses the offline Vosk model for the language when one is
+    installed, otherwise Google (fixme.stt_backends); ``backend`` and
+    ``stt_ms`` in the result say which answered and how long it took.
 
-    Records in 0.5s chunks using sounddevice. When stop_listen is called,
-    stops recording and transcribes whatever was captured so far.
+    With an offline model, partial transcripts are sent as ``listen_partial``
+    notifications while the user speaks. With ``mode: "permission"`` a
+    stable yes/no ends the capture early and is returned as ``answer``.
     """
     global _listen_stop
-    import numpy as np
-    import sounddevice as sd
-    import speech_recognition as sr
-    import io
-    import wave
     import threading
-
-    lang = params.get("lang", "en")
-    lang_map = {
-        "en": "en-US", "es": "es-ES", "pa": "pa-IN",
-        "hi": "hi-IN", "fr": "fr-FR",
-    }
+    from fixme import listener, vad
 
     stop_event = threading.Event()
     _listen_stop = stop_event
-
-    sample_rate = 16000
-    channels = 1
-    chunk_duration = 0.5  # seconds per chunk
-    max_duration = 30  # max recording time in seconds
-    frames = []
-
     try:
-        # Record in chunks, checking stop flag between each
-        chunks = int(max_duration / chunk_duration)
-        for _ in range(chunks):
-            if stop_event.is_set():
-                break
-            chunk = sd.rec(
-                int(chunk_duration * sample_rate),
-                samplerate=sample_rate,
-                channels=channels,
-                dtype="int16",
-            )
-            sd.wait()
-            frames.append(chunk)
-    except Exception as e:
-        _listen_stop = None
-        return {"text": "", "error": f"Microphone error: {e}"}
+        return listener.listen(
+            lang=params.get("lang", "en"),
+            stop_event=stop_event,
+            mode=params.get("mode", "open"),
+            use_vad=params.get("vad", True),
+            trailing_silence=params.get("trailing_silence", vad.TRAILING_SILENCE),
+            max_duration=30,  # max recording time in seconds
+            on_partial=lambda text: _send_notification("listen_partial", {"text": text}),
+        )
     finally:
         _listen_stop = None
 
-    if not frames:
-        return {"text": "", "error": "No audio recorded"}
-
-    # Combine all chunks into a single WAV in memory
-    audio_data = np.concatenate(frames, axis=0)
-    wav_buffer = io.BytesIO()
-    with wave.open(wav_buffer, "wb") as wf:
-        wf.setnchannels(channels)
-        wf.setsampwidth(2)  # int16 = 2 bytes
-        wf.setframerate(sample_rate)
-        wf.writeframes(audio_data.tobytes())
-    wav_buffer.seek(0)
-
-    # Feed into speech_recognition for Google transcription
-    recognizer = sr.Recognizer()
-    with sr.AudioFile(wav_buffer) as source:
-        audio = recognizer.record(source)
-
-    try:
-        text = recognizer.recognize_google(audio, language=lang_map.get(lang, "en-US"))
-        return {"text": text, "error": None}
-    except sr.UnknownValueError:
-        return {"text": "", "error": "Could not understand audio"}
-    except sr.RequestError as e:
-        return {"text": "", "error": f"Speech recognition service error: {e}"}
-
 
 def handle_stop_listen(params):
     """Stop an in-progress listen and trigger transcription of recorded audio."""
-    global _listen_stop
     if _listen_stop is not None:
         _listen_stop.set()
     return {"ok": True}
 
 
 def handle_verify(params):
-    """Take a verification screenshot and re-diagnose."""
+    """Verify a fix, locally for network fixes, else by re-diagnosing a screenshot.
+
+    Params may carry the original diagnosis' "fix_id" and "category". Network
+    fixes are checked locally (gateway, DNS, interface, captive portal); the
+    screenshot + vision path only runs when the local checks can't decide.
+    """
+    verify = _get_module("verify")
+    verification = verify.verify_fix(params)
+    if verification and verification["status"] != "unknown":
+        return {
+            "diagnosis": verify.summarize(verification),
+            "steps": [],
+            "resolved": verification["status"] == "pass",
+            "verification": verification,
+        }
+
     screenshot = _get_module("screenshot")
     diagnose = _get_module("diagnose")
 
@@ -293,6 +321,8 @@ def handle_verify(params):
             os.unlink(img_path)
         except OSError:
             pass
+    result["resolved"] = not result.get("steps")
+    result["verification"] = verification
     return result
 
 
@@ -301,7 +331,10 @@ HANDLERS = {
     "diagnose": handle_diagnose,
     "execute_step": handle_execute_step,
     "speak": handle_speak,
+    "stop_speaking": handle_stop_speaking,
+    "tts_stats": handle_tts_stats,
     "screenshot": handle_screenshot,
+    "locate": handle_locate,
     "click_at": handle_click_at,
     "type_text": handle_type_text,
     "verify": handle_verify,
@@ -315,7 +348,7 @@ import threading
 _stdout_lock = threading.Lock()
 
 # Methods that block and should run in a background thread
-_ASYNC_METHODS = {"listen"}
+_ASYNC_METHODS = {"listen", "speak"}
 
 
 def _send_response(resp):
@@ -325,6 +358,11 @@ def _send_response(resp):
         sys.stdout.flush()
 
 
+def _send_notification(method, params):
+    """Send a JSON-RPC notification (no id) to the desktop app."""
+    _send_response({"jsonrpc": "2.0", "method": method, "params": params})
+
+
 def _run_handler(handler, params, req_id):
     """Run a handler and send the response (used by background threads)."""
     try:
@@ -337,6 +375,9 @@ def _run_handler(handler, params, req_id):
 
 def main():
     """Main loop: read JSON-RPC requests from stdin, dispatch, write responses."""
+    # Before pyautogui or screen capture, so clicks and captures agree on pixels
+    _get_module("locator").enable_dpi_awareness()
+
     # Signal readiness
     sys.stderr.write("[FixMe Sidecar] Ready\n")
     sys.stderr.flush()